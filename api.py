@@ -0,0 +1,7 @@
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    # Listen on every interface so the API is reachable from outside its container.
+    raise SystemExit(main(["serve", "--host", "0.0.0.0", *sys.argv[1:]]))  # noqa: S104
@@ -0,0 +1,104 @@
+import time
+from pathlib import Path
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.cache import ResultCache
+from src.service import PriceService, build_server
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.fetch_engine import GameFetchEngine
+from benchmarks.common import summarize, save_results, print_results
+from src.currency_core import CurrencyCore
+from benchmarks.stub_server import ReplayServer
+
+QUERIES = {
+    "rates": ("/rates", {"currencies": "usd,jpy,try"}),
+    "prices": ("/prices", {"games": "天堂W,天堂M", "countries": "us,jp,tr"}),
+    "compare": ("/compare", {"games": "天堂W,天堂M", "countries": "us,jp,tr", "top": "1"}),
+}
+
+
+def load(base_url: str, query: str, clients: int, requests_per_client: int) -> list[float]:
+    """Sends `requests_per_client` requests from each of `clients` threads at once."""
+    path, params = QUERIES[query]
+    barrier = threading.Barrier(clients)
+
+    def client() -> list[float]:
+        latencies = []
+        with requests.Session() as session:
+            barrier.wait()
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                session.get(f"{base_url}{path}", params=params, timeout=30).raise_for_status()
+                latencies.append(time.perf_counter() - start)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        futures = [executor.submit(client) for _ in range(clients)]
+        return [latency for future in futures for latency in future.result()]
+
+
+def bench_api(clients: int = 16, requests_per_client: int = 50) -> dict[str, dict[str, float]]:
+    """Drives the HTTP API with concurrent clients against the synthetic fixtures.
+
+    Every query is first sent once by all clients at the same moment on a cold cache, which
+    measures request coalescing, then repeatedly on the warm cache.
+
+    Args:
+        clients (int): Number of concurrent client threads.
+        requests_per_client (int): Requests each client sends in the warm phase.
+
+    Returns:
+        dict[str, dict[str, float]]: Latency and throughput summaries by query and phase, and
+            the upstream requests sent in each cold phase.
+    """
+    results = {}
+    with ReplayServer() as stub:
+        client = HttpClient()
+        cache = ResultCache(path=None)
+        service = PriceService(
+            currency_core=CurrencyCore(base_url=stub.base_url, client=client, cache=cache),
+            engine=GameFetchEngine(
+                client=client, cache=cache, rate_limit=0, detail_url=stub.detail_url
+            ),
+            refresh_interval=0,
+        )
+        server = build_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            for query in QUERIES:
+                hits = sum(stub.hits.values())
+                start = time.perf_counter()
+                latencies = load(base_url, query, clients, 1)
+                results[f"{query}.cold"] = summarize(
+                    latencies, elapsed=time.perf_counter() - start
+                )
+                results[f"{query}.cold"]["upstream_requests"] = sum(stub.hits.values()) - hits
+                start = time.perf_counter()
+                latencies = load(base_url, query, clients, requests_per_client)
+                results[f"{query}.warm"] = summarize(
+                    latencies, elapsed=time.perf_counter() - start
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.stop()
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark the HTTP API under load.")
+    arg_parser.add_argument("--clients", type=int, default=16)
+    arg_parser.add_argument("--requests", type=int, default=50)
+    arg_parser.add_argument("--output", type=Path, default=None)
+    args = arg_parser.parse_args()
+    # Spans printed to the console would dominate the latencies of cached requests.
+    telemetry.configure(console=False)
+    results = bench_api(clients=args.clients, requests_per_client=args.requests)
+    print_results("HTTP API load", results)
+    save_results("api", results, params=vars(args), output=args.output)
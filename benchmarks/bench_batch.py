@@ -0,0 +1,72 @@
+from pathlib import Path
+import argparse
+
+import orjson
+
+from src.typings.game import GamePriceInfo
+from benchmarks.common import timed, summarize, save_results, print_results
+from src.typings.batch import RateBatch, PriceBatch
+from src.typings.currency_rate import CurrencyRate
+
+
+def build_models(rows: int) -> tuple[list[CurrencyRate], list[GamePriceInfo]]:
+    rates = [
+        CurrencyRate(
+            currency_en=f"c{index}",
+            currency_cn="美金",
+            JCB="32.137",
+            萬事達="32.189",
+            VISA=None if index % 7 == 0 else "32.169",
+            updated_time="2024-09-12",
+        )
+        for index in range(rows)
+    ]
+    prices = [
+        GamePriceInfo(name=f"game {index}", country="us", lowest=0.99, highest=99.99)
+        for index in range(rows)
+    ]
+    return rates, prices
+
+
+def bench_batch(rows: int = 100_000, repeat: int = 5) -> dict[str, dict[str, float]]:
+    """Measures bulk serialization of models against columnar batches.
+
+    Each path is timed end to end from the pydantic models, so the batch paths include the
+    conversion into a batch.
+
+    Args:
+        rows (int): Number of rates and of prices.
+        repeat (int): Number of timed runs of every path.
+
+    Returns:
+        dict[str, dict[str, float]]: Latency and throughput summaries by path.
+    """
+    rates, prices = build_models(rows)
+    paths = {
+        "rates.model_dump_jsonl": lambda: b"".join(
+            orjson.dumps(rate.model_dump(), option=orjson.OPT_APPEND_NEWLINE) for rate in rates
+        ),
+        "rates.batch_json": lambda: RateBatch.from_models(rates).to_json(),
+        "rates.batch_arrow": lambda: RateBatch.from_models(rates).to_arrow(),
+        "prices.model_dump_jsonl": lambda: b"".join(
+            orjson.dumps(price.model_dump(), option=orjson.OPT_APPEND_NEWLINE) for price in prices
+        ),
+        "prices.batch_json": lambda: PriceBatch.from_models(prices).to_json(),
+        "prices.batch_arrow": lambda: PriceBatch.from_models(prices).to_arrow(),
+    }
+    results = {}
+    for name, path in paths.items():
+        latencies = [timed(path)[1] for _ in range(repeat)]
+        results[name] = summarize(latencies, items=rows * repeat)
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark bulk model serialization.")
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--output", type=Path, default=None)
+    args = arg_parser.parse_args()
+    results = bench_batch(rows=args.rows, repeat=args.repeat)
+    print_results("Bulk model serialization", results)
+    save_results("batch", results, params=vars(args), output=args.output)
@@ -0,0 +1,112 @@
+import time
+from pathlib import Path
+import argparse
+import resource
+import tempfile
+from collections.abc import Iterator
+import multiprocessing
+
+import pandas as pd
+
+from src.sinks import PRICE_COLUMNS
+from src.exporters import export
+from src.typings.game import GamePriceInfo
+from benchmarks.common import throughput, save_results, print_results
+
+COUNTRIES = ["us", "jp", "tr", "kr", "tw", "de", "fr", "br", "in", "id"]
+
+
+def synthetic_prices(rows: int) -> Iterator[GamePriceInfo]:
+    """Yields `rows` price ranges, one in fifty of them failed, like a full sweep would."""
+    for index in range(rows):
+        country = COUNTRIES[index % len(COUNTRIES)]
+        if index % 50 == 0:
+            yield GamePriceInfo.model_construct(
+                name=f"Game {index // 10}",
+                country=country,
+                lowest=None,
+                highest=None,
+                error="HTTPError: 503 Server Error",
+                retryable=True,
+            )
+            continue
+        yield GamePriceInfo.model_construct(
+            name=f"Game {index // 10}",
+            country=country,
+            lowest=0.99 + index % 7,
+            highest=99.99 + index % 13,
+            error=None,
+            retryable=None,
+        )
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(mode: str, export_format: str, rows: int, directory: str) -> tuple[float, float, float]:
+    """Exports in a fresh process and returns its elapsed seconds, peak RSS and file size."""
+    path = Path(directory) / f"game_price.{mode}.{export_format}"
+    start = time.perf_counter()
+    if mode == "streaming":
+        export(synthetic_prices(rows), path, columns=PRICE_COLUMNS)
+    else:
+        frame = pd.DataFrame([price.model_dump() for price in synthetic_prices(rows)])
+        if export_format == "jsonl":
+            frame.to_json(path, orient="records", lines=True, force_ascii=False)
+        elif export_format == "csv":
+            frame.to_csv(path, index=False)
+        else:
+            frame.to_excel(path, index=False, engine="openpyxl")
+    return time.perf_counter() - start, _max_rss_mb(), path.stat().st_size / 2**20
+
+
+def bench_export(rows: int, formats: list[str], baseline: bool) -> dict[str, dict[str, float]]:
+    """Benchmarks streaming exports, and optionally materialized ones, each in its own process.
+
+    `peak_rss_mb` is the peak resident memory of the exporting process; `idle_rss_mb` is the
+    peak of a process which only imported the modules, the floor of every other figure.
+    """
+    context = multiprocessing.get_context("spawn")
+    modes = ["streaming", "materialized"] if baseline else ["streaming"]
+    results = {}
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        context.Pool(processes=1, maxtasksperchild=1) as pool,
+    ):
+        _, idle_rss, _ = pool.apply(_run, ("streaming", "jsonl", 0, directory))
+        for export_format in formats:
+            for mode in modes:
+                elapsed, peak_rss, size = pool.apply(_run, (mode, export_format, rows, directory))
+                results[f"export.{export_format}.{mode}"] = {
+                    **throughput(rows, elapsed),
+                    "peak_rss_mb": peak_rss,
+                    "idle_rss_mb": idle_rss,
+                    "file_mb": size,
+                }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark memory and throughput of exporting synthetic price ranges."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of rows")
+    parser.add_argument(
+        "--formats", nargs="+", default=["jsonl", "csv", "xlsx"], help="Formats to export"
+    )
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Also export through a list of models and one DataFrame, for comparison",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    results = bench_export(rows=args.rows, formats=args.formats, baseline=args.baseline)
+    print_results("Export benchmark", results)
+    save_results("export", results, params=vars(args), output=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from pathlib import Path
+import argparse
+
+from src.html_parser import TwratesParser
+from benchmarks.common import timed, summarize, save_results, print_results
+
+FIXTURES = Path(__file__).parent / "fixtures" / "twrates"
+
+
+def bench_html_parser(repeat: int = 20) -> dict[str, dict[str, float]]:
+    """Measures the parse time per twrates page of both parser modes over the synthetic fixtures.
+
+    Args:
+        repeat (int): Number of passes over every fixture page.
+
+    Returns:
+        dict[str, dict[str, float]]: Latency and throughput summaries by mode and page kind.
+    """
+    pages = {path.stem: path.read_text(encoding="utf-8") for path in FIXTURES.glob("*.html")}
+    results = {}
+    for mode in ["bs4", "fast"]:
+        parser = TwratesParser(mode=mode)
+        rate_latencies, list_latencies = [], []
+        for _ in range(repeat):
+            for currency, page in pages.items():
+                rate_latencies.append(timed(parser.parse_currency_rate, page, currency)[1])
+                list_latencies.append(
+                    timed(parser.parse_currency_list, page, "https://www.twrates.com")[1]
+                )
+        results[f"{mode}.currency_rate"] = summarize(rate_latencies)
+        results[f"{mode}.currency_list"] = summarize(list_latencies)
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark twrates HTML parsing.")
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    arg_parser.add_argument("--output", type=Path, default=None)
+    args = arg_parser.parse_args()
+    results = bench_html_parser(repeat=args.repeat)
+    print_results("twrates HTML parsing", results)
+    save_results("html_parser", results, params=vars(args), output=args.output)
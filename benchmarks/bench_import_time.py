@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+from pathlib import Path
+import argparse
+import statistics
+import subprocess
+
+from benchmarks.common import save_results, print_results, compare_results
+
+ROOT = Path(__file__).parents[1]
+MODULES = [
+    "src.cache",
+    "src.html_parser",
+    "src.http_client",
+    "src.currency_core",
+    "src.ingame_price",
+    "src.fetch_engine",
+]
+HEAVY_MODULES = {
+    "bs4",
+    "google_play_scraper",
+    "logfire",
+    "opentelemetry",
+    "price_parser",
+    "requests",
+    "yaml",
+}
+
+
+def import_once(module: str) -> tuple[float, float, set[str]]:
+    """Imports `module` in a fresh interpreter under `python -X importtime`.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        tuple[float, float, set[str]]: The cumulative import time of the module in milliseconds,
+            the wall clock time of the whole interpreter in milliseconds, and the heavy
+            dependencies it imported.
+    """
+    start = time.perf_counter()
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env={
+            name: value for name, value in os.environ.items() if name != "PYDANTIC_DISABLE_PLUGINS"
+        },
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    cumulative_ms, loaded = 0.0, set()
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            cumulative_ms = int(cumulative) / 1000
+        loaded.add(name.strip().split(".")[0])
+    return cumulative_ms, wall_ms, loaded & HEAVY_MODULES
+
+
+def bench_import_time(modules: list[str], repeat: int = 5) -> dict[str, dict[str, float]]:
+    """Measures the cold import time of every module, each in a fresh interpreter.
+
+    Args:
+        modules (list[str]): The modules to import.
+        repeat (int): Number of fresh interpreters per module.
+
+    Returns:
+        dict[str, dict[str, float]]: Median and minimum import time, median interpreter wall
+            clock time, and the number of heavy dependencies imported, by module.
+    """
+    results = {}
+    for module in modules:
+        imports, walls, loaded = [], [], set()
+        for _ in range(repeat):
+            import_ms, wall_ms, heavy = import_once(module)
+            imports.append(import_ms)
+            walls.append(wall_ms)
+            loaded |= heavy
+        results[module] = {
+            "import_ms_p50": statistics.median(imports),
+            "import_ms_min": min(imports),
+            "wall_ms_p50": statistics.median(walls),
+            "heavy_modules": len(loaded),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark cold import time of src modules.")
+    arg_parser.add_argument("--modules", nargs="+", default=MODULES)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--output", type=Path, default=None)
+    arg_parser.add_argument(
+        "--compare", type=Path, default=None, help="Baseline JSON results to compare with"
+    )
+    args = arg_parser.parse_args()
+    results = bench_import_time(modules=args.modules, repeat=args.repeat)
+    print_results("Import time", results)
+    output = save_results("import_time", results, params=vars(args), output=args.output)
+    if args.compare is not None:
+        compare_results(args.compare, output, metric="import_ms_p50")
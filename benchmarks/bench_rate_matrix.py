@@ -0,0 +1,98 @@
+from pathlib import Path
+import argparse
+
+import numpy as np
+
+from src.rate_matrix import RateMatrix
+from benchmarks.common import timed, summarize, save_results, print_results
+from src.typings.currency_rate import CurrencyRate
+
+
+def build_rates(currencies: int) -> list[CurrencyRate]:
+    return [
+        CurrencyRate(
+            currency_en=f"c{index}",
+            currency_cn="美金",
+            JCB=f"{1 + index * 0.5:.4f}",
+            萬事達=f"{1 + index * 0.6:.4f}",
+            VISA=None if index % 7 == 0 else f"{1 + index * 0.7:.4f}",
+            updated_time="2024-09-12",
+        )
+        for index in range(currencies)
+    ]
+
+
+def bench_rate_matrix(
+    rows: int, currencies: int, repeat: int, seed: int = 0
+) -> dict[str, dict[str, float]]:
+    """Measures converting prices between two per-row currencies with and without the matrix.
+
+    The per-row path looks up both `CurrencyRate` models and parses their VISA rates for every
+    price, as chained lookups over the scraped strings do. The `matrix` paths include mapping
+    the currency codes to rows, `matrix_positions` reuses rows mapped once.
+
+    Args:
+        rows (int): Number of prices converted per run.
+        currencies (int): Number of currencies.
+        repeat (int): Number of timed runs of every path.
+        seed (int): Seed of the random prices and currencies.
+
+    Returns:
+        dict[str, dict[str, float]]: Latency and throughput summaries by path.
+    """
+    rates = build_rates(currencies)
+    generator = np.random.default_rng(seed)
+    amounts = generator.uniform(0.99, 15800.0, size=rows)
+    codes = np.array([rate.currency_en for rate in rates])
+    sources = codes[generator.integers(0, currencies, size=rows)]
+    targets = codes[generator.integers(0, currencies, size=rows)]
+    by_code = {rate.currency_en: rate for rate in rates}
+
+    def per_row() -> list[float]:
+        converted = []
+        for amount, source, target in zip(
+            amounts.tolist(), sources.tolist(), targets.tolist(), strict=True
+        ):
+            source_rate, target_rate = by_code[source].visa, by_code[target].visa
+            if source_rate is None or target_rate is None:
+                converted.append(float("nan"))
+                continue
+            converted.append(amount * float(source_rate) / float(target_rate))
+        return converted
+
+    matrix, elapsed = timed(RateMatrix.from_models, rates)
+    results = {"rate_matrix.build": summarize([elapsed], items=1)}
+    _, elapsed = timed(matrix.update, rates[currencies // 2])
+    results["rate_matrix.update"] = summarize([elapsed], items=1)
+    source_rows, target_rows = matrix.positions(sources), matrix.positions(targets)
+    paths = {
+        "convert.per_row": per_row,
+        "convert.matrix": lambda: matrix.convert(amounts, sources, targets, card="visa"),
+        "convert.matrix_positions": lambda: matrix.convert(
+            amounts, source_rows, target_rows, card="visa"
+        ),
+        "convert.matrix_every_card": lambda: matrix.convert(amounts, sources, targets, card=None),
+    }
+    for name, path in paths.items():
+        latencies = [timed(path)[1] for _ in range(repeat)]
+        results[name] = summarize(latencies, items=rows * repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark currency-to-currency conversion through the rate matrix."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of prices")
+    parser.add_argument("--currencies", type=int, default=40, help="Number of currencies")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    parser.add_argument("--output", type=Path, default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    results = bench_rate_matrix(rows=args.rows, currencies=args.currencies, repeat=args.repeat)
+    print_results("Rate matrix benchmark", results)
+    save_results("rate_matrix", results, params=vars(args), output=args.output)
+
+
+if __name__ == "__main__":
+    main()
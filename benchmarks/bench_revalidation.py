@@ -0,0 +1,59 @@
+from pathlib import Path
+import argparse
+from urllib.parse import urlsplit
+
+from src.cache import ResultCache
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from benchmarks.common import timed, throughput, save_results, print_results
+from src.currency_core import CurrencyCore
+from benchmarks.stub_server import ReplayServer
+
+
+def bench_revalidation(runs: int, max_workers: int) -> dict[str, dict[str, float]]:
+    """Benchmarks a cold `fetch_currency_rates("all")` against repeat runs of unchanged pages.
+
+    The rate entries of the cache expire at once, so every repeat run goes back to the stub
+    with the stored validators instead of being served by the cache. `requests` counts the
+    pages requested, `bytes_received` the bytes downloaded and `parses` the pages parsed.
+    """
+    cache = ResultCache(path=None, ttls={"currency_list": 0, "currency_rate": 0}, stale_ttl=0)
+    results = {}
+    with ReplayServer(conditional=True) as stub:
+        for run in range(runs + 1):
+            client = HttpClient()
+            client.traffic.limit(urlsplit(stub.base_url).netloc, 0)
+            currency_core = CurrencyCore(base_url=stub.base_url, client=client, cache=cache)
+            rates, elapsed = timed(
+                currency_core.fetch_currency_rates, currency_name_en="all", max_workers=max_workers
+            )
+            stats = currency_core.revalidation_stats
+            results[f"currency.{'cold' if run == 0 else f'repeat_{run}'}"] = {
+                **throughput(len(rates), elapsed),
+                "requests": stats.requests,
+                "not_modified": stats.not_modified,
+                "parses": stats.parses,
+                "bytes_received": client.stats.bytes_received,
+                "bytes_saved": stats.bytes_saved,
+            }
+            client.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark conditional requests of unchanged twrates pages on repeat runs."
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Number of repeat runs")
+    parser.add_argument("--workers", type=int, default=8, help="Pages fetched concurrently")
+    parser.add_argument("--output", type=Path, default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+    telemetry.configure(console=False)
+
+    results = bench_revalidation(runs=args.runs, max_workers=args.workers)
+    print_results("Revalidation benchmark", results)
+    save_results("revalidation", results, params=vars(args), output=args.output)
+
+
+if __name__ == "__main__":
+    main()
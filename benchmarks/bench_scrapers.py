@@ -0,0 +1,148 @@
+from pathlib import Path
+import argparse
+import tempfile
+from urllib.parse import urlsplit
+
+import orjson
+import pandas as pd
+from google_play_scraper.features.app import parse_dom
+
+from src.catalog import GameCatalog
+from src.telemetry import telemetry
+from src.html_parser import TwratesParser
+from src.http_client import HttpClient
+from src.fetch_engine import GameFetchEngine
+from src.ingame_price import GameInfoUpdater
+from src.typings.game import GameInfo
+from benchmarks.common import (
+    timed,
+    summarize,
+    throughput,
+    save_results,
+    print_results,
+    compare_results,
+)
+from src.currency_core import CurrencyCore
+from benchmarks.stub_server import ReplayServer
+
+
+def stub_client(stub: ReplayServer) -> HttpClient:
+    """Builds a client which does not pace the local stub like a real host."""
+    client = HttpClient()
+    client.traffic.limit(urlsplit(stub.base_url).netloc, 0)
+    return client
+
+
+def bench_currency(stub: ReplayServer, max_workers: int) -> dict[str, dict[str, float]]:
+    """Benchmarks `fetch_currency_rates("all")` end to end and per stage."""
+    results = {}
+    for workers in sorted({1, max_workers}):
+        currency_core = CurrencyCore(base_url=stub.base_url, client=stub_client(stub))
+        rates, elapsed = timed(
+            currency_core.fetch_currency_rates, currency_name_en="all", max_workers=workers
+        )
+        results[f"currency.end_to_end.workers_{workers}"] = throughput(len(rates), elapsed)
+
+    client = stub_client(stub)
+    currency_list = CurrencyCore(base_url=stub.base_url, client=client).get_country_list()
+    pages, request_latencies = {}, []
+    for currency in currency_list:
+        response, elapsed = timed(client.get, currency.currency_url)
+        pages[currency.currency_name] = response.text
+        request_latencies.append(elapsed)
+    results["currency.request"] = summarize(request_latencies)
+    for mode in ["bs4", "fast"]:
+        parser = TwratesParser(mode=mode)
+        parse_latencies = [
+            timed(parser.parse_currency_rate, page, currency_name=currency)[1]
+            for currency, page in pages.items()
+        ]
+        results[f"currency.parse.{mode}"] = summarize(parse_latencies)
+    return results
+
+
+def bench_games(
+    stub: ReplayServer, games: int, countries: int, max_in_flight: int
+) -> dict[str, dict[str, float]]:
+    """Benchmarks `GameInfoUpdater.fetch_game_info` and the fetch engine over games x countries."""
+    country_codes = (
+        pd.read_csv("./configs/countries_currency.csv", keep_default_na=False)["CountryCode"]
+        .str.lower()
+        .drop_duplicates()
+        .head(countries)
+        .tolist()
+    )
+    game_list = [
+        {"packageId": f"com.benchmark.game{index}", "name": f"Game {index}", "id": index}
+        for index in range(games)
+    ]
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "gameList.json"
+        path.write_bytes(orjson.dumps(game_list))
+        catalog = GameCatalog(path=str(path))
+        client = stub_client(stub)
+
+        def fetch_all_countries() -> int:
+            fetched = 0
+            for country in country_codes:
+                updater = GameInfoUpdater(
+                    country=country, detail_url=stub.detail_url, client=client, catalog=catalog
+                )
+                fetched += len(updater.fetch_game_info())
+            return fetched
+
+        fetched, elapsed = timed(fetch_all_countries)
+        results["game.end_to_end.serial"] = throughput(fetched, elapsed)
+
+    engine = GameFetchEngine(max_in_flight=max_in_flight, rate_limit=0, detail_url=stub.detail_url)
+    game_infos = [GameInfo(**game) for game in game_list]
+    fetched, elapsed = timed(engine.fetch_matrix, games=game_infos, countries=country_codes)
+    results[f"game.end_to_end.engine_{max_in_flight}"] = throughput(len(fetched), elapsed)
+
+    sample = game_infos[: min(games, 20)]
+    request_latencies, parse_latencies, price_latencies = [], [], []
+    for game in sample:
+        url = stub.detail_url.format(app_id=game.game_id, lang="zh-TW", country="us")
+        response, elapsed = timed(client.get, url)
+        request_latencies.append(elapsed)
+        detail, elapsed = timed(parse_dom, dom=response.text, app_id=game.game_id, url=url)
+        parse_latencies.append(elapsed)
+        _, elapsed = timed(GameInfoUpdater.parse_in_app_price, detail["inAppProductPrice"])
+        price_latencies.append(elapsed)
+    results["game.request"] = summarize(request_latencies)
+    results["game.parse_dom"] = summarize(parse_latencies)
+    results["game.price_parse"] = summarize(price_latencies)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark both scrapers offline against synthetic fixture pages."
+    )
+    parser.add_argument("--games", type=int, default=20, help="Number of games (N)")
+    parser.add_argument("--countries", type=int, default=5, help="Number of countries (M)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrency of parallel modes")
+    parser.add_argument("--output", type=Path, default=None, help="Path of the JSON results")
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Baseline JSON results to compare with"
+    )
+    args = parser.parse_args()
+    telemetry.configure()
+
+    with ReplayServer() as stub:
+        results = bench_currency(stub, max_workers=args.workers)
+        results.update(
+            bench_games(
+                stub, games=args.games, countries=args.countries, max_in_flight=args.workers
+            )
+        )
+    print_results("Scraper benchmark", results)
+    output = save_results("scrapers", results, params=vars(args), output=args.output)
+    if args.compare is not None:
+        compare_results(args.compare, output)
+        compare_results(args.compare, output, metric="throughput_per_s")
+
+
+if __name__ == "__main__":
+    main()
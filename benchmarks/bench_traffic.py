@@ -0,0 +1,110 @@
+import time
+from pathlib import Path
+import argparse
+
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GameInfo
+from benchmarks.common import timed, throughput, save_results, print_results
+from benchmarks.stub_server import PlayStoreStub
+
+PRICE = "每個項目 US$0.99 - US$99.99"
+
+
+class CapacityStub(PlayStoreStub):
+    """A play store stub answering 429 to requests beyond `capacity` per second.
+
+    Bursts of up to a tenth of a second of capacity are accepted.
+    """
+
+    def __init__(self, prices: dict[tuple[str, str], str | None], capacity: float):
+        super().__init__(prices=prices)
+        self.capacity = capacity
+        self.throttled = 0
+        self._burst = max(capacity / 10, 1.0)
+        self._allowance = self._burst
+        self._last = time.monotonic()
+
+    def resolve(self, path: str) -> tuple[int, str]:
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(
+                self._allowance + (now - self._last) * self.capacity, self._burst
+            )
+            self._last = now
+            if self._allowance < 1:
+                self.throttled += 1
+                return 429, "slow down"
+            self._allowance -= 1
+        return super().resolve(path)
+
+
+def bench_traffic(
+    games: int, countries: int, capacity: float, max_in_flight: int
+) -> dict[str, dict[str, float]]:
+    """Sweeps a stub with a fixed capacity under fixed and adaptive rate limits.
+
+    `items` counts the prices fetched successfully, so `throughput_per_s` is the goodput;
+    `failed` counts the error records and `throttled` the 429s the stub answered.
+    """
+    country_codes = [f"c{index}" for index in range(countries)]
+    game_infos = [
+        GameInfo(packageId=f"com.benchmark.game{index}", name=f"Game {index}")
+        for index in range(games)
+    ]
+    prices = {(game.game_id, country): PRICE for game in game_infos for country in country_codes}
+    modes = {
+        "unlimited": 0,
+        "fixed_half_capacity": capacity / 2,
+        "fixed_capacity": capacity,
+        "adaptive": None,
+    }
+    results = {}
+    for mode, rate_limit in modes.items():
+        with CapacityStub(prices=prices, capacity=capacity) as stub:
+            engine = GameFetchEngine(
+                client=HttpClient(backoff_factor=0.1),
+                max_in_flight=max_in_flight,
+                rate_limit=rate_limit,
+                detail_url=stub.detail_url,
+            )
+            fetched, elapsed = timed(
+                engine.fetch_matrix, games=game_infos, countries=country_codes
+            )
+            engine.client.close()
+            succeeded = [price for price in fetched if price.error is None]
+            results[f"traffic.{mode}"] = {
+                **throughput(len(succeeded), elapsed),
+                "failed": len(fetched) - len(succeeded),
+                "throttled": stub.throttled,
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the adaptive rate limiter against a stub with a fixed capacity."
+    )
+    parser.add_argument("--games", type=int, default=50, help="Number of games")
+    parser.add_argument("--countries", type=int, default=4, help="Number of countries")
+    parser.add_argument(
+        "--capacity", type=float, default=50, help="Requests per second the stub accepts"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Maximum in-flight requests")
+    parser.add_argument("--output", type=Path, default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+    telemetry.configure(console=False)
+
+    results = bench_traffic(
+        games=args.games,
+        countries=args.countries,
+        capacity=args.capacity,
+        max_in_flight=args.workers,
+    )
+    print_results("Traffic control benchmark", results)
+    save_results("traffic", results, params=vars(args), output=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import json
+import random
+from pathlib import Path
+import argparse
+
+from benchmarks.stub_server import FIXTURES
+
+DATE = "2024-09-12"
+CURRENCIES = {
+    "usd": ("美金", 32.15),
+    "jpy": ("日圓", 0.2243),
+    "krw": ("韓元", 0.0241),
+    "eur": ("歐元", 35.61),
+    "gbp": ("英鎊", 42.18),
+    "hkd": ("港幣", 4.123),
+    "cny": ("人民幣", 4.521),
+    "aud": ("澳幣", 21.56),
+    "cad": ("加拿大幣", 23.71),
+    "sgd": ("新加坡幣", 24.73),
+    "chf": ("瑞士法郎", 37.92),
+    "thb": ("泰銖", 0.9537),
+    "myr": ("馬來幣", 7.412),
+    "php": ("菲律賓比索", 0.5731),
+    "idr": ("印尼盾", 0.002083),
+    "vnd": ("越南盾", 0.001301),
+    "inr": ("印度盧比", 0.3831),
+    "nzd": ("紐西蘭幣", 19.87),
+    "sek": ("瑞典克朗", 3.121),
+    "nok": ("挪威克朗", 2.987),
+    "dkk": ("丹麥克朗", 4.772),
+    "zar": ("南非幣", 1.801),
+    "mxn": ("墨西哥比索", 1.652),
+    "brl": ("巴西里拉", 5.731),
+    "try": ("土耳其里拉", 0.9452),
+    "rub": ("俄羅斯盧布", 0.3512),
+    "aed": ("阿聯酋迪拉姆", 8.753),
+    "sar": ("沙烏地里亞爾", 8.571),
+    "pln": ("波蘭茲羅提", 8.312),
+    "czk": ("捷克克朗", 1.421),
+    "huf": ("匈牙利福林", 0.09012),
+    "ils": ("以色列謝克爾", 8.612),
+    "clp": ("智利比索", 0.03452),
+    "cop": ("哥倫比亞比索", 0.007701),
+    "pen": ("秘魯索爾", 8.521),
+    "egp": ("埃及鎊", 0.6621),
+}
+NAV = [
+    ("bank/bot", "臺灣銀行匯率"),
+    ("bank/mega", "兆豐銀行匯率"),
+    ("bank/ctbc", "中國信託匯率"),
+    ("card/visa", "VISA 匯率"),
+    ("card/jcb", "JCB 匯率"),
+    ("card/mastercard", "萬事達卡匯率"),
+    ("about", "關於本站"),
+    ("contact", "聯絡我們"),
+]
+GAMES = {
+    "default": ("Benchmark Game", "每個項目 US$0.99 - US$99.99", 1726099200, "1.0.0"),
+    "com.ncsoft.lineagew": ("天堂W", "每個項目 US$0.99 - US$99.99", 1726099200, "1.3.107"),
+    "com.gamania.lineagem": ("天堂M", "每個項目 US$1.99 - US$199.99", 1725667200, "2.1.45"),
+}
+
+
+def build_twrates_page(
+    code: str, name: str, rates: dict[str, str], currencies: dict[str, tuple[str, float]]
+) -> str:
+    """Builds a twrates card rate page with the markup the scraper expects.
+
+    The navigation, inline style and script, and news items only pad the page to the size of
+    a live page; none of it is copied from twrates.
+    """
+    nav = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/{path}.html" title="{title}">'
+        f"{title}</a></li>"
+        for path, title in NAV
+    )
+    items = "\n".join(
+        f'        <li class="itm"><a href="/card/mastercard/{currency}.html" '
+        f'title="{currency_name}匯率">{currency.upper()} - {currency_name}</a></li>'
+        for currency, (currency_name, _) in currencies.items()
+    )
+    style = (
+        "<style>"
+        + "".join(
+            f".c{i}{{margin:{i}px;padding:{i % 7}px;color:#{i * 123456 % 0xFFFFFF:06x}}}"
+            for i in range(300)
+        )
+        + "</style>"
+    )
+    script = (
+        "<script>window.dataLayer=window.dataLayer||[];"
+        "function gtag(){dataLayer.push(arguments)}gtag('js',new Date());"
+        "gtag('config','UA-00000000-1');" + ";".join(f"var v{i}={i}" for i in range(400))
+    ) + "</script>"
+    rows = "\n".join(
+        f'          <tr class="rate-row"><td class="card">{card}</td>'
+        f'<td class="rate">{rate}&nbsp;({DATE})</td></tr>'
+        for card, rate in rates.items()
+    )
+    news = "\n".join(
+        f'      <div class="news-item c{i}"><h4><a href="/news/{i}.html">{name}匯率新聞 第{i}則'
+        f"</a></h4><p>{'匯率走勢分析與信用卡海外消費手續費比較。' * 6}</p></div>"
+        for i in range(25)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="zh-TW">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>{name}({code.upper()}) 萬事達卡匯率 - 台灣匯率網</title>
+  <meta name="description" content="萬事達卡 {name} {code.upper()} 匯率查詢，每日更新。">
+  <link rel="stylesheet" href="/static/css/bootstrap.min.css">
+  {style}
+  {script}
+</head>
+<body>
+  <nav class="navbar navbar-expand-lg"><ul class="navbar-nav">{nav}</ul></nav>
+  <div class="container">
+    <div class="dropdown">
+      <a href="javascript:void(0)" class="dropdown-toggle" onclick="change_ccy()">萬事達卡匯率 - {name}&nbsp;&nbsp;<b class="caret"></b></a>
+      <ul class="dropdown-menu">
+{items}
+      </ul>
+    </div>
+    <div class="table-responsive">
+      <table class="table table-striped">
+        <thead><tr><th>卡別</th><th>匯率</th></tr></thead>
+        <tbody>
+{rows}
+        </tbody>
+      </table>
+    </div>
+    <div class="news">
+{news}
+    </div>
+  </div>
+  <footer class="footer"><p>&copy; 2024 台灣匯率網 twrates.com</p></footer>
+</body>
+</html>
+"""
+
+
+def build_play_store_page(
+    generator: random.Random, title: str, price: str, updated: int, version: str
+) -> str:
+    """Builds a play store detail page which `google_play_scraper` can parse.
+
+    The app data sits in the `ds:5` callback like on a live page. The other callbacks hold
+    random review-like data and the inline style is filler, so the page has the size of a live
+    page but not its content.
+    """
+    app_data: list = [None] * 146
+    app_data[0] = [title]
+    app_data[19] = [price]
+    app_data[140] = [[[version]]]
+    app_data[145] = [[None, [updated]]]
+    blocks = []
+    for key in [1, 2, 3, 4, 6, 7, 8, 9, 10, 11]:
+        data = [
+            [
+                f"https://play-lh.googleusercontent.com/{generator.getrandbits(128):032x}",
+                generator.random(),
+                [generator.randint(0, 10**6) for _ in range(20)],
+                "評論內容 " * 10,
+            ]
+            for _ in range(60)
+        ]
+        blocks.append(
+            f"<script nonce=\"x\">AF_initDataCallback({{key: 'ds:{key}', hash: '{key}', "
+            f"data:{json.dumps(data, ensure_ascii=False)}, sideChannel: {{}}}});</script>"
+        )
+    dataset = json.dumps([None, [None, None, app_data]], ensure_ascii=False)
+    blocks.insert(
+        4,
+        "<script nonce=\"x\">AF_initDataCallback({key: 'ds:5', hash: '5', "
+        f"data:{dataset}, sideChannel: {{}}}});</script>",
+    )
+    style = (
+        "<style>" + "".join(f".g{i}{{display:flex;margin:{i}px}}" for i in range(800)) + "</style>"
+    )
+    return (
+        '<!doctype html><html lang="zh-TW"><head><meta charset="utf-8">'
+        f"<title>{title} - Google Play 應用程式</title>{style}</head>"
+        f'<body><div id="root"></div>{"".join(blocks)}</body></html>'
+    )
+
+
+def build_fixtures(output: Path = FIXTURES) -> None:
+    """Writes the synthetic twrates and play store pages served by `ReplayServer`.
+
+    The pages are generated, not captured, because the live sites are not reachable from the
+    build environment. They follow the markup the scrapers parse and are padded to the size of
+    live pages, so parse timings on them are indicative only. Seeded generators make the
+    output identical on every run.
+
+    Args:
+        output (Path): Directory receiving `twrates/` and `play_store/`.
+    """
+    twrates, play_store = output / "twrates", output / "play_store"
+    twrates.mkdir(parents=True, exist_ok=True)
+    play_store.mkdir(parents=True, exist_ok=True)
+
+    generator = random.Random(7)  # noqa: S311
+    manifest = {}
+    for code, (name, base) in CURRENCIES.items():
+        rates = {
+            card: f"{base * (1 + generator.uniform(-0.004, 0.004)):.4g}"
+            for card in ["JCB", "萬事達", "VISA"]
+        }
+        manifest[code] = [name, rates]
+        page = build_twrates_page(code, name, rates, CURRENCIES)
+        (twrates / f"{code}.html").write_text(page, encoding="utf-8")
+    with open(twrates / "manifest.json", "w", encoding="utf-8") as file:
+        json.dump({"date": DATE, "currencies": manifest}, file, ensure_ascii=False, indent=2)
+
+    generator = random.Random(11)  # noqa: S311
+    for app_id, game in GAMES.items():
+        page = build_play_store_page(generator, *game)
+        (play_store / f"{app_id}.html").write_text(page, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate the synthetic pages replayed by the scraper benchmarks."
+    )
+    parser.add_argument("--output", type=Path, default=FIXTURES, help="Fixtures directory")
+    args = parser.parse_args()
+    build_fixtures(output=args.output)
@@ -0,0 +1,123 @@
+import time
+from typing import Any, TypeVar
+from pathlib import Path
+import datetime
+import platform
+import statistics
+import subprocess
+from collections.abc import Callable
+
+import orjson
+from rich.table import Table
+from rich.console import Console
+
+T = TypeVar("T")
+
+RESULTS_DIR = Path("./.cache/igpf/benchmarks")
+
+
+def git_commit() -> str:
+    try:
+        output = subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarize(
+    latencies: list[float], items: int | None = None, elapsed: float | None = None
+) -> dict[str, float]:
+    """Summarizes per-item latencies in seconds into milliseconds and throughput.
+
+    Args:
+        latencies (list[float]): Latency of every item in seconds.
+        items (int | None): Number of items processed, defaults to `len(latencies)`.
+        elapsed (float | None): Wall clock seconds, defaults to the sum of `latencies`.
+
+    Returns:
+        dict[str, float]: Item count, wall clock seconds, items per second, and p50, p95 and
+            max latency in milliseconds.
+    """
+    items = len(latencies) if items is None else items
+    elapsed = sum(latencies) if elapsed is None else elapsed
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "items": items,
+        "elapsed_s": elapsed,
+        "throughput_per_s": items / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def throughput(items: int, elapsed: float) -> dict[str, float]:
+    """Summarizes a run timed only as a whole into its item count, wall clock and throughput.
+
+    Use it instead of `summarize` when items are not timed one by one, so no latency
+    percentiles are made up from the mean.
+    """
+    return {
+        "items": items,
+        "elapsed_s": elapsed,
+        "throughput_per_s": items / elapsed if elapsed else 0.0,
+    }
+
+
+def timed(func: Callable[..., T], *args: object, **kwargs: object) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def save_results(
+    name: str, results: dict[str, dict[str, float]], params: dict[str, Any], output: Path | None
+) -> Path:
+    """Saves benchmark results as JSON, named after the benchmark and the current commit."""
+    commit = git_commit()
+    output = output or RESULTS_DIR / f"{name}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "commit": commit,
+        "created_at": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": params,
+        "results": results,
+    }
+    output.write_bytes(orjson.dumps(payload, default=str, option=orjson.OPT_INDENT_2))
+    return output
+
+
+def print_results(title: str, results: dict[str, dict[str, float]]) -> None:
+    columns = sorted({column for result in results.values() for column in result})
+    table = Table("Stage", *columns, title=title)
+    table.columns[0].no_wrap = True
+    for name, result in results.items():
+        table.add_row(
+            name, *(f"{result[column]:.3f}" if column in result else "-" for column in columns)
+        )
+    Console().print(table)
+
+
+def compare_results(baseline: Path, candidate: Path, metric: str = "p50_ms") -> None:
+    """Prints the relative change of `metric` between two saved benchmark results."""
+    old = orjson.loads(baseline.read_bytes())
+    new = orjson.loads(candidate.read_bytes())
+    table = Table(
+        "Stage", old["commit"], new["commit"], "Change", title=f"{new['benchmark']} {metric}"
+    )
+    for stage, result in new["results"].items():
+        before = old["results"].get(stage, {}).get(metric)
+        after = result.get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else float("nan")
+        table.add_row(stage, f"{before:.3f}", f"{after:.3f}", f"{change:+.1f}%")
+    Console().print(table)
@@ -0,0 +1,240 @@
+import json
+import hashlib
+from pathlib import Path
+import threading
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LAST_MODIFIED = "Thu, 12 Sep 2024 00:00:00 GMT"
+
+Response = str | tuple[int, str]
+Route = Response | list[Response]
+
+
+def build_detail_page(
+    title: str, price: str | None, updated: int = 1726099200, version: str = "1.0.0"
+) -> str:
+    """Builds a minimal play store detail page which `google_play_scraper` can parse."""
+    app_data: list = [None] * 146
+    app_data[0] = [title]
+    app_data[19] = [price] if price is not None else None
+    app_data[140] = [[[version]]]
+    app_data[145] = [[None, [updated]]]
+    dataset = [None, [None, None, app_data]]
+    return (
+        "<html><body><script>AF_initDataCallback({key: 'ds:5', hash: '1', "
+        f"data:{json.dumps(dataset, ensure_ascii=False)}, sideChannel: {{}}}});</script>"
+        "</body></html>"
+    )
+
+
+def build_currency_page(
+    currency: str, currencies: dict[str, tuple[str, dict[str, str]]], date: str = "2024-09-12"
+) -> str:
+    """Builds a twrates card rate page of `currency`, listing every currency in `currencies`.
+
+    `currencies` maps a lower-case currency code to its chinese name and card rates.
+    """
+    name_cn, rates = currencies[currency]
+    items = "".join(
+        f'<li class="itm"><a href="/card/mastercard/{code}.html">{code.upper()} - {name}</a></li>'
+        for code, (name, _) in currencies.items()
+    )
+    rows = "".join(
+        f"<tr><td>{card}</td><td>{rate}&nbsp;({date})</td></tr>" for card, rate in rates.items()
+    )
+    return (
+        "<html><body>"
+        '<a href="javascript:void(0)" onclick="change_ccy()">'
+        f'萬事達卡匯率 - {name_cn}&nbsp;&nbsp;<b class="caret"></b></a>'
+        f'<ul class="dropdown">{items}</ul>'
+        f"<table><tr><th>卡別</th><th>匯率</th></tr>{rows}</table>"
+        "</body></html>"
+    )
+
+
+class StubServer:
+    """A local HTTP server replaying canned responses keyed by request path.
+
+    Args:
+        routes (dict[str, Route]): Mapping from path (with query string) to the response body,
+            to a `(status_code, body)` tuple, or to a list of those replayed in order where the
+            last one is repeated forever.
+        conditional (bool): Whether successful responses carry an ETag of their body and a
+            fixed Last-Modified, and matching conditional requests are answered 304.
+    """
+
+    def __init__(self, routes: dict[str, Route] | None = None, conditional: bool = False):
+        self.routes = routes or {}
+        self.conditional = conditional
+        self.hits: dict[str, int] = {}
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server: HTTPServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_hit(self, path: str) -> None:
+        with self._lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def resolve(self, path: str) -> tuple[int, str]:
+        response = self.routes.get(path)
+        if isinstance(response, list):
+            with self._lock:
+                response = response.pop(0) if len(response) > 1 else response[0]
+        if response is None:
+            return 404, "not found"
+        if isinstance(response, tuple):
+            return response
+        return 200, response
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                stub.record_hit(self.path)
+                status_code, body = stub.resolve(self.path)
+                payload = body.encode("utf-8")
+                validators = {}
+                if stub.conditional and status_code == 200:
+                    etag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+                    validators = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+                    # If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+                    if_none_match = self.headers.get("If-None-Match")
+                    if_modified_since = self.headers.get("If-Modified-Since")
+                    if (
+                        if_none_match == etag
+                        if if_none_match is not None
+                        else if_modified_since == LAST_MODIFIED
+                    ):
+                        stub.record_not_modified()
+                        status_code, payload = 304, b""
+                self.send_response(status_code)
+                for name, value in validators.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubServer":
+        """Starts serving on a random local port in a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class PlayStoreStub(StubServer):
+    """A stub of the play store detail endpoint.
+
+    Args:
+        prices (dict[tuple[str, str], str | None]): Mapping from `(app_id, country)` to the
+            `inAppProductPrice` string.
+    """
+
+    def __init__(self, prices: dict[tuple[str, str], str | None]):
+        super().__init__()
+        self.prices = prices
+
+    @property
+    def detail_url(self) -> str:
+        return f"{self.base_url}/store/apps/details?id={{app_id}}&hl={{lang}}&gl={{country}}"
+
+    def resolve(self, path: str) -> tuple[int, str]:
+        query = parse_qs(urlsplit(path).query)
+        key = (query.get("id", [""])[0], query.get("gl", [""])[0])
+        if key not in self.prices:
+            return 404, "not found"
+        return 200, build_detail_page(title=key[0], price=self.prices[key])
+
+
+class TwratesStub(StubServer):
+    """A stub of the twrates card rate pages.
+
+    Args:
+        currencies (dict[str, tuple[str, dict[str, str]]]): Mapping from lower-case currency code
+            to its chinese name and card rates.
+        broken (set[str] | None): Currency codes whose page responds with a server error.
+        conditional (bool): Whether pages carry validators and may be answered 304.
+    """
+
+    def __init__(
+        self,
+        currencies: dict[str, tuple[str, dict[str, str]]],
+        broken: set[str] | None = None,
+        conditional: bool = False,
+    ):
+        super().__init__(conditional=conditional)
+        self.currencies = currencies
+        self.broken = broken or set()
+
+    def resolve(self, path: str) -> tuple[int, str]:
+        currency = path.rsplit("/", 1)[-1].removesuffix(".html")
+        if currency in self.broken:
+            return 500, "internal server error"
+        if currency not in self.currencies:
+            return 404, "not found"
+        return 200, build_currency_page(currency=currency, currencies=self.currencies)
+
+
+class ReplayServer(StubServer):
+    """Replays the synthetic twrates and play store pages in `benchmarks/fixtures`.
+
+    The pages are generated by `benchmarks/build_fixtures.py` rather than captured from the
+    live sites: they carry the markup the scrapers parse, padded with filler to the size of
+    live pages, so parse timings measured on them are indicative only.
+
+    Twrates pages are served from `twrates/{currency}.html`. Play store detail pages are served
+    from `play_store/{app_id}.html`, or from `play_store/default.html` for any other app, so
+    any number of games and countries can be swept against it.
+    """
+
+    def __init__(self, fixtures: Path = FIXTURES, conditional: bool = False):
+        super().__init__(conditional=conditional)
+        self.fixtures = fixtures
+        self._pages: dict[Path, str] = {}
+
+    @property
+    def detail_url(self) -> str:
+        return f"{self.base_url}/store/apps/details?id={{app_id}}&hl={{lang}}&gl={{country}}"
+
+    def _read(self, path: Path) -> str:
+        if path not in self._pages:
+            self._pages[path] = path.read_text(encoding="utf-8")
+        return self._pages[path]
+
+    def resolve(self, path: str) -> tuple[int, str]:
+        url = urlsplit(path)
+        if url.path.startswith("/card/mastercard/"):
+            page = self.fixtures / "twrates" / url.path.rsplit("/", 1)[-1]
+            return (200, self._read(page)) if page.exists() else (404, "not found")
+        if url.path == "/store/apps/details":
+            app_id = parse_qs(url.query).get("id", [""])[0]
+            page = self.fixtures / "play_store" / f"{app_id}.html"
+            if not page.exists():
+                page = self.fixtures / "play_store" / "default.html"
+            return 200, self._read(page)
+        return 404, "not found"
@@ -1,9 +1,8 @@
-from src.currency_core import CurrencyCore
+import sys
+
+from src.cli import main
 
 if __name__ == "__main__":
-    currency_rate = CurrencyCore()
-    currency_rate_list = currency_rate.fetch_currency_rates(currency_name_en="all")
-    # currency_rate_list = [f.model_dump() for f in currency_rate_list]
-    # game_info_fetcher = GameInfoUpdater(game_name="天堂W", country="us")
-    # game_info_result = game_info_fetcher.fetch_game_info()
-    # game_info_result = [f.model_dump() for f in game_info_result]
+    # Without arguments, keep the scheduled job: every currency rate into the history.
+    argv = sys.argv[1:] or ["run", "--currencies", "all", "--history", "./data/history"]
+    raise SystemExit(main(argv))
@@ -0,0 +1,7 @@
+import os
+
+# pydantic loads its plugins on the first model definition, and the logfire plugin imports the
+# whole logfire and OpenTelemetry stack with it. Nothing here uses that plugin, so it is skipped
+# unless `PYDANTIC_DISABLE_PLUGINS` is set explicitly. Every entry point (`main.py`, `api.py`,
+# the `igpf` script and `python -m src.cli`) imports this package before defining a model.
+os.environ.setdefault("PYDANTIC_DISABLE_PLUGINS", "logfire-plugin")
@@ -0,0 +1,255 @@
+import time
+from pathlib import Path
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+
+import orjson
+from pydantic import Field, BaseModel, JsonValue, PrivateAttr
+
+from src.lazy import lazy_import
+from src.typings.cache import CacheStats
+
+logfire = lazy_import("logfire")
+
+
+class ResultCache(BaseModel):
+    """A two-tier TTL cache for scraped results.
+
+    Entries live in an in-memory LRU tier backed by a SQLite file, so repeat runs inside the
+    TTL of a source never touch the network. Each source (namespace) has its own TTL, and an
+    expired entry can still be served for `stale_ttl` seconds while it is revalidated in a
+    background thread.
+
+    Example:
+        >>> cache = ResultCache(path="./.cache/igpf/cache.sqlite")
+        >>> cache.get_or_fetch("currency_rate", "usd", fetch=lambda: {"JCB": "32.137"})
+        {'JCB': '32.137'}
+        >>> cache.stats.misses
+        1
+    """
+
+    path: str | None = Field(
+        default="./.cache/igpf/cache.sqlite",
+        title="Path",
+        description="Path of the SQLite file, None keeps the cache in memory only",
+    )
+    max_entries: int = Field(
+        default=4096,
+        title="Max Entries",
+        description="Maximum number of entries kept in the memory tier",
+        ge=1,
+    )
+    ttls: dict[str, float] = Field(
+        default={
+            "currency_list": 86400,
+            "currency_rate": 86400,
+            "game_price": 604800,
+            "page": 259200,
+        },
+        title="TTLs",
+        description="Time to live in seconds per namespace",
+    )
+    default_ttl: float = Field(
+        default=3600,
+        title="Default TTL",
+        description="Time to live in seconds for namespaces missing from `ttls`",
+    )
+    stale_ttl: float = Field(
+        default=3600,
+        title="Stale TTL",
+        description="Seconds an expired entry may still be served while it is revalidated",
+        ge=0,
+    )
+
+    _memory: OrderedDict[tuple[str, str], tuple[float, JsonValue]] = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _connection: sqlite3.Connection | None = PrivateAttr(default=None)
+    _stats: CacheStats = PrivateAttr(default_factory=CacheStats)
+    _refreshing: dict[tuple[str, str], threading.Thread] = PrivateAttr(default_factory=dict)
+    _inflight: dict[tuple[str, str], Future] = PrivateAttr(default_factory=dict)
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+
+    @property
+    def connection(self) -> sqlite3.Connection | None:
+        if self.path is None:
+            return None
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "value BLOB NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._stats.model_copy()
+
+    def ttl(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def _remember(self, namespace: str, key: str, stored_at: float, value: JsonValue) -> None:
+        self._memory[namespace, key] = (stored_at, value)
+        self._memory.move_to_end((namespace, key))
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _lookup(self, namespace: str, key: str) -> tuple[float, JsonValue] | None:
+        entry = self._memory.get((namespace, key))
+        if entry is not None:
+            self._memory.move_to_end((namespace, key))
+            return entry
+        if self.connection is None:
+            return None
+        row = self.connection.execute(
+            "SELECT stored_at, value FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        stored_at, value = row[0], orjson.loads(row[1])
+        self._stats.disk_hits += 1
+        self._remember(namespace, key, stored_at, value)
+        return stored_at, value
+
+    def get(self, namespace: str, key: str, max_age: float | None = None) -> JsonValue | None:
+        """Returns a fresh entry, or None when it is missing or expired.
+
+        Args:
+            namespace (str): The source of the value, which selects its TTL.
+            key (str): The key of the value inside the namespace.
+            max_age (float | None): Seconds an entry stays fresh, overriding the TTL of the
+                namespace; `math.inf` returns entries of any age.
+        """
+        with self._lock:
+            entry = self._lookup(namespace, key)
+        max_age = self.ttl(namespace) if max_age is None else max_age
+        if entry is None or time.time() - entry[0] > max_age:
+            return None
+        return entry[1]
+
+    def set(self, namespace: str, key: str, value: JsonValue) -> None:
+        """Stores a JSON serializable value in both tiers."""
+        stored_at = time.time()
+        with self._lock:
+            self._remember(namespace, key, stored_at, value)
+            if self.connection is not None:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, stored_at, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (namespace, key, stored_at, orjson.dumps(value)),
+                )
+                self.connection.commit()
+
+    def invalidate(self, namespace: str | None = None, key: str | None = None) -> None:
+        """Drops one entry, every entry of a namespace, or the whole cache.
+
+        Args:
+            namespace (str | None): The namespace to drop, None drops every namespace.
+            key (str | None): The key to drop inside `namespace`, None drops the namespace.
+        """
+        with self._lock:
+            for cached_namespace, cached_key in list(self._memory):
+                if namespace in {None, cached_namespace} and key in {None, cached_key}:
+                    del self._memory[cached_namespace, cached_key]
+            if self.connection is None:
+                return
+            if namespace is None:
+                self.connection.execute("DELETE FROM entries")
+            elif key is None:
+                self.connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            else:
+                self.connection.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+            self.connection.commit()
+
+    def _refresh(self, namespace: str, key: str, fetch: Callable[[], JsonValue | None]) -> None:
+        try:
+            value = fetch()
+            if value is not None:
+                self.set(namespace, key, value)
+        except Exception:
+            logfire.exception("Failed to revalidate cache entry", namespace=namespace, key=key)
+        finally:
+            with self._lock:
+                self._refreshing.pop((namespace, key), None)
+
+    def get_or_fetch(
+        self, namespace: str, key: str, fetch: Callable[[], JsonValue | None]
+    ) -> JsonValue | None:
+        """Returns a cached value, fetching and storing it on a miss.
+
+        Fresh entries are returned as is. Entries expired for less than `stale_ttl` seconds are
+        returned immediately while `fetch` refreshes them in the background. Anything older is
+        fetched synchronously, and concurrent misses of the same key wait for that one fetch
+        instead of fetching again. A `fetch` returning None is treated as a failure and not
+        stored.
+
+        Args:
+            namespace (str): The source of the value, which selects its TTL.
+            key (str): The key of the value inside the namespace.
+            fetch (Callable[[], JsonValue | None]): Fetches a fresh JSON serializable value.
+
+        Returns:
+            JsonValue | None: The cached or fetched value.
+        """
+        with self._lock:
+            entry = self._lookup(namespace, key)
+            age = time.time() - entry[0] if entry is not None else None
+            ttl = self.ttl(namespace)
+            if age is not None and age <= ttl:
+                self._stats.hits += 1
+                return entry[1]
+            if age is not None and age <= ttl + self.stale_ttl:
+                self._stats.stale_hits += 1
+                if (namespace, key) not in self._refreshing:
+                    self._stats.refreshes += 1
+                    thread = threading.Thread(
+                        target=self._refresh, args=(namespace, key, fetch), daemon=True
+                    )
+                    self._refreshing[namespace, key] = thread
+                    thread.start()
+                return entry[1]
+            flight = self._inflight.get((namespace, key))
+            if flight is not None:
+                self._stats.coalesced += 1
+            else:
+                self._stats.misses += 1
+                self._inflight[namespace, key] = Future()
+        if flight is not None:
+            return flight.result()
+        try:
+            value = fetch()
+            if value is not None:
+                self.set(namespace, key, value)
+        except BaseException as e:
+            self._land(namespace, key).set_exception(e)
+            raise
+        self._land(namespace, key).set_result(value)
+        return value
+
+    def _land(self, namespace: str, key: str) -> Future:
+        with self._lock:
+            return self._inflight.pop((namespace, key))
+
+    def close(self) -> None:
+        """Waits for background revalidations and closes the SQLite file."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
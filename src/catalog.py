@@ -0,0 +1,148 @@
+import os
+import bisect
+from typing import ClassVar, NamedTuple
+import threading
+from collections import defaultdict
+
+import orjson
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.typings.game import GameInfo
+
+
+class _Index(NamedTuple):
+    games: list[GameInfo]
+    by_game_id: dict[str, GameInfo]
+    by_id: dict[int, GameInfo]
+    sorted_names: list[tuple[str, int]]
+    ngrams: dict[str, set[int]]
+
+
+_EMPTY_INDEX = _Index(games=[], by_game_id={}, by_id={}, sorted_names=[], ngrams={})
+
+
+class GameCatalog(BaseModel):
+    """An indexed, lazily reloaded view of `configs/gameList.json`.
+
+    The file is parsed once and only parsed again when its modification time changes.
+    Lookups by package ID or game ID are dictionary lookups, prefix searches bisect a sorted
+    name list, and substring searches intersect character bigram postings before verifying the
+    candidates, which works the same for CJK names such as `天堂W`.
+
+    Example:
+        >>> catalog = GameCatalog.shared()
+        >>> catalog.get("com.ncsoft.lineagew")
+        GameInfo(game_id='com.ncsoft.lineagew', game_name='天堂W', id=1)
+        >>> [game.game_name for game in catalog.search("天堂")]
+        ['天堂W', '天堂M', '天堂2M']
+    """
+
+    path: str = Field(
+        default="./configs/gameList.json",
+        title="Path",
+        description="Path of the game list",
+        examples=["./configs/gameList.json"],
+    )
+
+    _instances: ClassVar[dict[str, "GameCatalog"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+    _mtime_ns: int | None = PrivateAttr(default=None)
+    # Every index is replaced at once, so lookups never mix two versions of the list.
+    _index: _Index = PrivateAttr(default=_EMPTY_INDEX)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def shared(cls, path: str = "./configs/gameList.json") -> "GameCatalog":
+        """Returns the process wide catalog of `path`, so every caller shares one index."""
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path=path)
+            return cls._instances[path]
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return name.casefold()
+
+    @staticmethod
+    def _grams(text: str) -> set[str]:
+        if len(text) < 2:
+            return {text}
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    def _build(self, games: list[GameInfo]) -> None:
+        by_game_id: dict[str, GameInfo] = {}
+        by_id: dict[int, GameInfo] = {}
+        ngrams: dict[str, set[int]] = defaultdict(set)
+        sorted_names: list[tuple[str, int]] = []
+        for index, game in enumerate(games):
+            by_game_id[game.game_id] = game
+            if game.id is not None:
+                by_id[game.id] = game
+            name = self._normalize(game.game_name)
+            sorted_names.append((name, index))
+            for gram in self._grams(name) | set(name):
+                ngrams[gram].add(index)
+        sorted_names.sort()
+        self._index = _Index(
+            games=games,
+            by_game_id=by_game_id,
+            by_id=by_id,
+            sorted_names=sorted_names,
+            ngrams=dict(ngrams),
+        )
+
+    def refresh(self) -> None:
+        """Reloads the game list when the file changed since it was last parsed."""
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if mtime_ns == self._mtime_ns:
+            return
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            with open(self.path, "rb") as f:
+                game_list = orjson.loads(f.read())
+            self._build([GameInfo(**game) for game in game_list])
+            self._mtime_ns = mtime_ns
+
+    @property
+    def games(self) -> list[GameInfo]:
+        self.refresh()
+        return list(self._index.games)
+
+    def get(self, game_id: str) -> GameInfo | None:
+        """Looks up a game by its package ID, e.g. `com.ncsoft.lineagew`."""
+        self.refresh()
+        return self._index.by_game_id.get(game_id)
+
+    def get_by_id(self, id: int) -> GameInfo | None:  # noqa: A002
+        """Looks up a game by its ID in the game list."""
+        self.refresh()
+        return self._index.by_id.get(id)
+
+    def search(self, name: str) -> list[GameInfo]:
+        """Returns every game whose name contains `name`, ignoring case, in game list order."""
+        self.refresh()
+        catalog = self._index
+        query = self._normalize(name)
+        if not query:
+            return list(catalog.games)
+        postings = [catalog.ngrams.get(gram, set()) for gram in self._grams(query)]
+        candidates = set.intersection(*postings)
+        return [
+            catalog.games[index]
+            for index in sorted(candidates)
+            if query in self._normalize(catalog.games[index].game_name)
+        ]
+
+    def search_prefix(self, prefix: str) -> list[GameInfo]:
+        """Returns every game whose name starts with `prefix`, ignoring case, sorted by name."""
+        self.refresh()
+        catalog = self._index
+        query = self._normalize(prefix)
+        start = bisect.bisect_left(catalog.sorted_names, (query, -1))
+        matches = []
+        for name, index in catalog.sorted_names[start:]:
+            if not name.startswith(query):
+                break
+            matches.append(catalog.games[index])
+        return matches
@@ -0,0 +1,488 @@
+import time
+from typing import TYPE_CHECKING
+import argparse
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import Field, BaseModel
+
+from src.lazy import lazy_import
+from src.cache import ResultCache
+from src.sinks import ResultSink
+from src.catalog import GameCatalog
+from src.sharding import ShardedSweep
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.incremental import IncrementalRefresher
+from src.typings.job import JobSpec, SinkSpec, JobResult
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GameInfo, GamePriceInfo
+from src.currency_core import CurrencyCore
+from src.country_lookup import CountryLookup
+from src.typings.incremental import RefreshResult
+from src.typings.currency_rate import CurrencyRate
+
+if TYPE_CHECKING:
+    from rich.text import Text
+    from rich.progress import Task, ProgressColumn
+
+    from src.typings.discovery import DiscoveryReport
+
+logfire = lazy_import("logfire")
+history = lazy_import("src.history")
+service = lazy_import("src.service")
+discovery = lazy_import("src.discovery")
+
+Advance = Callable[[int, int | None], None]
+
+
+def _ignore(completed: int, total: int | None) -> None:
+    pass
+
+
+class JobRunner(BaseModel):
+    """Runs the currency and game fetches of a job side by side in one process.
+
+    Both fetches share one pooled `HttpClient` and one `ResultCache`, and each reports its
+    progress through an `advance(completed, total)` callback.
+
+    Example:
+        >>> runner = JobRunner.from_spec(JobSpec(games=["天堂W"], currencies=["usd"]))
+        >>> result = runner.run()
+        >>> len(result.currency_rates), len(result.game_prices)
+        (1, 1)
+    """
+
+    spec: JobSpec = Field(..., title="Job Spec", description="The job to run")
+    currency_core: CurrencyCore = Field(
+        default_factory=CurrencyCore,
+        title="Currency Core",
+        description="Scraper of the twrates card rates",
+    )
+    engine: GameFetchEngine = Field(
+        default_factory=GameFetchEngine,
+        title="Game Fetch Engine",
+        description="Scraper of the play store price ranges",
+    )
+    catalog: GameCatalog = Field(
+        default_factory=GameCatalog.shared,
+        title="Game Catalog",
+        description="Indexed game list used to resolve the games of the job",
+    )
+    lookup: CountryLookup = Field(
+        default_factory=CountryLookup.shared,
+        title="Country Lookup",
+        description="Country to currency table used to resolve countries and currencies",
+    )
+
+    @classmethod
+    def from_spec(cls, spec: JobSpec, cache: ResultCache | None = None) -> "JobRunner":
+        """Builds a runner whose scrapers share one HTTP client and one cache."""
+        client = HttpClient()
+        return cls(
+            spec=spec,
+            currency_core=CurrencyCore(client=client, cache=cache),
+            engine=GameFetchEngine(
+                client=client, cache=cache, max_in_flight=spec.max_in_flight, lang=spec.lang
+            ),
+        )
+
+    def resolve_games(self) -> list[GameInfo]:
+        """Looks the games of the job up by package ID, then by name; `all` is every game.
+
+        Raises:
+            ValueError: If a game is not in the game list.
+        """
+        games: dict[str, GameInfo] = {}
+        for entry in self.spec.games:
+            if entry == "all":
+                games.update((game.game_id, game) for game in self.catalog.games)
+                continue
+            game_info = self.catalog.get(entry)
+            matches = [game_info] if game_info is not None else self.catalog.search(entry)
+            if not matches:
+                raise ValueError(f"Game not found in the game list: {entry}")
+            games.update((game.game_id, game) for game in matches)
+        return list(games.values())
+
+    def resolve_countries(self) -> list[str]:
+        """Normalizes the countries of the job to alpha-2 codes, dropping duplicates.
+
+        Raises:
+            ValueError: If a country is unknown.
+        """
+        countries = []
+        for entry in self.spec.countries:
+            country = self.lookup.normalize(entry)
+            if country is None:
+                raise ValueError(f"Unknown country: {entry}")
+            countries.append(country)
+        return list(dict.fromkeys(countries))
+
+    def resolve_currencies(self) -> list[str]:
+        """Returns the currency pages to fetch, each once.
+
+        `auto` stands for the currencies of the countries of the job, so countries sharing a
+        currency share one page. TWD has no twrates page, prices in TWD need no conversion.
+        """
+        currency_names = [name.lower() for name in self.spec.currencies]
+        if "auto" in currency_names:
+            currency_names.remove("auto")
+            currency_names.extend(self.lookup.currencies_for(self.resolve_countries()))
+        return [name for name in dict.fromkeys(currency_names) if name != "twd"]
+
+    def iter_currency_rates(self, advance: Advance = _ignore) -> Iterator[CurrencyRate]:
+        currency_names = self.resolve_currencies()
+        if "all" in currency_names:
+            country_list = self.currency_core.get_country_list() or []
+            currency_names = [currency.currency_name for currency in country_list]
+        advance(0, len(currency_names))
+        if not currency_names:
+            return
+        # Failed currencies are not yielded, so every attempt advances the progress instead.
+        yield from self.currency_core.iter_currency_rates(
+            currency_names=currency_names,
+            max_workers=self.spec.max_workers,
+            on_attempt=lambda currency_name: advance(1, None),
+        )
+
+    def iter_game_prices(self, advance: Advance = _ignore) -> Iterator[GamePriceInfo]:
+        games = self.resolve_games()
+        countries = self.resolve_countries()
+        advance(0, len(games) * len(countries))
+        for game_price in self.engine.iter_fetch(games=games, countries=countries):
+            advance(1, None)
+            yield game_price
+
+    def refresh_game_prices(self, advance: Advance = _ignore) -> RefreshResult:
+        """Refreshes the game prices incrementally, see `IncrementalRefresher`."""
+        games = self.resolve_games()
+        advance(0, len(games))
+        refresher = IncrementalRefresher(state_path=self.spec.state_path, engine=self.engine)
+        result = refresher.refresh(
+            games=games, countries=self.resolve_countries(), prune="all" in self.spec.games
+        )
+        advance(len(games), None)
+        return result
+
+    def run(
+        self, currency_advance: Advance | None = None, game_advance: Advance | None = None
+    ) -> JobResult:
+        """Fetches currencies and games concurrently and writes them to the sink of the job.
+
+        Args:
+            currency_advance (Advance | None): Progress callback of the currency fetch.
+            game_advance (Advance | None): Progress callback of the game fetch.
+
+        Returns:
+            JobResult: The fetched records, the elapsed time and the written files.
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            currency_future = executor.submit(
+                list, self.iter_currency_rates(currency_advance or _ignore)
+            )
+            if self.spec.incremental:
+                game_future = executor.submit(self.refresh_game_prices, game_advance or _ignore)
+            else:
+                game_future = executor.submit(list, self.iter_game_prices(game_advance or _ignore))
+            currency_rates, game_prices = currency_future.result(), game_future.result()
+        price_deltas = None
+        if self.spec.incremental:
+            game_prices, price_deltas = game_prices.prices, game_prices.deltas
+        sink = ResultSink(
+            format=self.spec.sink.format, path=self.spec.sink.path, cards=self.spec.cards
+        )
+        outputs = sink.write(rates=currency_rates, prices=game_prices, deltas=price_deltas)
+        if self.spec.history is not None:
+            store = history.HistoryStore(root=self.spec.history)
+            store.append_rates(currency_rates)
+            store.append_prices(game_prices)
+        logfire.info("Transport stats", **self.engine.client.stats.model_dump())
+        for traffic_stats in self.engine.client.traffic.stats.values():
+            logfire.info("Traffic stats", **traffic_stats.model_dump())
+        return JobResult(
+            currency_rates=currency_rates,
+            game_prices=game_prices,
+            price_deltas=price_deltas or [],
+            failures=self.currency_core.failures,
+            elapsed=time.perf_counter() - start,
+            outputs=[str(output) for output in outputs],
+        )
+
+
+def _throughput_column() -> "ProgressColumn":
+    from rich.text import Text
+    from rich.progress import ProgressColumn
+
+    class ThroughputColumn(ProgressColumn):
+        """Renders the completion rate of a task in items per second."""
+
+        def render(self, task: "Task") -> "Text":
+            speed = task.finished_speed or task.speed
+            return Text(f"{speed or 0.0:.1f} it/s", style="progress.data.speed")
+
+    return ThroughputColumn()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="igpf", description="Find the cheapest play store country for in-game purchases."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser(
+        "run", help="Fetch currency rates and game prices described by a job spec"
+    )
+    run_parser.add_argument("job", nargs="?", help="YAML or JSON job spec")
+    run_parser.add_argument("--games", nargs="+", help="Package IDs or game names")
+    run_parser.add_argument("--countries", nargs="+", help="Play store country codes")
+    run_parser.add_argument("--currencies", nargs="+", help="Currency names, `auto` or `all`")
+    run_parser.add_argument(
+        "--cards", nargs="+", choices=["jcb", "master", "visa"], help="Card networks to keep"
+    )
+    run_parser.add_argument(
+        "--format", choices=["jsonl", "csv", "parquet", "xlsx"], help="Output format of the sink"
+    )
+    run_parser.add_argument("--output", help="Output directory of the sink")
+    run_parser.add_argument(
+        "--incremental", action="store_true", help="Only refetch games which changed"
+    )
+    run_parser.add_argument("--history", help="Root of the Parquet history to append to")
+    run_parser.add_argument(
+        "--cache-path", default="./.cache/igpf/cache.sqlite", help="SQLite file of the cache"
+    )
+    run_parser.add_argument("--no-cache", action="store_true", help="Always fetch from the web")
+    run_parser.add_argument("--no-progress", action="store_true", help="Hide the progress bars")
+
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="Fetch every game of the game list in every country across processes"
+    )
+    sweep_parser.add_argument(
+        "--countries", nargs="+", default=["all"], help="Play store country codes or `all`"
+    )
+    sweep_parser.add_argument("--shards", type=int, default=4, help="Number of shards")
+    sweep_parser.add_argument(
+        "--shard", type=int, help="Run only this shard, for sweeps split across workers"
+    )
+    sweep_parser.add_argument("--processes", type=int, help="Size of the process pool")
+    sweep_parser.add_argument(
+        "--merge", action="store_true", help="Only merge the partial files of the shards"
+    )
+    sweep_parser.add_argument(
+        "--workdir", default="./.cache/igpf/shards", help="Directory of the partial files"
+    )
+    sweep_parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv", "parquet", "xlsx"],
+        default="jsonl",
+        help="Output format of the merged prices",
+    )
+    sweep_parser.add_argument(
+        "--output", default="./data/output", help="Output directory of the merged prices"
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve cached rates, prices and comparisons over HTTP"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    serve_parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=3600,
+        help="Seconds between background refreshes and TTL of the cached entries, 0 disables",
+    )
+    serve_parser.add_argument("--games", nargs="+", default=[], help="Games kept warm")
+    serve_parser.add_argument("--countries", nargs="+", default=["us"], help="Countries kept warm")
+    serve_parser.add_argument(
+        "--cache-path", default="./.cache/igpf/cache.sqlite", help="SQLite file of the cache"
+    )
+
+    discover_parser = subparsers.add_parser(
+        "discover", help="Search play store and add the games found to the game list"
+    )
+    discover_parser.add_argument("--terms", nargs="+", default=[], help="Search terms")
+    discover_parser.add_argument(
+        "--developers", nargs="+", default=[], help="Developers whose apps are added"
+    )
+    discover_parser.add_argument(
+        "--terms-file", help="File with one search term per line, for bulk discovery"
+    )
+    discover_parser.add_argument(
+        "--game-list", default="./configs/gameList.json", help="Game list to merge into"
+    )
+    discover_parser.add_argument("--hits", type=int, default=3, help="Results kept per term")
+    discover_parser.add_argument(
+        "--max-in-flight", type=int, default=8, help="Searches running at the same time"
+    )
+    return parser
+
+
+def load_spec(args: argparse.Namespace) -> JobSpec:
+    """Loads the job spec file, if any, and applies the command line overrides."""
+    spec = JobSpec.from_file(args.job) if args.job else JobSpec()
+    overrides = {
+        key: value
+        for key, value in {
+            "games": args.games,
+            "countries": args.countries,
+            "currencies": args.currencies,
+            "cards": args.cards,
+            "history": args.history,
+            "incremental": args.incremental or None,
+        }.items()
+        if value is not None
+    }
+    sink = SinkSpec(format=args.format or spec.sink.format, path=args.output or spec.sink.path)
+    return spec.model_copy(update={**overrides, "sink": sink})
+
+
+def run(args: argparse.Namespace) -> JobResult:
+    from rich.console import Console
+    from rich.progress import (
+        Progress,
+        BarColumn,
+        TextColumn,
+        TimeElapsedColumn,
+        MofNCompleteColumn,
+    )
+
+    spec = load_spec(args)
+    cache = None if args.no_cache else ResultCache(path=args.cache_path)
+    runner = JobRunner.from_spec(spec, cache=cache)
+    console = Console()
+    progress = Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        _throughput_column(),
+        TimeElapsedColumn(),
+        console=console,
+        disable=args.no_progress,
+    )
+    currency_task = progress.add_task("Currency rates", total=None)
+    game_task = progress.add_task("Game prices", total=None)
+
+    def advance(task_id: int) -> Advance:
+        def update(completed: int, total: int | None) -> None:
+            if total is not None:
+                progress.update(task_id, total=total)
+            if completed:
+                progress.advance(task_id, completed)
+
+        return update
+
+    try:
+        with progress:
+            result = runner.run(
+                currency_advance=advance(currency_task), game_advance=advance(game_task)
+            )
+    finally:
+        runner.engine.client.close()
+        if cache is not None:
+            cache.close()
+    console.print(
+        f"Fetched {len(result.currency_rates)} currency rates and {len(result.game_prices)} "
+        f"game prices in {result.elapsed:.2f}s, written to {', '.join(result.outputs)}"
+    )
+    failed_prices = [price for price in result.game_prices if price.error is not None]
+    if failed_prices or result.failures:
+        retryable = [record for record in [*failed_prices, *result.failures] if record.retryable]
+        console.print(
+            f"{len(failed_prices)} game prices and {len(result.failures)} currency pages failed, "
+            f"{len(retryable)} of them worth retrying"
+        )
+    return result
+
+
+def sweep(args: argparse.Namespace) -> list[GamePriceInfo]:
+    """Runs a sharded sweep; with `--shard` only that shard runs and nothing is merged."""
+    lookup = CountryLookup.shared()
+    countries = []
+    for entry in args.countries:
+        if entry == "all":
+            countries.extend(lookup.countries)
+            continue
+        country = lookup.normalize(entry)
+        if country is None:
+            raise ValueError(f"Unknown country: {entry}")
+        countries.append(country)
+    sharded_sweep = ShardedSweep(
+        countries=list(dict.fromkeys(countries)), shards=args.shards, workdir=args.workdir
+    )
+    if args.shard is not None:
+        sharded_sweep.run_shard(args.shard)
+        return []
+    prices = sharded_sweep.merge() if args.merge else sharded_sweep.run(processes=args.processes)
+    ResultSink(format=args.format, path=args.output).write_prices(prices)
+    return prices
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Serves the HTTP API until interrupted, see `src.service`."""
+    # Entries expire with every refresh, which then revalidates them in the background.
+    ttls = {}
+    if args.refresh_interval:
+        namespaces = ResultCache.model_fields["ttls"].default
+        ttls = {
+            "ttls": dict.fromkeys(namespaces, args.refresh_interval),
+            "default_ttl": args.refresh_interval,
+        }
+    cache = ResultCache(path=args.cache_path, **ttls)
+    price_service = service.PriceService.from_cache(
+        cache,
+        refresh_interval=args.refresh_interval,
+        refresh_games=args.games,
+        refresh_countries=args.countries,
+    )
+    server = service.build_server(price_service, host=args.host, port=args.port)
+    price_service.start()
+    logfire.info("Serving", host=args.host, port=server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        price_service.stop()
+        cache.close()
+
+
+def discover(args: argparse.Namespace) -> "DiscoveryReport":
+    """Searches the terms and developers and merges the hits into the game list."""
+    from rich.console import Console
+
+    terms = list(args.terms)
+    if args.terms_file:
+        with open(args.terms_file, encoding="utf-8") as file:
+            terms.extend(line.strip() for line in file if line.strip())
+    terms.extend(discovery.developer_query(developer) for developer in args.developers)
+    if not terms:
+        raise ValueError("Nothing to search, pass --terms, --developers or --terms-file")
+    report = discovery.GameDiscovery(
+        path=args.game_list, n_hits=args.hits, max_in_flight=args.max_in_flight
+    ).run(terms)
+    Console().print(
+        f"Searched {report.queries} terms in {report.elapsed:.2f}s: {report.hits} games found, "
+        f"{report.added} added to {report.path}, {len(report.failed)} searches failed"
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the `igpf` command."""
+    args = build_parser().parse_args(argv)
+    telemetry.configure()
+    if args.command == "run":
+        run(args)
+    elif args.command == "sweep":
+        sweep(args)
+    elif args.command == "serve":
+        serve(args)
+    elif args.command == "discover":
+        discover(args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
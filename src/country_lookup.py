@@ -0,0 +1,176 @@
+import csv
+from typing import TYPE_CHECKING, ClassVar
+import threading
+from collections.abc import Iterable
+
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+pd = lazy_import("pandas")
+pycountry = lazy_import("pycountry")
+
+# Currencies in the CSV which were replaced since it was written, by their successor.
+SUPERSEDED_CURRENCIES = {
+    "byr": "byn",
+    "cyp": "eur",
+    "ecs": "usd",
+    "eek": "eur",
+    "hrk": "eur",
+    "ltl": "eur",
+    "lvl": "eur",
+    "mro": "mru",
+    "mtl": "eur",
+    "skk": "eur",
+    "sll": "sle",
+    "std": "stn",
+    "vef": "ves",
+    "zmk": "zmw",
+    "zwd": "zwl",
+}
+
+
+class CountryLookup(BaseModel):
+    """A precomputed country to currency table built once from `countries_currency.csv`.
+
+    Countries are ISO 3166 alpha-2 codes and currencies are lower-case ISO 4217 codes, which
+    are also the twrates page slugs (`usd` for `https://www.twrates.com/card/mastercard/usd.html`).
+    Rows whose country is not an ISO code are skipped and superseded currencies are replaced by
+    their successors. Country names and alpha-3 codes are resolved through pycountry.
+
+    Example:
+        >>> lookup = CountryLookup.shared()
+        >>> lookup.currency("JP"), lookup.currency("Japan"), lookup.currency("jpn")
+        ('jpy', 'jpy', 'jpy')
+        >>> lookup.countries_of("nzd")
+        ('ck', 'nu', 'nz', 'pn', 'tk')
+        >>> lookup.group_by_currency(["us", "ec", "jp"])
+        {'usd': ['us', 'ec'], 'jpy': ['jp']}
+    """
+
+    path: str = Field(
+        default="./configs/countries_currency.csv",
+        title="Path",
+        description="CSV with `Country`, `CountryCode`, `Currency` and `Code` columns",
+    )
+
+    _instances: ClassVar[dict[str, "CountryLookup"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+    _currency_by_country: dict[str, str] | None = PrivateAttr(default=None)
+    _countries_by_currency: dict[str, tuple[str, ...]] = PrivateAttr(default_factory=dict)
+    _names: dict[str, str] = PrivateAttr(default_factory=dict)
+    _aliases: dict[str, str] = PrivateAttr(default_factory=dict)
+    _frame: "DataFrame | None" = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def shared(cls, path: str = "./configs/countries_currency.csv") -> "CountryLookup":
+        """Returns the process wide lookup of `path`, so the CSV is parsed once."""
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path=path)
+            return cls._instances[path]
+
+    def _build(self) -> dict[str, str]:
+        with self._lock:
+            if self._currency_by_country is not None:
+                return self._currency_by_country
+            currency_by_country: dict[str, str] = {}
+            names: dict[str, str] = {}
+            with open(self.path, encoding="utf-8", newline="") as file:
+                for row in csv.DictReader(file):
+                    country = pycountry.countries.get(alpha_2=row["CountryCode"])
+                    if country is None or country.alpha_2.lower() in currency_by_country:
+                        continue
+                    code = country.alpha_2.lower()
+                    currency = row["Code"].lower()
+                    currency_by_country[code] = SUPERSEDED_CURRENCIES.get(currency, currency)
+                    names[code] = country.name
+            countries_by_currency: dict[str, list[str]] = {}
+            for code, currency in sorted(currency_by_country.items()):
+                countries_by_currency.setdefault(currency, []).append(code)
+            self._countries_by_currency = {
+                currency: tuple(codes) for currency, codes in countries_by_currency.items()
+            }
+            self._names = names
+            self._currency_by_country = currency_by_country
+            return currency_by_country
+
+    @property
+    def countries(self) -> list[str]:
+        """Returns every known country code, sorted."""
+        return sorted(self._build())
+
+    @property
+    def currencies(self) -> list[str]:
+        """Returns every known currency code, sorted."""
+        self._build()
+        return sorted(self._countries_by_currency)
+
+    def normalize(self, country: str) -> str | None:
+        """Resolves an alpha-2 code, an alpha-3 code or a country name to a lower-case alpha-2 code.
+
+        Returns:
+            str | None: The alpha-2 code, None when the country is unknown.
+        """
+        currency_by_country = self._build()
+        key = country.strip().lower()
+        if key in currency_by_country:
+            return key
+        if key not in self._aliases:
+            try:
+                match = pycountry.countries.lookup(country.strip())
+            except LookupError:
+                return None
+            self._aliases[key] = match.alpha_2.lower()
+        return self._aliases[key]
+
+    def name(self, country: str) -> str | None:
+        """Returns the ISO name of a country, e.g. `Japan` for `jp`."""
+        code = self.normalize(country)
+        return self._names.get(code) if code is not None else None
+
+    def currency(self, country: str) -> str | None:
+        """Returns the currency code of a country, which is also its twrates slug."""
+        code = self.normalize(country)
+        return self._build().get(code) if code is not None else None
+
+    def countries_of(self, currency: str) -> tuple[str, ...]:
+        """Returns the countries paying in `currency`, sorted."""
+        self._build()
+        return self._countries_by_currency.get(currency.lower(), ())
+
+    def group_by_currency(self, countries: Iterable[str]) -> dict[str, list[str]]:
+        """Groups countries by the currency they pay in, skipping unknown countries.
+
+        Args:
+            countries (Iterable[str]): Country codes or names.
+
+        Returns:
+            dict[str, list[str]]: The normalized country codes by currency, in input order.
+        """
+        groups: dict[str, list[str]] = {}
+        for country in countries:
+            code = self.normalize(country)
+            currency = self._build().get(code) if code is not None else None
+            if currency is not None and code not in groups.get(currency, []):
+                groups.setdefault(currency, []).append(code)
+        return groups
+
+    def currencies_for(self, countries: Iterable[str]) -> list[str]:
+        """Returns the distinct currencies of `countries`, so each is fetched once per run."""
+        return list(self.group_by_currency(countries))
+
+    @property
+    def frame(self) -> "DataFrame":
+        """Returns the `country` to `currency` table as a DataFrame, for joins."""
+        if self._frame is None:
+            currency_by_country = self._build()
+            self._frame = pd.DataFrame({
+                "country": list(currency_by_country),
+                "currency": list(currency_by_country.values()),
+            })
+        return self._frame
@@ -1,65 +1,184 @@
-import bs4
-import logfire
-from pydantic import BaseModel
-import requests
+import hashlib
+import functools
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from src.typings.currency_rate import CurrencyInfo, CurrencyRate, CountryCurrency
+import orjson
+from pydantic import Field, BaseModel, PrivateAttr
 
-logfire.configure()
+from src.lazy import lazy_import
+from src.cache import ResultCache
+from src.traffic import is_retryable
+from src.telemetry import telemetry
+from src.html_parser import TwratesParser
+from src.http_client import HttpClient
+from src.revalidation import PageRevalidator
+from src.typings.traffic import FetchFailure
+from src.typings.revalidation import RevalidationStats
+from src.typings.currency_rate import CurrencyRate, CountryCurrency
+
+logfire = lazy_import("logfire")
+
+
+@functools.cache
+def parser_version(model: type[BaseModel]) -> str:
+    """Returns the version of results parsed into `model`, from the parser and the schema."""
+    schema = orjson.dumps(model.model_json_schema(), option=orjson.OPT_SORT_KEYS)
+    return f"{TwratesParser.version}:{hashlib.sha256(schema).hexdigest()[:16]}"
 
 
 class CurrencyCore(BaseModel):
-    @staticmethod
-    def __parse_exchange_rate_info(exchange_rate_info: str) -> CurrencyInfo:
-        if "(" in exchange_rate_info:
-            exchange_rate, date_info = exchange_rate_info.split("(")
-            date_info = date_info.rstrip(")").strip()
-        else:
-            exchange_rate, date_info = exchange_rate_info, ""
-        exchange_rate = exchange_rate.replace("\xa0", "").strip()
-        return CurrencyInfo(exchange_rate=exchange_rate, date_info=date_info)
+    base_url: str = Field(
+        default="https://www.twrates.com",
+        title="Base URL",
+        description="Base URL of twrates",
+        examples=["https://www.twrates.com"],
+    )
+    client: HttpClient = Field(
+        default_factory=HttpClient,
+        title="HTTP Client",
+        description="Pooled HTTP client shared by every page request",
+    )
+    cache: ResultCache | None = Field(
+        default=None,
+        title="Cache",
+        description="Cache of scraped pages, None always scrapes from the network",
+    )
+    parser: TwratesParser = Field(
+        default_factory=TwratesParser, title="Parser", description="HTML parser of twrates pages"
+    )
 
-    def get_country_list(self) -> list[CountryCurrency]:
-        """Retrieves a list of all available currencies and their corresponding links.
+    reuse_window: float = Field(
+        default=60.0,
+        title="Reuse Window",
+        description="Seconds a downloaded page is reused, e.g. `usd.html` for the list and rate",
+        ge=0,
+    )
 
-        Returns:
-            A list of dictionaries, where each dictionary contains the currency name (in Chinese) as the key and the currency link as the value.
+    _pages: PageRevalidator | None = PrivateAttr(default=None)
+    _failures: dict[str, FetchFailure] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
-        Example:
-            >>> currency_rate = CurrencyCore()
-            >>> all_currency = currency_rate.get_country_list()
-            >>> print(all_currency[0])
-            CountryCurrency(currency_name='usd', currency_name_cn='美金', currency_url='https://www.twrates.com/card/mastercard/usd.html')
+    def model_post_init(self, context: object, /) -> None:
+        # Pages are revalidated with their ETag, so unchanged pages are neither downloaded
+        # nor parsed again, and the validators are kept in the cache across runs.
+        self._pages = PageRevalidator(
+            source="twrates", client=self.client, cache=self.cache, reuse_window=self.reuse_window
+        )
+
+    @property
+    def revalidation_stats(self) -> RevalidationStats:
+        """Returns how many page requests were answered 304 or served by an earlier response."""
+        return self._pages.stats
+
+    def _track(self, key: str, url: str, error: Exception | None = None) -> None:
+        """Records the failure of a page, or forgets it once the page was fetched."""
+        with self._lock:
+            if error is None:
+                self._failures.pop(key, None)
+                return
+            self._failures[key] = FetchFailure(
+                source="twrates",
+                key=key,
+                url=url,
+                error=f"{type(error).__name__}: {error}",
+                retryable=is_retryable(error),
+            )
+
+    @property
+    def failures(self) -> list[FetchFailure]:
+        """Returns an error record for every page whose latest fetch failed.
+
+        Scraping methods return None or skip a currency on failure; these records tell why
+        and whether retrying can help.
         """
+        with self._lock:
+            return list(self._failures.values())
+
+    def __scrape_country_list(self) -> list[CountryCurrency] | None:
         try:
             # Use this as base url to get all available currency
-            base_url = "https://www.twrates.com/card/mastercard/usd.html"
-            response = requests.get(url=base_url)
-            soup = bs4.BeautifulSoup(response.text, "html.parser")
-            currency_result: list[bs4.element.Tag] = soup.find_all("li", class_="itm")
-            currency_list = []
-            for currency in currency_result:
-                if not isinstance(currency.text, str):
-                    continue
-                currency_name = currency.text.strip()
-                currency_name_en = currency_name.split(" - ")[0].lower()
-                currency_name_cn = currency_name.split(" - ")[-1]
-                _currency_link = currency.find("a")["href"]
-                currency_link = f"https://www.twrates.com{_currency_link}"
-                country_currency = CountryCurrency(
-                    currency_name=currency_name_en,
-                    currency_name_cn=currency_name_cn,
-                    currency_url=currency_link,
+            base_url = f"{self.base_url}/card/mastercard/usd.html"
+            with telemetry.stage("currency_list", source="twrates"):
+                parsed = self._pages.fetch(
+                    base_url,
+                    parser="currency_list",
+                    parse=lambda text: [
+                        currency.model_dump()
+                        for currency in self.parser.parse_currency_list(
+                            text, base_url=self.base_url
+                        )
+                    ],
+                    version=parser_version(CountryCurrency),
                 )
-                currency_list.append(country_currency)
+            currency_list = [CountryCurrency(**currency) for currency in parsed]
+            self._track("currency_list", url=base_url)
             return currency_list
-        except Exception:
+        except Exception as e:
             logfire.exception(
                 "Failed to get currency list",
-                status_code=response.status_code,
                 url=base_url,
+                retryable=is_retryable(e),
                 _exc_info=True,
             )
+            self._track("currency_list", url=base_url, error=e)
+
+    def __scrape_currency_rate(self, country_name: str) -> CurrencyRate | None:
+        try:
+            base_url = f"{self.base_url}/card/mastercard/{country_name}.html"
+            with telemetry.stage("currency_rate", source="twrates", currency=country_name):
+                parsed = self._pages.fetch(
+                    base_url,
+                    parser="currency_rate",
+                    parse=lambda text: self.parser.parse_currency_rate(
+                        text, currency_name=country_name
+                    ).model_dump(by_alias=True),
+                    version=parser_version(CurrencyRate),
+                )
+            currency_rate = CurrencyRate(**parsed)
+            logfire.info(
+                "Currency rate fetched successfully.",
+                url=base_url,
+                **currency_rate.model_dump(by_alias=True),
+            )
+            self._track(country_name, url=base_url)
+            return currency_rate
+        except Exception as e:
+            logfire.exception(
+                "Failed to get currency rates",
+                country_name=country_name,
+                url=base_url,
+                retryable=is_retryable(e),
+                _exc_info=True,
+            )
+            self._track(country_name, url=base_url, error=e)
+
+    def get_country_list(self) -> list[CountryCurrency]:
+        """Retrieves a list of all available currencies and their corresponding links.
+
+        Returns:
+            A list of dictionaries, where each dictionary contains the currency name (in Chinese) as the key and the currency link as the value.
+
+        Example:
+            >>> currency_rate = CurrencyCore()
+            >>> all_currency = currency_rate.get_country_list()
+            >>> print(all_currency[0])
+            CountryCurrency(currency_name='usd', currency_name_cn='美金', currency_url='https://www.twrates.com/card/mastercard/usd.html')
+        """
+        if self.cache is None:
+            return self.__scrape_country_list()
+
+        def fetch() -> list[dict[str, str]] | None:
+            currency_list = self.__scrape_country_list()
+            if currency_list is None:
+                return None
+            return [currency.model_dump() for currency in currency_list]
+
+        cached = self.cache.get_or_fetch("currency_list", self.base_url, fetch=fetch)
+        if cached is None:
+            return None
+        return [CountryCurrency(**currency) for currency in cached]
 
     def _get_currency_rate(self, country_name: str) -> CurrencyRate:
         """Fetches the currency rates for a specific country.
@@ -76,45 +195,83 @@ class CurrencyCore(BaseModel):
             >>> print(result.model_dump())
             {'currency_en': 'usd', 'currency_cn': '美金', 'jcb': '32.137', 'master': '32.189', 'visa': '32.169', 'updated_time': '2024-09-12'}
         """
-        try:
-            base_url = f"https://www.twrates.com/card/mastercard/{country_name}.html"
-            response = requests.get(base_url)
-            soup = bs4.BeautifulSoup(response.text, "html.parser")
-            rows: list[bs4.element.Tag] = soup.find_all("tr")
-            currency_content = soup.find("a", onclick="change_ccy()")
-            currency_name = "未找到幣值名稱"
-            if not isinstance(currency_content.text, str):
-                raise logfire.exception("Failed to get currency name")
-            if currency_content:
-                currency_name = (
-                    currency_content.text.split(" - ")[1]
-                    .split("&nbsp;&nbsp;")[0]
-                    .replace("\xa0", "")
-                    .strip()
-                )
-            result = {"currency_en": country_name, "currency_cn": currency_name}
-            for row in rows:
-                cols: list[bs4.element.Tag] = row.find_all("td")
-                if len(cols) > 1:
-                    card_type: str = cols[0].text.strip()
-                    exchange_rate_info: str = cols[1].text.strip()
-                    currency_info = self.__parse_exchange_rate_info(exchange_rate_info)
-                    result[card_type] = currency_info.exchange_rate
-            result["updated_time"] = currency_info.date_info
-            logfire.info("Currency rate fetched successfully.", url=base_url, **result)
-            return CurrencyRate(**result)
-        except Exception:
-            logfire.exception(
-                "Failed to get currency rates",
-                country_name=country_name,
-                status_code=response.status_code,
-                url=base_url,
-                _exc_info=True,
-            )
+        if self.cache is None:
+            return self.__scrape_currency_rate(country_name=country_name)
+
+        def fetch() -> dict[str, str] | None:
+            fetched_currency = self.__scrape_currency_rate(country_name=country_name)
+            if fetched_currency is None:
+                return None
+            return fetched_currency.model_dump(by_alias=True)
+
+        key = f"{self.base_url}:{country_name}"
+        cached = self.cache.get_or_fetch("currency_rate", key, fetch=fetch)
+        if cached is None:
+            return None
+        return CurrencyRate(**cached)
+
+    def iter_currency_rates(
+        self,
+        currency_names: list[str] | None = None,
+        max_workers: int = 8,
+        on_attempt: Callable[[str], None] | None = None,
+    ) -> Iterator[CurrencyRate]:
+        """Fetches and parses currency pages concurrently, yielding rates as they arrive.
 
-    def fetch_currency_rates(self, currency_name_en: str) -> list[CurrencyRate]:
+        A page which fails to download or parse is logged and skipped, so it never drops the
+        rest of the batch.
+
+        Args:
+            currency_names (list[str] | None): Currency names to fetch, e.g. `["usd", "jpy"]`.
+                Defaults to every currency listed on twrates.
+            max_workers (int): Maximum number of pages fetched at the same time.
+            on_attempt (Callable[[str], None] | None): Called with the name of every currency
+                once its page was fetched or failed, e.g. to advance a progress bar.
+
+        Yields:
+            CurrencyRate: The currency rate of one currency, in completion order.
+
+        Example:
+            >>> currency_rate = CurrencyCore()
+            >>> for result in currency_rate.iter_currency_rates(max_workers=8):
+            ...     print(result.currency_en)
+        """
+        if currency_names is None:
+            country_list = self.get_country_list() or []
+            currency_names = [currency.currency_name for currency in country_list]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._get_currency_rate, country_name=currency_name): currency_name
+                for currency_name in currency_names
+            }
+            for future in as_completed(futures):
+                if on_attempt is not None:
+                    on_attempt(futures[future])
+                try:
+                    fetched_currency = future.result()
+                except Exception:
+                    logfire.exception("Failed to get currency rates", country_name=futures[future])
+                    continue
+                if fetched_currency is not None:
+                    yield fetched_currency
+
+    def fetch_currency_rates(
+        self, currency_name_en: str, max_workers: int = 1
+    ) -> list[CurrencyRate]:
+        """Fetches the currency rates of one currency or of every currency.
+
+        Args:
+            currency_name_en (str): Currency name such as `usd`, or `all` for every currency.
+            max_workers (int): Number of pages fetched concurrently in `all` mode; `1` fetches
+                them one after another.
+
+        Returns:
+            list[CurrencyRate]: The fetched currency rates.
+        """
         currency_rate_list = []
-        if currency_name_en == "all":
+        if currency_name_en == "all" and max_workers > 1:
+            currency_rate_list = list(self.iter_currency_rates(max_workers=max_workers))
+        elif currency_name_en == "all":
             country_list = self.get_country_list()
             for currency_dict in country_list:
                 fetched_currency = self._get_currency_rate(
@@ -124,9 +281,14 @@ class CurrencyCore(BaseModel):
         else:
             fetched_currency = self._get_currency_rate(country_name=currency_name_en)
             currency_rate_list.append(fetched_currency)
+        logfire.info("Transport stats", **self.client.stats.model_dump())
+        logfire.info("Revalidation stats", **self.revalidation_stats.model_dump())
+        if self.cache is not None:
+            logfire.info("Cache stats", **self.cache.stats.model_dump())
         return currency_rate_list
 
 
 if __name__ == "__main__":
+    telemetry.configure()
     currency_rate = CurrencyCore()
     currency_rate.fetch_currency_rates(currency_name_en="all")
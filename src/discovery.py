@@ -0,0 +1,170 @@
+import os
+import stat
+import time
+from pathlib import Path
+import tempfile
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from pydantic import Field, BaseModel
+
+from src.lazy import lazy_import
+from src.telemetry import telemetry
+from src.fetch_engine import HostRateLimiter
+from src.typings.game import GameInfo
+from src.typings.discovery import DiscoveryReport
+
+logfire = lazy_import("logfire")
+gps_search = lazy_import("google_play_scraper.features.search")
+
+Search = Callable[..., list[dict]]
+
+
+def developer_query(developer: str) -> str:
+    """Builds the play store query of every app published by `developer`.
+
+    Example:
+        >>> developer_query("NCSOFT")
+        'pub:"NCSOFT"'
+    """
+    return f'pub:"{developer}"'
+
+
+class GameDiscovery(BaseModel):
+    """Finds games on play store by search terms and merges them into `configs/gameList.json`.
+
+    Search terms, such as game names or `developer_query` queries, are searched concurrently
+    with at most `max_in_flight` searches at a time and `rate_limit` searches per second.
+    Hits are deduplicated by package ID in the order of the terms. `merge` leaves the games
+    already in the list untouched, including their hand-curated names, and appends the new
+    ones with IDs counting up from the highest ID in the list, so IDs never change between
+    runs. The list is replaced atomically and only written when a game was added.
+
+    Example:
+        >>> discovery = GameDiscovery(max_in_flight=16)
+        >>> report = discovery.run(["天堂", developer_query("NCSOFT")])
+        >>> report.added
+        12
+    """
+
+    path: str = Field(
+        default="./configs/gameList.json",
+        title="Path",
+        description="Game list the hits are merged into",
+    )
+    lang: str = Field(default="zh-TW", title="Language", description="Play store language")
+    country: str = Field(default="us", title="Country", description="Play store country code")
+    n_hits: int = Field(
+        default=3, title="Hits per Term", description="Search results kept per term", ge=1
+    )
+    max_in_flight: int = Field(
+        default=8,
+        title="Max In-Flight Searches",
+        description="Maximum number of searches running at the same time",
+        ge=1,
+    )
+    rate_limit: float = Field(
+        default=5.0,
+        title="Rate Limit",
+        description="Maximum searches per second, 0 means unlimited",
+        ge=0,
+    )
+    search: Search | None = Field(
+        default=None,
+        title="Search",
+        description="`search(query, n_hits=, lang=, country=)` returning play store results, "
+        "None uses `google_play_scraper.search`",
+        exclude=True,
+    )
+
+    def _search(self, term: str, limiter: HostRateLimiter) -> list[GameInfo]:
+        search = self.search or gps_search.search
+        limiter.acquire()
+        with telemetry.stage("search", source="play_store", term=term):
+            results = search(term, n_hits=self.n_hits, lang=self.lang, country=self.country)
+        return [
+            GameInfo(packageId=result["appId"], name=result["title"])
+            for result in results
+            if result.get("appId") and result.get("title")
+        ]
+
+    def discover(self, terms: Iterable[str]) -> tuple[dict[str, GameInfo], dict[str, str]]:
+        """Searches every term and deduplicates the hits by package ID.
+
+        Args:
+            terms (Iterable[str]): Search terms; repeated terms are searched once.
+
+        Returns:
+            tuple[dict[str, GameInfo], dict[str, str]]: The hits by package ID in the order of
+                the terms, and the error of every term which failed.
+        """
+        terms = list(dict.fromkeys(terms))
+        limiter = HostRateLimiter(rate=self.rate_limit)
+        hits: dict[str, GameInfo] = {}
+        failed: dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = [executor.submit(self._search, term, limiter) for term in terms]
+            for term, future in zip(terms, futures, strict=True):
+                try:
+                    games = future.result()
+                except Exception as e:
+                    logfire.exception("Failed to search play store", term=term)
+                    failed[term] = f"{type(e).__name__}: {e}"
+                    continue
+                for game in games:
+                    hits.setdefault(game.game_id, game)
+        return hits, failed
+
+    def merge(self, hits: Iterable[GameInfo]) -> int:
+        """Appends the games missing from the game list, with new stable IDs.
+
+        Entries already in the list are written back exactly as they were read. The new list
+        goes to a temporary file next to the list which then replaces it, so readers such as
+        `GameCatalog` never see a partial file.
+
+        Returns:
+            int: The number of games added.
+        """
+        path = Path(self.path)
+        entries: list[dict] = orjson.loads(path.read_bytes()) if path.exists() else []
+        known = {entry["packageId"] for entry in entries}
+        next_id = max((entry["id"] for entry in entries if entry.get("id") is not None), default=0)
+        added = []
+        for game in hits:
+            if game.game_id in known:
+                continue
+            known.add(game.game_id)
+            next_id += 1
+            added.append({"packageId": game.game_id, "name": game.game_name, "id": next_id})
+        if not added:
+            return 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Temporary files are created 0600, so the list keeps its own mode.
+        mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False, suffix=".tmp") as file:
+            file.write(orjson.dumps([*entries, *added]) + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(file.name, mode)
+        os.replace(file.name, path)
+        return len(added)
+
+    def run(self, terms: Iterable[str]) -> DiscoveryReport:
+        """Searches every term and merges the hits into the game list."""
+        start = time.perf_counter()
+        terms = list(dict.fromkeys(terms))
+        with telemetry.stage("discovery", source="play_store"):
+            hits, failed = self.discover(terms)
+            added = self.merge(hits.values())
+        report = DiscoveryReport(
+            path=self.path,
+            queries=len(terms),
+            failed=failed,
+            hits=len(hits),
+            added=added,
+            known=len(hits) - added,
+            elapsed=time.perf_counter() - start,
+        )
+        logfire.info("Discovered games", **report.model_dump(exclude={"failed"}))
+        return report
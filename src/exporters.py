@@ -0,0 +1,283 @@
+from abc import ABC, abstractmethod
+import csv
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Literal, ClassVar
+from pathlib import Path
+from operator import attrgetter
+from collections.abc import Iterable
+
+import orjson
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from io import TextIOWrapper, BufferedWriter
+
+    from openpyxl import Workbook
+    from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+openpyxl = lazy_import("openpyxl")
+openpyxl_cell = lazy_import("openpyxl.cell.cell")
+
+ExportFormat = Literal["jsonl", "csv", "xlsx"]
+Row = tuple[Any, ...]
+
+# Rows of one worksheet, including the header; further rows continue on a new sheet.
+XLSX_MAX_ROWS = 1_048_576
+
+
+class RecordExporter(BaseModel, ABC):
+    """Writes records to a file one chunk at a time, so memory stays bounded by `chunk_size`.
+
+    Records are pydantic models, such as `GamePriceInfo` or `CurrencyRate`, or dicts; only
+    `columns` are written, read as attributes without a `model_dump()` per record. Exporters
+    are context managers and accept records one by one or from any iterator, such as
+    `GameFetchEngine.iter_fetch`, so results are written while they are still being fetched.
+
+    Example:
+        >>> with JsonlExporter(path="./data/output/game_price.jsonl", columns=PRICE_COLUMNS) as e:
+        ...     e.write_many(engine.iter_fetch(games=games, countries=countries))
+        200000
+    """
+
+    format: ClassVar[ExportFormat]
+
+    path: str = Field(..., title="Path", description="File to write, replaced if it exists")
+    columns: list[str] = Field(..., title="Columns", description="Fields written, in order")
+    chunk_size: int = Field(
+        default=10_000,
+        title="Chunk Size",
+        description="Rows buffered before they are written to the file",
+        ge=1,
+    )
+
+    _chunk: list[Row] = PrivateAttr(default_factory=list)
+    _rows: int = PrivateAttr(default=0)
+    _opened: bool = PrivateAttr(default=False)
+
+    def _row(self, record: BaseModel | dict) -> Row:
+        if isinstance(record, dict):
+            return tuple(record.get(column) for column in self.columns)
+        if len(self.columns) == 1:
+            return (getattr(record, self.columns[0]),)
+        return attrgetter(*self.columns)(record)
+
+    @abstractmethod
+    def _open(self, path: Path) -> None:
+        """Opens `path` for writing and writes the header, if the format has one."""
+
+    @abstractmethod
+    def _write_chunk(self, rows: list[Row]) -> None:
+        """Writes one chunk of rows to the open file."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Finishes and closes the file."""
+
+    def open(self) -> None:
+        """Creates the file and its parent directories; `write` opens it on first use."""
+        if not self._opened:
+            path = Path(self.path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._open(path)
+            self._opened = True
+
+    def flush(self) -> None:
+        """Writes the buffered rows to the file."""
+        self.open()
+        if self._chunk:
+            self._write_chunk(self._chunk)
+            self._chunk = []
+
+    def write(self, record: BaseModel | dict | None) -> None:
+        """Buffers one record, writing the chunk once it is full; None is skipped."""
+        if record is None:
+            return
+        self._chunk.append(self._row(record))
+        self._rows += 1
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[BaseModel | dict | None]) -> int:
+        """Writes every record of an iterable as it is produced.
+
+        Returns:
+            int: The number of rows written so far.
+        """
+        for record in records:
+            self.write(record)
+        return self._rows
+
+    def close(self) -> None:
+        """Writes the remaining rows and closes the file; an empty export still has a header."""
+        self.flush()
+        self._close()
+        self._opened = False
+
+    @property
+    def rows(self) -> int:
+        """Returns the number of rows written so far, without the header."""
+        return self._rows
+
+    def __enter__(self) -> "RecordExporter":
+        """Opens the file."""
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Writes the remaining rows and closes the file, also when the export failed."""
+        self.close()
+
+
+class JsonlExporter(RecordExporter):
+    """Writes one JSON object per line with orjson, keys in `columns` order."""
+
+    format: ClassVar[ExportFormat] = "jsonl"
+
+    _file: "BufferedWriter | None" = PrivateAttr(default=None)
+
+    def _open(self, path: Path) -> None:
+        self._file = path.open("wb")
+
+    def _write_chunk(self, rows: list[Row]) -> None:
+        columns = self.columns
+        self._file.write(
+            b"".join(
+                orjson.dumps(
+                    dict(zip(columns, row, strict=True)), option=orjson.OPT_APPEND_NEWLINE
+                )
+                for row in rows
+            )
+        )
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class CsvExporter(RecordExporter):
+    """Writes a UTF-8 CSV with a header row; missing values are empty fields.
+
+    The file starts with a byte order mark, so Excel opens the CJK game names correctly.
+    """
+
+    format: ClassVar[ExportFormat] = "csv"
+
+    _file: "TextIOWrapper | None" = PrivateAttr(default=None)
+    _writer: Any = PrivateAttr(default=None)
+
+    def _open(self, path: Path) -> None:
+        self._file = path.open("w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_chunk(self, rows: list[Row]) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class XlsxExporter(RecordExporter):
+    """Writes an Excel workbook with openpyxl in write-only mode, which streams rows to disk.
+
+    Rows beyond the 1,048,576 rows of a worksheet continue on `<sheet>_2`, `<sheet>_3` and so
+    on, each with its own header. Strings starting with `=` are written as text rather than
+    formulas, and characters Excel rejects are dropped.
+    """
+
+    format: ClassVar[ExportFormat] = "xlsx"
+
+    sheet: str = Field(default="Sheet", title="Sheet", description="Name of the first worksheet")
+
+    _path: Path | None = PrivateAttr(default=None)
+    _workbook: "Workbook | None" = PrivateAttr(default=None)
+    _worksheet: "WriteOnlyWorksheet | None" = PrivateAttr(default=None)
+    _sheets: int = PrivateAttr(default=0)
+    _sheet_rows: int = PrivateAttr(default=0)
+
+    def _add_sheet(self) -> None:
+        self._sheets += 1
+        title = self.sheet if self._sheets == 1 else f"{self.sheet}_{self._sheets}"
+        self._worksheet = self._workbook.create_sheet(title=title)
+        self._worksheet.append(self.columns)
+        self._sheet_rows = 1
+
+    def _open(self, path: Path) -> None:
+        self._path = path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheets = 0
+        self._add_sheet()
+
+    def _cell(self, value: object) -> object:
+        if not isinstance(value, str):
+            return value
+        value = openpyxl_cell.ILLEGAL_CHARACTERS_RE.sub("", value)
+        if not value.startswith("="):
+            return value
+        cell = openpyxl_cell.WriteOnlyCell(self._worksheet, value=value)
+        cell.data_type = "s"
+        return cell
+
+    def _write_chunk(self, rows: list[Row]) -> None:
+        for row in rows:
+            if self._sheet_rows >= XLSX_MAX_ROWS:
+                self._add_sheet()
+            self._worksheet.append([self._cell(value) for value in row])
+            self._sheet_rows += 1
+
+    def _close(self) -> None:
+        self._workbook.save(self._path)
+        self._workbook.close()
+
+
+EXPORTERS: dict[ExportFormat, type[RecordExporter]] = {
+    exporter.format: exporter for exporter in (JsonlExporter, CsvExporter, XlsxExporter)
+}
+
+
+def open_exporter(
+    path: str | Path,
+    columns: list[str],
+    format: ExportFormat | None = None,  # noqa: A002
+    **kwargs: object,
+) -> RecordExporter:
+    """Builds the exporter of `format`, by default the one matching the suffix of `path`.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    export_format = format or Path(path).suffix.lstrip(".").lower()
+    if export_format not in EXPORTERS:
+        raise ValueError(
+            f"Unsupported export format: {export_format}, expected one of {list(EXPORTERS)}"
+        )
+    return EXPORTERS[export_format](path=str(path), columns=columns, **kwargs)
+
+
+def export(
+    records: Iterable[BaseModel | dict | None],
+    path: str | Path,
+    columns: list[str],
+    format: ExportFormat | None = None,  # noqa: A002
+    **kwargs: object,
+) -> int:
+    """Streams records into a JSONL, CSV or XLSX file, see `RecordExporter`.
+
+    Example:
+        >>> updater = GameInfoUpdater(country="us")
+        >>> export(updater.iter_game_info(), "./data/output/game_price.csv", PRICE_COLUMNS)
+        42
+
+    Returns:
+        int: The number of rows written.
+    """
+    with open_exporter(path, columns=columns, format=format, **kwargs) as exporter:
+        return exporter.write_many(records)
@@ -0,0 +1,232 @@
+import time
+import itertools
+import threading
+from urllib.parse import urlsplit
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from pydantic import Field, BaseModel
+
+from src.lazy import lazy_import
+from src.cache import ResultCache
+from src.traffic import is_retryable
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.price_range import PriceRangeParser
+from src.typings.game import GameInfo, GameSnapshot, GamePriceInfo
+
+logfire = lazy_import("logfire")
+gps_app = lazy_import("google_play_scraper.features.app")
+
+
+class HostRateLimiter:
+    """A thread-safe limiter which spaces out requests to a single host.
+
+    Args:
+        rate (float): Maximum requests per second, `0` disables the limiter.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class GameFetchEngine(BaseModel):
+    max_in_flight: int = Field(
+        default=8,
+        title="Max In-Flight Requests",
+        description="Maximum number of detail pages being fetched at the same time",
+        ge=1,
+    )
+    rate_limit: float | None = Field(
+        default=None,
+        title="Rate Limit",
+        description="Maximum requests per second to play store, 0 means unlimited and None "
+        "leaves the rate to the traffic controller of the client",
+        ge=0,
+    )
+    lang: str = Field(default="zh-TW", title="Language", description="Play store language")
+    detail_url: str = Field(
+        default="https://play.google.com/store/apps/details?id={app_id}&hl={lang}&gl={country}",
+        title="Detail URL",
+        description="URL template of the play store detail page",
+    )
+    client: HttpClient = Field(
+        default_factory=HttpClient,
+        title="HTTP Client",
+        description="Pooled HTTP client shared by every detail page request",
+    )
+    cache: ResultCache | None = Field(
+        default=None,
+        title="Cache",
+        description="Cache of fetched price ranges, None always fetches from play store",
+    )
+
+    def model_post_init(self, context: object, /) -> None:
+        """Caps the play store rate of the client's traffic controller at `rate_limit`."""
+        if self.rate_limit is not None:
+            self.client.traffic.limit(urlsplit(self.detail_url).netloc, self.rate_limit)
+
+    def _detail_url(self, game: GameInfo, country: str) -> str:
+        return self.detail_url.format(app_id=game.game_id, lang=self.lang, country=country)
+
+    def _fetch_snapshot(self, game: GameInfo, country: str) -> GameSnapshot:
+        url = self._detail_url(game=game, country=country)
+        with telemetry.stage("request", source="play_store"):
+            response = self.client.get(url)
+            response.raise_for_status()
+        with telemetry.stage("parse", source="play_store"):
+            detail = gps_app.parse_dom(dom=response.text, app_id=game.game_id, url=url)
+        return GameSnapshot(
+            game_id=game.game_id,
+            country=country,
+            price=detail.get("inAppProductPrice"),
+            updated=detail.get("updated"),
+            version=detail.get("version"),
+        )
+
+    def fetch_snapshot(self, game: GameInfo, country: str) -> GameSnapshot | None:
+        """Fetches the raw price string, update time and version of a game, bypassing the cache.
+
+        Args:
+            game (GameInfo): The game to fetch.
+            country (str): The play store country code, e.g. `us`.
+
+        Returns:
+            GameSnapshot | None: The snapshot, None when the page cannot be fetched or parsed.
+        """
+        try:
+            with telemetry.stage(
+                "game_snapshot", source="play_store", game_id=game.game_id, country=country
+            ):
+                return self._fetch_snapshot(game=game, country=country)
+        except Exception:
+            logfire.exception(
+                "Failed to fetch game snapshot",
+                game_id=game.game_id,
+                country=country,
+                url=self._detail_url(game=game, country=country),
+            )
+            return None
+
+    def _fetch_price(self, game: GameInfo, country: str) -> GamePriceInfo:
+        try:
+            with telemetry.stage(
+                "game_price", source="play_store", game_id=game.game_id, country=country
+            ):
+                snapshot = self._fetch_snapshot(game=game, country=country)
+                with telemetry.stage("price_parse", source="play_store"):
+                    lowest, highest = PriceRangeParser.shared(self.lang).parse(snapshot.price)
+                with telemetry.stage("model_build", source="play_store"):
+                    return GamePriceInfo(
+                        name=game.game_name, country=country, lowest=lowest, highest=highest
+                    )
+        except Exception as e:
+            logfire.exception(
+                "Failed to fetch game price",
+                game_id=game.game_id,
+                country=country,
+                url=self._detail_url(game=game, country=country),
+            )
+            return GamePriceInfo(
+                name=game.game_name,
+                country=country,
+                error=f"{type(e).__name__}: {e}",
+                retryable=is_retryable(e),
+            )
+
+    def fetch_one(self, game: GameInfo, country: str) -> GamePriceInfo:
+        """Fetches the in-app price range of a single game in a single country.
+
+        Args:
+            game (GameInfo): The game to fetch.
+            country (str): The play store country code, e.g. `us`.
+
+        Returns:
+            GamePriceInfo: The price range. When it cannot be fetched or parsed, both ends are
+                None, `error` tells why and `retryable` whether trying again later can help;
+                failures are not cached.
+        """
+        if self.cache is None:
+            return self._fetch_price(game=game, country=country)
+        failures: list[GamePriceInfo] = []
+
+        def fetch() -> dict[str, str | float | None] | None:
+            fetched_info = self._fetch_price(game=game, country=country)
+            if fetched_info.error is not None:
+                failures.append(fetched_info)
+                return None
+            return fetched_info.model_dump()
+
+        cached = self.cache.get_or_fetch("game_price", f"{game.game_id}:{country}", fetch=fetch)
+        if cached is None:
+            # Callers which waited on the failed fetch of another caller have no error record
+            # of their own, so they try once themselves.
+            return failures[0] if failures else self._fetch_price(game=game, country=country)
+        return GamePriceInfo(**cached)
+
+    def _fetch_pair(self, game: GameInfo, country: str) -> tuple[GameInfo, str, GamePriceInfo]:
+        return game, country, self.fetch_one(game=game, country=country)
+
+    def iter_fetch_pairs(
+        self, pairs: Iterable[tuple[GameInfo, str]]
+    ) -> Iterator[tuple[GameInfo, str, GamePriceInfo]]:
+        """Fetches every `(game, country)` pair and yields the results as they finish.
+
+        Only `max_in_flight` requests are submitted at a time, so `pairs` is consumed lazily.
+
+        Args:
+            pairs (Iterable[tuple[GameInfo, str]]): The games and play store country codes.
+
+        Yields:
+            tuple[GameInfo, str, GamePriceInfo]: The game, the country and its price range, in
+                completion order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            pending: set[Future[tuple[GameInfo, str, GamePriceInfo]]] = set()
+            for game, country in pairs:
+                if len(pending) >= self.max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(self._fetch_pair, game, country))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def iter_fetch(
+        self, games: Iterable[GameInfo], countries: Iterable[str]
+    ) -> Iterator[GamePriceInfo]:
+        """Fetches every game in every country and yields the results as they finish.
+
+        Only `max_in_flight` requests are submitted at a time, so the matrix is never
+        fully materialized in memory.
+
+        Args:
+            games (Iterable[GameInfo]): The games to fetch.
+            countries (Iterable[str]): The play store country codes.
+
+        Yields:
+            GamePriceInfo: The price range of one game in one country, in completion order.
+        """
+        matrix = itertools.product(games, list(countries))
+        for _, _, game_price in self.iter_fetch_pairs(matrix):
+            yield game_price
+
+    def fetch_matrix(
+        self, games: Iterable[GameInfo], countries: Iterable[str]
+    ) -> list[GamePriceInfo]:
+        return list(self.iter_fetch(games=games, countries=countries))
@@ -0,0 +1,220 @@
+import uuid
+from pathlib import Path
+import datetime
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+from pydantic import Field, BaseModel
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.typings.game import GamePriceInfo
+from src.typings.batch import RateBatch, PriceBatch
+from src.typings.currency_rate import CurrencyRate
+
+PRICE_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("country", pa.string()),
+    ("lowest", pa.float64()),
+    ("highest", pa.float64()),
+    ("fetched_at", pa.timestamp("s", tz="UTC")),
+    ("date", pa.date32()),
+])
+RATE_SCHEMA = pa.schema([
+    ("currency", pa.string()),
+    ("currency_cn", pa.string()),
+    ("jcb", pa.float64()),
+    ("master", pa.float64()),
+    ("visa", pa.float64()),
+    ("updated_time", pa.date32()),
+    ("fetched_at", pa.timestamp("s", tz="UTC")),
+    ("date", pa.date32()),
+])
+
+
+class HistoryStore(BaseModel):
+    """An append-only Parquet history of game prices and currency rates.
+
+    Each snapshot is written as new files into a hive partitioned dataset, partitioned by
+    snapshot date and by country (prices) or currency (rates), so existing files are never
+    rewritten. Readers push date and country filters down to the partition directories and
+    Parquet row groups instead of loading the whole history.
+
+    Example:
+        >>> store = HistoryStore(root="./data/history")
+        >>> store.append_prices(game_price_list)
+        >>> store.append_rates(currency_rate_list)
+        >>> store.read_prices(start=datetime.date(2024, 9, 1), countries=["us", "jp"])
+    """
+
+    root: str = Field(
+        default="./data/history",
+        title="Root",
+        description="Directory holding the `game_price` and `currency_rate` datasets",
+    )
+
+    @property
+    def price_path(self) -> Path:
+        return Path(self.root) / "game_price"
+
+    @property
+    def rate_path(self) -> Path:
+        return Path(self.root) / "currency_rate"
+
+    @staticmethod
+    def _write(table: pa.Table, path: Path, partition_keys: list[str]) -> None:
+        if table.num_rows == 0:
+            return
+        partitioning = ds.partitioning(
+            pa.schema([table.schema.field(key) for key in partition_keys]), flavor="hive"
+        )
+        ds.write_dataset(
+            table,
+            base_dir=path,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    @staticmethod
+    def _snapshot(
+        table: pa.Table, schema: pa.Schema, snapshot_date: datetime.date | None
+    ) -> pa.Table:
+        """Adds the `fetched_at` and `date` columns and casts the table to `schema`."""
+        fetched_at = datetime.datetime.now(tz=datetime.timezone.utc).replace(microsecond=0)
+        rows = table.num_rows
+        table = table.append_column(
+            "fetched_at", pa.array([fetched_at] * rows, type=pa.timestamp("s", tz="UTC"))
+        )
+        table = table.append_column(
+            "date", pa.array([snapshot_date or fetched_at.date()] * rows, type=pa.date32())
+        )
+        return table.select(schema.names).cast(schema)
+
+    def append_prices(
+        self,
+        prices: Iterable[GamePriceInfo] | PriceBatch,
+        snapshot_date: datetime.date | None = None,
+    ) -> int:
+        """Appends a snapshot of price ranges.
+
+        Args:
+            prices (Iterable[GamePriceInfo] | PriceBatch): The price ranges to store.
+            snapshot_date (datetime.date | None): Date partition of the snapshot, defaults to
+                today in UTC.
+
+        Returns:
+            int: The number of rows written.
+        """
+        if not isinstance(prices, PriceBatch):
+            prices = PriceBatch.from_models(prices)
+        table = prices.to_arrow()
+        table = table.set_column(
+            table.schema.get_field_index("country"), "country", pc.utf8_lower(table["country"])
+        )
+        table = self._snapshot(table, PRICE_SCHEMA, snapshot_date)
+        self._write(table, self.price_path, partition_keys=["date", "country"])
+        return table.num_rows
+
+    def append_rates(
+        self, rates: Iterable[CurrencyRate] | RateBatch, snapshot_date: datetime.date | None = None
+    ) -> int:
+        """Appends a snapshot of currency rates with the card rates stored as floats.
+
+        Args:
+            rates (Iterable[CurrencyRate] | RateBatch): The currency rates to store.
+            snapshot_date (datetime.date | None): Date partition of the snapshot, defaults to
+                today in UTC.
+
+        Returns:
+            int: The number of rows written.
+        """
+        if not isinstance(rates, RateBatch):
+            rates = RateBatch.from_models(rates)
+        table = rates.to_arrow().rename_columns({"currency_en": "currency"})
+        table = self._snapshot(table, RATE_SCHEMA, snapshot_date)
+        self._write(table, self.rate_path, partition_keys=["date", "currency"])
+        return table.num_rows
+
+    @staticmethod
+    def _filter(
+        start: datetime.date | None, end: datetime.date | None, key: str, values: list[str] | None
+    ) -> ds.Expression | None:
+        expressions = []
+        if start is not None:
+            expressions.append(ds.field("date") >= pa.scalar(start, type=pa.date32()))
+        if end is not None:
+            expressions.append(ds.field("date") <= pa.scalar(end, type=pa.date32()))
+        if values is not None:
+            expressions.append(ds.field(key).isin([value.lower() for value in values]))
+        if not expressions:
+            return None
+        expression = expressions[0]
+        for other in expressions[1:]:
+            expression &= other
+        return expression
+
+    @staticmethod
+    def _dataset(path: Path, schema: pa.Schema, partition_keys: list[str]) -> ds.Dataset | None:
+        if not path.exists():
+            return None
+        partitioning = ds.partitioning(
+            pa.schema([schema.field(key) for key in partition_keys]), flavor="hive"
+        )
+        return ds.dataset(path, schema=schema, format="parquet", partitioning=partitioning)
+
+    def scan_prices(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        countries: list[str] | None = None,
+        columns: list[str] | None = None,
+        batch_size: int = 65536,
+    ) -> Iterator[pa.RecordBatch]:
+        """Streams price history as record batches, reading only the matching partitions.
+
+        Args:
+            start (datetime.date | None): First snapshot date to include.
+            end (datetime.date | None): Last snapshot date to include.
+            countries (list[str] | None): Countries to include, None includes every country.
+            columns (list[str] | None): Columns to read, None reads every column.
+            batch_size (int): Maximum number of rows per batch.
+
+        Yields:
+            pa.RecordBatch: The matching rows.
+        """
+        dataset = self._dataset(self.price_path, PRICE_SCHEMA, ["date", "country"])
+        if dataset is None:
+            return
+        expression = self._filter(start, end, key="country", values=countries)
+        yield from dataset.to_batches(columns=columns, filter=expression, batch_size=batch_size)
+
+    def read_prices(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        countries: list[str] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Reads price history in a date range into a DataFrame, see `scan_prices`."""
+        dataset = self._dataset(self.price_path, PRICE_SCHEMA, ["date", "country"])
+        if dataset is None:
+            return PRICE_SCHEMA.empty_table().to_pandas()
+        expression = self._filter(start, end, key="country", values=countries)
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    def read_rates(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        currencies: list[str] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Reads currency rate history in a date range into a DataFrame."""
+        dataset = self._dataset(self.rate_path, RATE_SCHEMA, ["date", "currency"])
+        if dataset is None:
+            return RATE_SCHEMA.empty_table().to_pandas()
+        expression = self._filter(start, end, key="currency", values=currencies)
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
@@ -0,0 +1,178 @@
+import re
+import html
+from typing import Literal, ClassVar
+
+from pydantic import Field, BaseModel
+
+from src.lazy import lazy_import
+from src.telemetry import telemetry
+from src.typings.currency_rate import CurrencyInfo, CurrencyRate, CountryCurrency
+
+bs4 = lazy_import("bs4")
+logfire = lazy_import("logfire")
+
+# `itm` has to be a whole class name, as in `class_="itm"` of BeautifulSoup, not `itm-foo`.
+_CURRENCY_ITEM = re.compile(r'<li[^>]*\bclass="(?:[^"]*\s)?itm(?:\s[^"]*)?"[^>]*>(.*?)</li>', re.S)
+_HREF = re.compile(r'<a[^>]*\bhref="([^"]*)"', re.S)
+_CURRENCY_NAME = re.compile(r'<a[^>]*\bonclick="change_ccy\(\)"[^>]*>(.*?)</a>', re.S)
+_ROW = re.compile(r"<tr[^>]*>(.*?)</tr>", re.S)
+_CELL = re.compile(r"<td[^>]*>(.*?)</td>", re.S)
+_TAG = re.compile(r"<[^>]+>")
+
+
+class TwratesParser(BaseModel):
+    """Extracts currency lists and card rates from twrates pages.
+
+    The `fast` mode runs a handful of precompiled regular expressions over the page and never
+    builds a DOM. Whenever it cannot find what it expects, the page is parsed again with the
+    BeautifulSoup path, which is also available on its own as the `bs4` mode.
+
+    Example:
+        >>> parser = TwratesParser(mode="fast")
+        >>> rate = parser.parse_currency_rate(html_text, currency_name="usd")
+        >>> rate.model_dump(by_alias=True)
+        {'currency_en': 'usd', 'currency_cn': '美金', 'JCB': '32.137', '萬事達': '32.189', 'VISA': '32.169', 'updated_time': '2024-09-12'}
+    """
+
+    # Bump whenever the extracted results change, so results stored from unchanged pages are
+    # parsed again instead of being revalidated.
+    version: ClassVar[str] = "2"
+
+    mode: Literal["fast", "bs4"] = Field(
+        default="fast",
+        title="Mode",
+        description="`fast` for regex extraction with a BeautifulSoup fallback, `bs4` for BeautifulSoup only",
+    )
+
+    @staticmethod
+    def _text(fragment: str) -> str:
+        return html.unescape(_TAG.sub("", fragment))
+
+    @staticmethod
+    def parse_exchange_rate_info(exchange_rate_info: str) -> CurrencyInfo:
+        if "(" in exchange_rate_info:
+            exchange_rate, date_info = exchange_rate_info.split("(")
+            date_info = date_info.rstrip(")").strip()
+        else:
+            exchange_rate, date_info = exchange_rate_info, ""
+        exchange_rate = exchange_rate.replace("\xa0", "").strip()
+        return CurrencyInfo(exchange_rate=exchange_rate, date_info=date_info)
+
+    @staticmethod
+    def _build_currency_rate(
+        currency_name: str, currency_name_cn: str, cells: list[tuple[str, str]]
+    ) -> CurrencyRate:
+        result = {"currency_en": currency_name, "currency_cn": currency_name_cn}
+        for card_type, exchange_rate_info in cells:
+            currency_info = TwratesParser.parse_exchange_rate_info(exchange_rate_info)
+            result[card_type] = currency_info.exchange_rate
+        result["updated_time"] = currency_info.date_info
+        with telemetry.stage("model_build", source="twrates"):
+            return CurrencyRate(**result)
+
+    @staticmethod
+    def _clean_currency_name(text: str) -> str:
+        return text.split(" - ")[1].split("&nbsp;&nbsp;")[0].replace("\xa0", "").strip()
+
+    def _fast_currency_list(self, page: str, base_url: str) -> list[CountryCurrency]:
+        currency_list = []
+        for item in _CURRENCY_ITEM.findall(page):
+            href = _HREF.search(item)
+            currency_name = self._text(item).strip()
+            currency_list.append(
+                CountryCurrency(
+                    currency_name=currency_name.split(" - ")[0].lower(),
+                    currency_name_cn=currency_name.split(" - ")[-1],
+                    currency_url=f"{base_url}{html.unescape(href.group(1))}",
+                )
+            )
+        if not currency_list:
+            raise ValueError("No currency found in page")
+        return currency_list
+
+    def _bs4_currency_list(self, page: str, base_url: str) -> list[CountryCurrency]:
+        soup = bs4.BeautifulSoup(page, "html.parser")
+        currency_result: list[bs4.element.Tag] = soup.find_all("li", class_="itm")
+        currency_list = []
+        for currency in currency_result:
+            if not isinstance(currency.text, str):
+                continue
+            currency_name = currency.text.strip()
+            currency_name_en = currency_name.split(" - ")[0].lower()
+            currency_name_cn = currency_name.split(" - ")[-1]
+            _currency_link = currency.find("a")["href"]
+            currency_link = f"{base_url}{_currency_link}"
+            country_currency = CountryCurrency(
+                currency_name=currency_name_en,
+                currency_name_cn=currency_name_cn,
+                currency_url=currency_link,
+            )
+            currency_list.append(country_currency)
+        return currency_list
+
+    def _fast_currency_rate(self, page: str, currency_name: str) -> CurrencyRate:
+        currency_content = _CURRENCY_NAME.search(page)
+        if currency_content is None:
+            raise ValueError("No currency name found in page")
+        cells = []
+        for row in _ROW.findall(page):
+            cols = _CELL.findall(row)
+            if len(cols) > 1:
+                cells.append((self._text(cols[0]).strip(), self._text(cols[1]).strip()))
+        if not cells:
+            raise ValueError("No currency rate found in page")
+        currency_name_cn = self._clean_currency_name(self._text(currency_content.group(1)))
+        return self._build_currency_rate(currency_name, currency_name_cn, cells)
+
+    def _bs4_currency_rate(self, page: str, currency_name: str) -> CurrencyRate:
+        soup = bs4.BeautifulSoup(page, "html.parser")
+        rows: list[bs4.element.Tag] = soup.find_all("tr")
+        currency_content = soup.find("a", onclick="change_ccy()")
+        currency_name_cn = "未找到幣值名稱"
+        if not isinstance(currency_content.text, str):
+            raise logfire.exception("Failed to get currency name")
+        if currency_content:
+            currency_name_cn = self._clean_currency_name(currency_content.text)
+        cells = []
+        for row in rows:
+            cols: list[bs4.element.Tag] = row.find_all("td")
+            if len(cols) > 1:
+                cells.append((cols[0].text.strip(), cols[1].text.strip()))
+        return self._build_currency_rate(currency_name, currency_name_cn, cells)
+
+    def parse_currency_list(self, page: str, base_url: str) -> list[CountryCurrency]:
+        """Parses every currency listed in the currency dropdown of a twrates page.
+
+        Args:
+            page (str): The HTML of any twrates card rate page.
+            base_url (str): Base URL prepended to the relative currency links.
+
+        Returns:
+            list[CountryCurrency]: The available currencies and their page URLs.
+        """
+        if self.mode == "fast":
+            try:
+                return self._fast_currency_list(page, base_url)
+            except Exception:
+                logfire.warn("Fast currency list parsing failed, falling back to bs4")
+        return self._bs4_currency_list(page, base_url)
+
+    def parse_currency_rate(self, page: str, currency_name: str) -> CurrencyRate:
+        """Parses the card rates of a twrates currency page.
+
+        Args:
+            page (str): The HTML of the card rate page of `currency_name`.
+            currency_name (str): Currency name of the page, e.g. `usd`.
+
+        Returns:
+            CurrencyRate: The card rates of the currency.
+        """
+        if self.mode == "fast":
+            try:
+                return self._fast_currency_rate(page, currency_name)
+            except Exception:
+                logfire.warn(
+                    "Fast currency rate parsing failed, falling back to bs4",
+                    currency_name=currency_name,
+                )
+        return self._bs4_currency_rate(page, currency_name)
@@ -0,0 +1,194 @@
+from typing import TYPE_CHECKING
+import functools
+import threading
+from urllib.parse import urlsplit
+
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+from src.traffic import TrafficController
+from src.telemetry import telemetry
+from src.typings.transport import TransportStats
+
+if TYPE_CHECKING:
+    from requests import Session, Response
+    from requests.adapters import HTTPAdapter
+
+requests = lazy_import("requests")
+
+
+@functools.cache
+def _tracking_adapter() -> type["HTTPAdapter"]:
+    """Builds the adapter class on first use, so `requests` is only imported when needed."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool
+
+    class _TrackingAdapter(HTTPAdapter):
+        """An adapter which remembers every connection pool it hands out, for statistics."""
+
+        def __init__(self, *args: object, **kwargs: object):
+            self.connection_pools: set[HTTPConnectionPool] = set()
+            super().__init__(*args, **kwargs)
+
+        def get_connection_with_tls_context(
+            self, *args: object, **kwargs: object
+        ) -> HTTPConnectionPool:
+            pool = super().get_connection_with_tls_context(*args, **kwargs)
+            self.connection_pools.add(pool)
+            return pool
+
+    return _TrackingAdapter
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Parses a `Retry-After` header given in seconds; HTTP dates are ignored."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class HttpClient(BaseModel):
+    """A pooled keep-alive HTTP client shared by the scrapers.
+
+    Every request goes through one `requests.Session`, so connections to the same host are
+    reused instead of paying a new TCP and TLS handshake per page, and through one
+    `TrafficController`, which paces every host and fails fast while a host is unhealthy.
+
+    Example:
+        >>> client = HttpClient(timeout=5.0, max_retries=3)
+        >>> response = client.get("https://www.twrates.com/card/mastercard/usd.html")
+        >>> print(client.stats.model_dump())
+        {'requests': 1, 'connections_opened': 1, 'retries': 0, 'bytes_received': 51234, 'connections_reused': 0}
+    """
+
+    timeout: float = Field(
+        default=10.0, title="Timeout", description="Connect and read timeout in seconds", gt=0
+    )
+    max_retries: int = Field(
+        default=3, title="Max Retries", description="Maximum retries on 429 and 5xx", ge=0
+    )
+    backoff_factor: float = Field(
+        default=0.5,
+        title="Backoff Factor",
+        description="Exponential backoff factor between retries in seconds",
+        ge=0,
+    )
+    pool_maxsize: int = Field(
+        default=16,
+        title="Pool Max Size",
+        description="Maximum number of keep-alive connections per host",
+        ge=1,
+    )
+    traffic: TrafficController = Field(
+        default_factory=TrafficController,
+        title="Traffic Controller",
+        description="Adaptive per-host rate limits and circuit breakers of every request",
+    )
+
+    _session: "Session | None" = PrivateAttr(default=None)
+    _stats: TransportStats = PrivateAttr(default_factory=TransportStats)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def session(self) -> "Session":
+        with self._lock:
+            if self._session is None:
+                from urllib3.util import Retry
+
+                retry = Retry(
+                    total=self.max_retries,
+                    backoff_factor=self.backoff_factor,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=["GET", "HEAD"],
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = _tracking_adapter()(
+                    pool_connections=self.pool_maxsize,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.headers.update({"Accept-Encoding": "gzip, deflate"})
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def get(self, url: str, **kwargs: object) -> "Response":
+        """Sends a GET request through the shared session.
+
+        Args:
+            url (str): The URL to fetch.
+            **kwargs (object): Extra keyword arguments passed to `requests.Session.get`.
+
+        Returns:
+            requests.Response: The response, already fully read.
+
+        Raises:
+            CircuitOpenError: If the host failed too often lately, without sending anything.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        self.traffic.acquire(host)
+        try:
+            response = self.session.get(url, **kwargs)
+        except Exception as e:
+            self.traffic.record(host, error=e)
+            raise
+        history = response.raw.retries.history if response.raw.retries else ()
+        # Attempts urllib3 retried were the host pushing back, but not failures of the request.
+        for _ in history:
+            self.traffic.throttle(host)
+        self.traffic.record(
+            host,
+            status_code=response.status_code,
+            latency=response.elapsed.total_seconds(),
+            retry_after=_retry_after(response.headers.get("Retry-After")),
+        )
+        retries = len(history)
+        received = len(response.content)
+        with self._lock:
+            self._stats.retries += retries
+            self._stats.bytes_received += received
+        attributes = {"host": host, "status_code": response.status_code}
+        telemetry.histogram("igpf.http.response_time", unit="ms").record(
+            response.elapsed.total_seconds() * 1000, attributes
+        )
+        telemetry.histogram("igpf.http.bytes", unit="By").record(received, attributes)
+        if retries:
+            telemetry.counter("igpf.http.retries").add(retries, attributes)
+        return response
+
+    @staticmethod
+    def _pool_counts(session: "Session") -> tuple[int, int]:
+        requests = connections = 0
+        for adapter in set(session.adapters.values()):
+            for pool in getattr(adapter, "connection_pools", ()):
+                requests += pool.num_requests
+                connections += pool.num_connections
+        return requests, connections
+
+    @property
+    def stats(self) -> TransportStats:
+        """Returns the request, connection and retry counters of this client."""
+        with self._lock:
+            stats, session = self._stats.model_copy(), self._session
+        if session is None:
+            return stats
+        requests, connections = self._pool_counts(session)
+        stats.requests += requests
+        stats.connections_opened += connections
+        return stats
+
+    def close(self) -> None:
+        """Closes the pooled connections, keeping their counters in `stats`."""
+        with self._lock:
+            session, self._session = self._session, None
+            if session is not None:
+                requests, connections = self._pool_counts(session)
+                self._stats.requests += requests
+                self._stats.connections_opened += connections
+        if session is not None:
+            session.close()
@@ -0,0 +1,260 @@
+import os
+import time
+import hashlib
+from pathlib import Path
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+from src.price_range import PriceParseError, PriceRangeParser
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GameInfo, GameSnapshot, GamePriceInfo
+from src.typings.incremental import GameState, PriceDelta, RefreshResult, GameFingerprint
+
+logfire = lazy_import("logfire")
+
+
+class IncrementalRefresher(BaseModel):
+    """Refreshes game prices incrementally, refetching only games whose play store page changed.
+
+    Every game is probed once in `reference_country`. Its update time, version and a hash of
+    its price string form a fingerprint; when the fingerprint matches the one stored by the
+    previous run, the other countries are not fetched again. A game is swept in every country
+    when it is new, when its fingerprint changed, or when its last sweep is older than
+    `full_sweep_after`, which catches regional price changes the reference country misses.
+    Only the differences to the previous run are reported as deltas.
+
+    Example:
+        >>> refresher = IncrementalRefresher(reference_country="us")
+        >>> result = refresher.refresh(games=GameCatalog.shared().games, countries=["us", "jp"])
+        >>> result.probed, result.swept, result.requests
+        (1200, 3, 1203)
+        >>> result.deltas[0].model_dump()
+        {'kind': 'changed', 'game_id': 'com.ncsoft.lineagew', 'name': '天堂W', 'country': 'jp', 'lowest': 160.0, 'highest': 16000.0, 'previous_lowest': 160.0, 'previous_highest': 15800.0}
+    """
+
+    state_path: str = Field(
+        default="./.cache/igpf/fingerprints.json",
+        title="State Path",
+        description="JSON file holding the fingerprints and prices of the previous run",
+    )
+    reference_country: str = Field(
+        default="us",
+        title="Reference Country",
+        description="Country every game is probed in to detect changes",
+    )
+    full_sweep_after: float = Field(
+        default=604800,
+        title="Full Sweep After",
+        description="Seconds after which a game is swept in every country even if unchanged",
+        ge=0,
+    )
+    engine: GameFetchEngine = Field(
+        default_factory=GameFetchEngine,
+        title="Game Fetch Engine",
+        description="Engine used to fetch the play store pages",
+    )
+
+    _states: dict[str, GameState] | None = PrivateAttr(default=None)
+
+    @property
+    def states(self) -> dict[str, GameState]:
+        """Returns the state of every known game by package ID, loaded on first access."""
+        if self._states is None:
+            path = Path(self.state_path)
+            raw = orjson.loads(path.read_bytes()) if path.exists() else {}
+            self._states = {
+                game_id: GameState.model_validate(state) for game_id, state in raw.items()
+            }
+        return self._states
+
+    def save(self) -> None:
+        """Writes the state atomically, so an interrupted run never leaves a broken file."""
+        path = Path(self.state_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {game_id: state.model_dump() for game_id, state in self.states.items()}
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False, suffix=".tmp") as file:
+            file.write(orjson.dumps(payload))
+        os.replace(file.name, path)
+
+    @staticmethod
+    def fingerprint(snapshot: GameSnapshot) -> GameFingerprint:
+        price_hash = None
+        if snapshot.price is not None:
+            price_hash = hashlib.blake2b(snapshot.price.encode(), digest_size=8).hexdigest()
+        return GameFingerprint(
+            updated=snapshot.updated, version=snapshot.version, price_hash=price_hash
+        )
+
+    def _parse(self, snapshot: GameSnapshot) -> tuple[float, float] | None:
+        if snapshot.price is None:
+            return None
+        try:
+            return PriceRangeParser.shared(self.engine.lang).parse(snapshot.price)
+        except PriceParseError:
+            logfire.warn(
+                "Failed to parse in-app price",
+                game_id=snapshot.game_id,
+                country=snapshot.country,
+                price=snapshot.price,
+            )
+            return None
+
+    def _fetch(self, pairs: list[tuple[GameInfo, str]]) -> list[GameSnapshot | None]:
+        with ThreadPoolExecutor(max_workers=self.engine.max_in_flight) as executor:
+            return list(
+                executor.map(lambda pair: self.engine.fetch_snapshot(pair[0], pair[1]), pairs)
+            )
+
+    @staticmethod
+    def _diff(
+        game: GameInfo,
+        country: str,
+        previous: tuple[float, float] | None,
+        current: tuple[float, float] | None,
+    ) -> PriceDelta | None:
+        if previous == current:
+            return None
+        if previous is None:
+            kind = "new"
+        elif current is None:
+            kind = "removed"
+        else:
+            kind = "changed"
+        lowest, highest = current or (None, None)
+        previous_lowest, previous_highest = previous or (None, None)
+        return PriceDelta(
+            kind=kind,
+            game_id=game.game_id,
+            name=game.game_name,
+            country=country,
+            lowest=lowest,
+            highest=highest,
+            previous_lowest=previous_lowest,
+            previous_highest=previous_highest,
+        )
+
+    def _plan(
+        self, state: GameState | None, probe: GameSnapshot, countries: list[str]
+    ) -> list[str]:
+        """Returns the countries to sweep: all when the game is new, changed or stale."""
+        if state is None or time.time() - state.swept_at >= self.full_sweep_after:
+            return countries
+        if state.fingerprint != self.fingerprint(probe):
+            return countries
+        return [country for country in countries if country not in state.countries]
+
+    def _apply(
+        self,
+        game: GameInfo,
+        state: GameState,
+        snapshots: dict[str, GameSnapshot | None],
+        result: RefreshResult,
+    ) -> None:
+        """Updates the prices of one game from its swept snapshots, recording the deltas."""
+        for country, snapshot in snapshots.items():
+            if snapshot is None:
+                # Retried by the next run, even when the fingerprint is unchanged.
+                if country in state.countries:
+                    state.countries.remove(country)
+                continue
+            current = self._parse(snapshot)
+            delta = self._diff(game, country, state.prices.get(country), current)
+            if delta is not None:
+                result.deltas.append(delta)
+            if current is None:
+                state.prices.pop(country, None)
+            else:
+                state.prices[country] = current
+            if country not in state.countries:
+                state.countries.append(country)
+
+    def _prune(self, game_ids: set[str], result: RefreshResult) -> None:
+        for game_id in [game_id for game_id in self.states if game_id not in game_ids]:
+            state = self.states.pop(game_id)
+            removed = GameInfo(packageId=game_id, name=state.name or "")
+            for country, previous in state.prices.items():
+                result.deltas.append(self._diff(removed, country, previous, None))
+
+    def refresh(
+        self, games: Iterable[GameInfo], countries: Iterable[str], prune: bool = False
+    ) -> RefreshResult:
+        """Probes every game, refetches the changed ones and saves the new state.
+
+        Args:
+            games (Iterable[GameInfo]): The games to refresh.
+            countries (Iterable[str]): The play store country codes to keep prices for.
+            prune (bool): Whether known games missing from `games` were removed from the
+                catalog; their prices are then reported as removed and forgotten.
+
+        Returns:
+            RefreshResult: The deltas, the current prices and how much work the run did.
+        """
+        now = time.time()
+        games = list({game.game_id: game for game in games}.values())
+        countries = list(dict.fromkeys(country.lower() for country in countries))
+        result = RefreshResult(probed=len(games), requests=len(games))
+
+        probes = self._fetch([(game, self.reference_country) for game in games])
+        plans = []
+        for game, probe in zip(games, probes, strict=False):
+            if probe is None:
+                result.failed += 1
+                continue
+            plans.append((
+                game,
+                probe,
+                self._plan(self.states.get(game.game_id), probe, countries),
+            ))
+        pairs = [
+            (game, country)
+            for game, _, sweep in plans
+            for country in sweep
+            if country != self.reference_country
+        ]
+        fetched = self._fetch(pairs)
+        result.requests += len(pairs)
+        swept = {
+            (game.game_id, country): snapshot
+            for (game, country), snapshot in zip(pairs, fetched, strict=False)
+        }
+
+        for game, probe, sweep in plans:
+            state = self.states.setdefault(game.game_id, GameState(game_id=game.game_id))
+            state.name = game.game_name
+            state.checked_at = now
+            if sweep == countries:
+                state.swept_at = now
+                state.fingerprint = self.fingerprint(probe)
+            if sweep:
+                result.swept += 1
+            snapshots = {
+                country: probe
+                if country == self.reference_country
+                else swept[(game.game_id, country)]
+                for country in sweep
+            }
+            self._apply(game, state, snapshots, result)
+        if prune:
+            self._prune({game.game_id for game in games}, result)
+
+        for game in games:
+            prices = self.states[game.game_id].prices if game.game_id in self.states else {}
+            result.prices.extend(
+                GamePriceInfo(name=game.game_name, country=country, lowest=lowest, highest=highest)
+                for country, (lowest, highest) in prices.items()
+                if country in countries
+            )
+        self.save()
+        logfire.info(
+            "Incremental refresh",
+            probed=result.probed,
+            swept=result.swept,
+            requests=result.requests,
+            deltas=len(result.deltas),
+        )
+        return result
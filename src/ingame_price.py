@@ -1,12 +1,18 @@
-import yaml
-import logfire
-from pydantic import Field, BaseModel, computed_field
-from price_parser import Price
-import google_play_scraper as gps
+from collections.abc import Iterator
 
+from pydantic import Field, BaseModel, PrivateAttr, computed_field, field_validator
+
+from src.lazy import lazy_import
+from src.cache import ResultCache
+from src.catalog import GameCatalog
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.price_range import PriceRangeParser
+from src.fetch_engine import GameFetchEngine
 from src.typings.game import GameInfo, GamePriceInfo
+from src.country_lookup import CountryLookup
 
-logfire.configure()
+logfire = lazy_import("logfire")
 
 
 class GameInfoUpdater(BaseModel):
@@ -24,54 +30,104 @@ class GameInfoUpdater(BaseModel):
         examples=["天堂W"],
         deprecated=False,
     )
-    country: str = Field(..., title="Country")
+    country: str = Field(
+        ..., title="Country", description="Country code or name, stored as an alpha-2 code"
+    )
+    detail_url: str = Field(
+        default="https://play.google.com/store/apps/details?id={app_id}&hl={lang}&gl={country}",
+        title="Detail URL",
+        description="URL template of the play store detail page",
+    )
+    client: HttpClient = Field(
+        default_factory=HttpClient,
+        title="HTTP Client",
+        description="Pooled HTTP client shared by every detail page request",
+        exclude=True,
+    )
+    cache: ResultCache | None = Field(
+        default=None,
+        title="Cache",
+        description="Cache of fetched price ranges, None always fetches from play store",
+        exclude=True,
+    )
+    catalog: GameCatalog = Field(
+        default_factory=GameCatalog.shared,
+        title="Game Catalog",
+        description="Indexed game list used to look up games",
+        exclude=True,
+    )
+
+    _engine: GameFetchEngine = PrivateAttr()
+
+    def model_post_init(self, context: object, /) -> None:
+        # Prices are fetched, cached and logged by the engine, sharing the client and cache.
+        self._engine = GameFetchEngine(
+            detail_url=self.detail_url, client=self.client, cache=self.cache
+        )
+
+    @field_validator("country")
+    @classmethod
+    def _normalize_country(cls, country: str) -> str:
+        code = CountryLookup.shared().normalize(country)
+        if code is None:
+            raise ValueError(f"Unknown country: {country}")
+        return code
 
     @computed_field
     @property
     def game_info_list(self) -> list[GameInfo]:
-        game_info_list: list[GameInfo] = []
-        with open("./configs/gameList.json", encoding="utf-8") as f:
-            game_list = yaml.safe_load(f)
-            for game in game_list:
-                game_info = GameInfo(**game)
-                game_info_list.append(game_info)
         if self.game_name:
-            return [info for info in game_info_list if self.game_name in game_info.game_name]
+            return self.catalog.search(self.game_name)
         if self.game_id:
-            return [info for info in game_info_list if self.game_id in game_info.game_id]
-        return game_info_list
+            game_info = self.catalog.get(self.game_id)
+            return [game_info] if game_info is not None else []
+        return self.catalog.games
+
+    @staticmethod
+    def parse_in_app_price(price: str | None) -> tuple[float, float]:
+        """Parses the `inAppProductPrice` string from play store into a price range.
+
+        Args:
+            price (str | None): The in-app product price string, e.g. `每個項目 US$0.99 - US$99.99`.
+
+        Returns:
+            tuple[float, float]: The lowest and highest price.
+
+        Raises:
+            PriceParseError: If the string holds no price, see `PriceRangeParser`.
+
+        Example:
+            >>> GameInfoUpdater.parse_in_app_price("每個項目 US$0.99 - US$99.99")
+            (0.99, 99.99)
+        """
+        return PriceRangeParser.shared("zh-TW").parse(price)
 
     def __fetch(self) -> GamePriceInfo:
-        try:
-            if not self.game_id or not self.game_name:
-                raise logfire.exception("game_id or game_name is missing")
-            price = gps.app(self.game_id, lang="zh-TW", country=self.country)["inAppProductPrice"]  # type: str
-            price = price.replace("每個項目 ", "")
-            lowest_string, highest_string = price.split(" - ")
-            lowest = Price.fromstring(lowest_string).amount_float
-            highest = Price.fromstring(highest_string).amount_float
-            return GamePriceInfo(
-                name=self.game_name, country=self.country, lowest=lowest, highest=highest
-            )
-        except Exception:
-            return GamePriceInfo(
-                name=self.game_name, country=self.country, lowest=0.0, highest=0.0
-            )
+        game = GameInfo(packageId=self.game_id, name=self.game_name)
+        return self._engine.fetch_one(game=game, country=self.country)
 
-    def fetch_game_info(self) -> list[GamePriceInfo]:
-        game_info_result = []
+    def iter_game_info(self) -> Iterator[GamePriceInfo]:
+        """Fetches the price range of every matching game, yielding each as soon as it is done.
+
+        Feed it to `src.exporters.export` to write sweeps of any size with bounded memory.
+        """
         if self.game_id and self.game_name:
-            fetched_info = self.__fetch()
-            return [fetched_info]
+            yield self.__fetch()
+            return
         for game_info in self.game_info_list:
             self.game_id = game_info.game_id
             self.game_name = game_info.game_name
             result = self.__fetch()
-            game_info_result.append(result)
             logfire.info("Fetching Game Info", **result.model_dump())
-        return game_info_result
+            yield result
+        if self.cache is not None:
+            logfire.info("Cache stats", **self.cache.stats.model_dump())
+
+    def fetch_game_info(self) -> list[GamePriceInfo]:
+        return list(self.iter_game_info())
 
 
 if __name__ == "__main__":
+    telemetry.configure()
     game_info_fetcher = GameInfoUpdater(country="us")
     game_info_fetcher.fetch_game_info()
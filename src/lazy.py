@@ -0,0 +1,50 @@
+import sys
+from types import ModuleType
+import importlib
+
+
+class LazyModule(ModuleType):
+    """A module placeholder which imports the real module on first attribute access.
+
+    Unlike `importlib.util.LazyLoader`, the import goes through `importlib.import_module` and
+    its per-module import lock on every first access, so worker threads racing on the first
+    use of a module are safe.
+
+    Example:
+        >>> bs4 = LazyModule("bs4")
+        >>> soup = bs4.BeautifulSoup("<p>hi</p>", "html.parser")
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name: str) -> object:
+        """Imports the real module, then looks the attribute up on it."""
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> list[str]:
+        """Lists the attributes of the real module."""
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Returns `name` from `sys.modules` when already imported, a `LazyModule` otherwise.
+
+    Args:
+        name (str): Absolute module name, e.g. `logfire` or `google_play_scraper.features.app`.
+
+    Returns:
+        ModuleType: The module, or a placeholder which imports it on first use.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
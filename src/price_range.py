@@ -0,0 +1,169 @@
+import re
+from typing import TYPE_CHECKING, ClassVar
+import threading
+from collections.abc import Iterable
+
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+np = lazy_import("numpy")
+
+# The "per item" prefix of `inAppProductPrice` by play store language. Prefixes are matched
+# before the amounts, which matters for prefixes with digits such as `1 アイテムあたり`.
+LOCALE_PREFIXES = {
+    "zh-TW": r"每個項目",
+    "zh-HK": r"每個項目",
+    "zh-CN": r"每件(?:商品)?",
+    "en": r"(?:US\$)?[Pp]er item|[Ee]ach",
+    "ja": r"1\s?アイテムあたり",
+    "ko": r"항목당",
+}
+_DASH = r"[-\u2010-\u2015\u2212~\u301c\uff5e]"
+_SYMBOL = r"[^\d\s\-\u2010-\u2015\u2212~\u301c\uff5e]{0,4}"
+_AMOUNT = r"\d{1,3}(?:[.,\s'\u2019]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?"
+_PRICE = rf"{_SYMBOL}\s?(?:{_AMOUNT})\s?{_SYMBOL}"
+_RANGE = rf"(?P<lowest>{_PRICE})\s*{_DASH}\s*(?P<highest>{_PRICE})"
+_GROUP = str.maketrans("", "", " '\u2019\u00a0\u202f")
+_DIGITS = re.compile(_AMOUNT)
+_THREE_DECIMALS = re.compile(r"(?<![\d.,])0([.,])\d{3}(?![\d.,])")
+_ANY_RANGE = re.compile(_RANGE)
+_ANY_PRICE = re.compile(rf"(?P<single>{_PRICE})")
+
+
+class PriceParseError(ValueError):
+    """Raised when an `inAppProductPrice` string holds no recognizable price or range."""
+
+    def __init__(self, text: str | None, reason: str = "No price found"):
+        super().__init__(f"{reason}: {text!r}")
+        self.text = text
+
+
+def parse_amount(text: str, decimal: str | None = None) -> float:
+    """Parses one amount, telling thousands separators from decimal separators.
+
+    When both `.` and `,` appear, the rightmost one is the decimal separator. A single
+    separator followed by exactly three digits is a thousands separator, unless the integer
+    part is `0` (`0.990` in currencies with three decimals); any other single separator is
+    the decimal separator. Spaces and apostrophes are always thousands separators.
+
+    Args:
+        text (str): The amount, with or without a currency symbol.
+        decimal (str | None): A separator known to be the decimal one, e.g. from the other end
+            of a range, which settles the three digit case.
+
+    Example:
+        >>> parse_amount("15,800"), parse_amount("1.234,56"), parse_amount("0,99")
+        (15800.0, 1234.56, 0.99)
+    """
+    match = _DIGITS.search(text)
+    if match is None:
+        raise PriceParseError(text)
+    digits = match.group().translate(_GROUP)
+    dot, comma = digits.rfind("."), digits.rfind(",")
+    if dot < 0 and comma < 0:
+        return float(digits)
+    separator = "." if dot > comma else ","
+    integer, fraction = digits.rsplit(separator, 1)
+    integer = integer.replace(".", "").replace(",", "")
+    single = dot < 0 or comma < 0
+    grouped = len(fraction) == 3 and integer != "0" and separator != decimal
+    if single and (digits.count(separator) > 1 or grouped):
+        return float(integer + fraction)
+    return float(f"{integer}.{fraction}")
+
+
+class PriceRangeParser(BaseModel):
+    """Parses play store `inAppProductPrice` strings into `(lowest, highest)` price ranges.
+
+    A precompiled pattern for the language strips its "per item" prefix and matches the whole
+    string as a range or a single price. Strings it does not fully match, such as another
+    language, fall back to searching for a range anywhere in the string. Currency symbols on
+    either side of the amounts and every common dash are accepted. Anything without a price
+    raises `PriceParseError` instead of turning into zeros.
+
+    Example:
+        >>> parser = PriceRangeParser.shared("zh-TW")
+        >>> parser.parse("每個項目 US$0.99 - US$99.99")
+        (0.99, 99.99)
+        >>> parser.parse("每個項目 0,99 € - 109,99 €")
+        (0.99, 109.99)
+        >>> parser.parse("每個項目 ¥160")
+        (160.0, 160.0)
+    """
+
+    lang: str = Field(
+        default="zh-TW",
+        title="Language",
+        description="Play store language the strings were fetched in, e.g. `zh-TW` or `ja`",
+    )
+
+    _instances: ClassVar[dict[str, "PriceRangeParser"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+    _pattern: re.Pattern[str] = PrivateAttr()
+
+    def model_post_init(self, context: object, /) -> None:
+        """Compiles the full-match pattern of the language."""
+        prefix = LOCALE_PREFIXES.get(self.lang, LOCALE_PREFIXES.get(self.lang.split("-")[0], ""))
+        self._pattern = re.compile(rf"\s*(?:{prefix})?\s*(?:{_RANGE}|(?P<single>{_PRICE}))\s*")
+
+    @classmethod
+    def shared(cls, lang: str = "zh-TW") -> "PriceRangeParser":
+        """Returns the process wide parser of `lang`, so each pattern is compiled once."""
+        with cls._instances_lock:
+            if lang not in cls._instances:
+                cls._instances[lang] = cls(lang=lang)
+            return cls._instances[lang]
+
+    def parse(self, text: str | None) -> tuple[float, float]:
+        """Parses one price range string.
+
+        Args:
+            text (str | None): The `inAppProductPrice` string, e.g. `每個項目 US$0.99 - US$99.99`.
+
+        Returns:
+            tuple[float, float]: The lowest and highest price, equal for a single price.
+
+        Raises:
+            PriceParseError: If the string holds no price.
+        """
+        if not text:
+            raise PriceParseError(text, reason="Empty price")
+        match = self._pattern.fullmatch(text) or _ANY_RANGE.search(text) or _ANY_PRICE.search(text)
+        if match is None:
+            raise PriceParseError(text)
+        groups = match.groupdict()
+        if groups.get("single") is not None:
+            amount = parse_amount(groups["single"])
+            return amount, amount
+        lowest = parse_amount(groups["lowest"])
+        three_decimals = _THREE_DECIMALS.search(groups["lowest"])
+        highest = parse_amount(groups["highest"], three_decimals and three_decimals.group(1))
+        if lowest > highest:
+            raise PriceParseError(text, reason="Lowest price above highest price")
+        return lowest, highest
+
+    def parse_many(self, texts: Iterable[str | None]) -> tuple["ndarray", "ndarray"]:
+        """Parses many strings at once, each distinct string only once.
+
+        Args:
+            texts (Iterable[str | None]): The `inAppProductPrice` strings.
+
+        Returns:
+            tuple[ndarray, ndarray]: `float64` arrays of the lowest and highest prices, NaN where
+                a string could not be parsed.
+        """
+        parsed: dict[str | None, tuple[float, float]] = {}
+        ranges = []
+        for text in texts:
+            if text not in parsed:
+                try:
+                    parsed[text] = self.parse(text)
+                except PriceParseError:
+                    parsed[text] = (float("nan"), float("nan"))
+            ranges.append(parsed[text])
+        array = np.array(ranges, dtype=np.float64).reshape(-1, 2)
+        return array[:, 0], array[:, 1]
@@ -0,0 +1,121 @@
+from typing import Literal
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+from pydantic import Field, BaseModel
+
+from src.typings.game import GamePriceInfo
+from src.typings.batch import RateBatch, PriceBatch
+from src.country_lookup import CountryLookup
+from src.typings.currency_rate import CurrencyRate
+
+CARD_NETWORKS = ["jcb", "master", "visa"]
+
+
+class PricePipeline(BaseModel):
+    """Converts game price ranges into TWD per card network and ranks the cheapest storefronts.
+
+    Every step works on whole DataFrames: prices are joined to their storefront currency,
+    rates are parsed into floats once, and the conversion is a single vectorized multiply over
+    every game, country and card network.
+
+    Example:
+        >>> pipeline = PricePipeline()
+        >>> converted = pipeline.convert(prices=game_price_list, rates=currency_rate_list)
+        >>> pipeline.cheapest(converted)[["name", "country", "card", "highest_twd"]]
+           name country  card  highest_twd
+        0  天堂W      tr  visa      2895.74
+    """
+
+    countries_path: str = Field(
+        default="./configs/countries_currency.csv",
+        title="Countries Path",
+        description="CSV mapping each country code to its currency code",
+    )
+    rank_by: Literal["lowest_twd", "highest_twd"] = Field(
+        default="highest_twd",
+        title="Rank By",
+        description="Converted price column used to rank storefronts",
+    )
+
+    @property
+    def countries(self) -> pd.DataFrame:
+        """Returns the `country` to `currency` table, both lower-case, see `CountryLookup`."""
+        return CountryLookup.shared(self.countries_path).frame
+
+    @staticmethod
+    def prices_frame(prices: Iterable[GamePriceInfo] | PriceBatch | pd.DataFrame) -> pd.DataFrame:
+        """Builds a price DataFrame, dropping ranges which failed to fetch or parse."""
+        if not isinstance(prices, pd.DataFrame):
+            batch = prices if isinstance(prices, PriceBatch) else PriceBatch.from_models(prices)
+            prices = pd.DataFrame({
+                "name": batch.name,
+                "country": batch.country,
+                "lowest": batch.lowest,
+                "highest": batch.highest,
+            })
+        prices = prices.assign(country=prices["country"].str.lower())
+        return prices.loc[prices["highest"] > 0].reset_index(drop=True)
+
+    @staticmethod
+    def rates_frame(rates: Iterable[CurrencyRate] | RateBatch | pd.DataFrame) -> pd.DataFrame:
+        """Builds a long `currency, card, rate` DataFrame with numeric rates.
+
+        A currency is quoted against itself at 1.0 for every card, so TWD storefronts survive
+        the join without a twrates page.
+        """
+        if not isinstance(rates, pd.DataFrame):
+            batch = rates if isinstance(rates, RateBatch) else RateBatch.from_models(rates)
+            rates = pd.DataFrame({
+                "currency_en": batch.currency_en,
+                **{card: getattr(batch, card) for card in CARD_NETWORKS},
+            })
+        rates = rates.rename(columns={"currency_en": "currency"})
+        rates = rates.melt(
+            id_vars="currency", value_vars=CARD_NETWORKS, var_name="card", value_name="rate"
+        )
+        if not pd.api.types.is_float_dtype(rates["rate"]):
+            rates["rate"] = pd.to_numeric(
+                rates["rate"].astype("string").str.replace(",", "", regex=False), errors="coerce"
+            )
+        twd = pd.DataFrame({"currency": "twd", "card": CARD_NETWORKS, "rate": 1.0})
+        rates = pd.concat([rates.loc[rates["currency"] != "twd"], twd], ignore_index=True)
+        return rates.dropna(subset=["rate"]).reset_index(drop=True)
+
+    def convert(
+        self,
+        prices: Iterable[GamePriceInfo] | PriceBatch | pd.DataFrame,
+        rates: Iterable[CurrencyRate] | RateBatch | pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Converts every price range into TWD for every card network.
+
+        Args:
+            prices (Iterable[GamePriceInfo] | PriceBatch | pd.DataFrame): Price ranges in local
+                currency.
+            rates (Iterable[CurrencyRate] | RateBatch | pd.DataFrame): Card rates scraped from
+                twrates.
+
+        Returns:
+            pd.DataFrame: One row per game, country and card network, with `lowest_twd` and
+                `highest_twd` columns. Storefronts without a known rate are dropped.
+        """
+        prices = self.prices_frame(prices)
+        rates = self.rates_frame(rates)
+        converted = prices.merge(self.countries, on="country", how="inner")
+        converted = converted.merge(rates, on="currency", how="inner")
+        rate = converted["rate"].to_numpy(dtype=np.float64)
+        converted["lowest_twd"] = converted["lowest"].to_numpy(dtype=np.float64) * rate
+        converted["highest_twd"] = converted["highest"].to_numpy(dtype=np.float64) * rate
+        return converted
+
+    def rank(self, converted: pd.DataFrame) -> pd.DataFrame:
+        """Adds a per-game `rank` column, 1 being the cheapest country and card network."""
+        ranked = converted.sort_values(["name", self.rank_by], kind="stable")
+        ranked["rank"] = ranked.groupby("name", sort=False).cumcount() + 1
+        return ranked.reset_index(drop=True)
+
+    def cheapest(self, converted: pd.DataFrame) -> pd.DataFrame:
+        """Returns the cheapest country and card network of every game."""
+        ranked = self.rank(converted)
+        return ranked.loc[ranked["rank"] == 1].reset_index(drop=True)
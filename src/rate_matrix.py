@@ -0,0 +1,185 @@
+from typing import TYPE_CHECKING
+from collections.abc import Iterable
+
+from src.lazy import lazy_import
+from src.typings.batch import CARD_NETWORKS, RateBatch
+from src.typings.currency_rate import CurrencyRate
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from numpy.typing import ArrayLike
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+BASE_CURRENCY = "twd"
+
+
+class RateMatrix:
+    """A dense cross-rate matrix converting prices between any two currencies in one operation.
+
+    `rates[i, c]` is the TWD price of one unit of currency `codes[i]` on card network
+    `CARD_NETWORKS[c]`, and `cross[c, i, j]` the precomputed rate from currency `i` into
+    currency `j`. Rates twrates does not list are NaN, so conversions through them come out
+    NaN rather than raising, and `missing` masks them. TWD is quoted at 1.0, like in
+    `PricePipeline.rates_frame`, and converting a currency into itself never needs a rate.
+
+    A conversion is one fancy-indexed multiply over a whole price array, with one source and
+    target currency or one per price, so millions of prices never go back to the scraped
+    strings. `update` replaces the rates of a known currency in O(currencies).
+
+    Example:
+        >>> matrix = RateMatrix.from_models(currency_rate_list)
+        >>> matrix.convert([160.0, 15800.0], source="jpy", target="usd", card="jcb")
+        array([  1.11572331, 110.17767682])
+        >>> matrix.convert([0.99, 160.0], source=["usd", "jpy"], card=None)
+        array([[31.81563 , 31.86711 , 31.84731 ],
+               [35.856  , 35.92   ,       nan]])
+    """
+
+    __slots__ = ("codes", "cross", "index", "rates")
+
+    def __init__(self, codes: list[str], rates: "ndarray"):
+        self.codes = codes
+        self.index = {code: position for position, code in enumerate(codes)}
+        self.rates = rates
+        self.cross = self._cross(rates)
+
+    def __len__(self) -> int:
+        """Returns the number of currencies in the matrix."""
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        """Returns whether the matrix has a row for `code`."""
+        return code.lower() in self.index
+
+    @staticmethod
+    def _row(rate: CurrencyRate) -> "ndarray":
+        batch = RateBatch.from_models([rate])
+        return np.array([getattr(batch, card)[0] for card in CARD_NETWORKS], dtype=np.float64)
+
+    @staticmethod
+    def _cross(rates: "ndarray") -> "ndarray":
+        by_card = rates.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cross = by_card[:, :, None] / by_card[:, None, :]
+        diagonal = np.arange(len(rates))
+        cross[:, diagonal, diagonal] = 1.0
+        return cross
+
+    @classmethod
+    def from_batch(cls, batch: RateBatch) -> "RateMatrix":
+        """Builds the matrix from a rate batch; non-positive rates are treated as missing."""
+        codes = [code.lower() for code in batch.currency_en]
+        rates = np.column_stack([getattr(batch, card) for card in CARD_NETWORKS]).reshape(
+            len(codes), len(CARD_NETWORKS)
+        )
+        rates = np.where(rates > 0, rates, np.nan)
+        if BASE_CURRENCY in codes:
+            rates[codes.index(BASE_CURRENCY)] = 1.0
+        else:
+            codes.append(BASE_CURRENCY)
+            rates = np.vstack([rates, np.ones(len(CARD_NETWORKS))])
+        return cls(codes=codes, rates=rates)
+
+    @classmethod
+    def from_models(cls, rates: Iterable[CurrencyRate | None]) -> "RateMatrix":
+        """Builds the matrix from models, skipping the None results of failed fetches."""
+        return cls.from_batch(RateBatch.from_models(rates))
+
+    def update(self, rate: CurrencyRate) -> None:
+        """Replaces the rates of one currency, adding it when it is new.
+
+        Only the row and column of that currency are recomputed in `cross`, instead of the
+        whole matrix.
+        """
+        code = rate.currency_en.lower()
+        if code == BASE_CURRENCY:
+            return
+        row = self._row(rate)
+        row = np.where(row > 0, row, np.nan)
+        position = self.index.get(code)
+        if position is None:
+            position = len(self.codes)
+            self.codes.append(code)
+            self.index[code] = position
+            self.rates = np.vstack([self.rates, row])
+            self.cross = np.pad(self.cross, ((0, 0), (0, 1), (0, 1)), constant_values=np.nan)
+        self.rates[position] = row
+        by_card = self.rates.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.cross[:, position, :] = row[:, None] / by_card
+            self.cross[:, :, position] = by_card / row[:, None]
+        self.cross[:, position, position] = 1.0
+
+    def positions(self, codes: "str | ArrayLike") -> "int | ndarray":
+        """Maps currency codes to their rows, -1 for currencies missing from the matrix.
+
+        Arrays of codes are hashed once with `pandas.factorize` and only their unique values
+        are looked up. Integer arrays are taken as rows already, so positions computed once
+        can be reused across conversions.
+        """
+        if isinstance(codes, str):
+            return self.index.get(codes.lower(), -1)
+        codes = np.asarray(codes)
+        if np.issubdtype(codes.dtype, np.integer):
+            return codes
+        inverse, unique = pd.factorize(codes.astype(object, copy=False).ravel())
+        # The trailing -1 maps the -1 of missing values such as None to a missing row.
+        mapped = np.array(
+            [self.index.get(str(code).lower(), -1) for code in unique.tolist()] + [-1],
+            dtype=np.intp,
+        )
+        return mapped[inverse].reshape(codes.shape)
+
+    def missing(self, card: str | None = None) -> "ndarray":
+        """Returns a mask of the currencies without a rate, per card network if `card` is None.
+
+        Returns:
+            ndarray: A boolean array of shape `(currencies,)`, or `(currencies, cards)`.
+        """
+        if card is None:
+            return np.isnan(self.rates)
+        return np.isnan(self.rates[:, CARD_NETWORKS.index(card)])
+
+    def rate(self, source: str, target: str = BASE_CURRENCY, card: str = "visa") -> float:
+        """Returns the rate from `source` into `target`, NaN when either rate is missing."""
+        source, target = self.positions(source), self.positions(target)
+        if source < 0 or target < 0:
+            return float("nan")
+        return float(self.cross[CARD_NETWORKS.index(card), source, target])
+
+    def convert(
+        self,
+        amounts: "ArrayLike",
+        source: "str | ArrayLike",
+        target: "str | ArrayLike" = BASE_CURRENCY,
+        card: str | None = "visa",
+    ) -> "ndarray":
+        """Converts prices from `source` into `target` currency.
+
+        Args:
+            amounts (ArrayLike): Prices in the source currency, NaN for missing prices.
+            source (str | ArrayLike): One currency code for every price, or one per price.
+            target (str | ArrayLike): One currency code for every price, or one per price.
+                Defaults to TWD.
+            card (str | None): Card network of the rates, None converts for every card network.
+
+        Returns:
+            ndarray: The converted prices, NaN where a price or rate is missing. With `card`
+                None, the last axis is the card network in `CARD_NETWORKS` order.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        source, target = self.positions(source), self.positions(target)
+        if card is None:
+            factor = np.moveaxis(self.cross[:, source, target], 0, -1)
+            amounts = amounts[..., None]
+        else:
+            factor = self.cross[CARD_NETWORKS.index(card)][source, target]
+        converted = amounts * factor
+        unknown = (np.asarray(source) < 0) | (np.asarray(target) < 0)
+        if unknown.any():
+            converted = np.where(
+                unknown[..., None] if card is None else unknown, np.nan, converted
+            )
+        return converted
@@ -0,0 +1,178 @@
+import time
+import threading
+from collections.abc import Callable
+
+from pydantic import Field, BaseModel, JsonValue, PrivateAttr
+
+from src.cache import ResultCache
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.typings.revalidation import PageEntry, RevalidationStats
+
+
+class PageRevalidator(BaseModel):
+    """Fetches pages with conditional GETs, downloading and parsing each version of a page once.
+
+    The ETag and Last-Modified validators of every page are kept together with the results
+    parsed from it, in memory and in `cache` when one is set, so they outlive the run for the
+    TTL of `namespace` in the cache, 3 days for `page` by default. A later request sends them
+    as `If-None-Match` and `If-Modified-Since`, and a `304 Not Modified` reuses the stored
+    result without downloading or parsing the page. A page requested less than `reuse_window`
+    seconds ago is not requested again, so one response feeds every parser of the same URL,
+    and concurrent requests of one URL wait for the first one. Results carry the `version` of
+    their parser, and a result of another version is never reused: the page is downloaded and
+    parsed again.
+
+    Example:
+        >>> pages = PageRevalidator(source="twrates", cache=ResultCache())
+        >>> url = "https://www.twrates.com/card/mastercard/usd.html"
+        >>> pages.fetch(url, parser="currency_rate", parse=parse_rate, version="1")
+        {'currency_en': 'usd', 'currency_cn': '美金', 'JCB': '32.137', ...}
+        >>> pages.stats.not_modified
+        0
+    """
+
+    source: str = Field(
+        ..., title="Source", description="The scraped site, e.g. `twrates`, used in telemetry"
+    )
+    client: HttpClient = Field(
+        default_factory=HttpClient,
+        title="HTTP Client",
+        description="Pooled HTTP client sending the requests",
+    )
+    cache: ResultCache | None = Field(
+        default=None,
+        title="Cache",
+        description="Cache keeping the validators across runs, None keeps them in memory only",
+    )
+    namespace: str = Field(
+        default="page",
+        title="Namespace",
+        description="Cache namespace of the validators, whose TTL bounds how long they are kept",
+    )
+    reuse_window: float = Field(
+        default=60.0,
+        title="Reuse Window",
+        description="Seconds a response is reused for the same URL without a new request",
+        ge=0,
+    )
+
+    _pages: dict[str, PageEntry] = PrivateAttr(default_factory=dict)
+    _recent: dict[str, tuple[float, str | None]] = PrivateAttr(default_factory=dict)
+    _url_locks: dict[str, threading.Lock] = PrivateAttr(default_factory=dict)
+    _stats: RevalidationStats = PrivateAttr(default_factory=RevalidationStats)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def stats(self) -> RevalidationStats:
+        """Returns the request, 304, reuse and parse counters of this revalidator."""
+        with self._lock:
+            return self._stats.model_copy()
+
+    def _entry(self, url: str) -> PageEntry | None:
+        entry = self._pages.get(url)
+        if entry is None and self.cache is not None:
+            cached = self.cache.get(self.namespace, url)
+            if cached is not None:
+                entry = self._pages[url] = PageEntry(**cached)
+        return entry
+
+    def _store(self, entry: PageEntry, text: str | None) -> None:
+        now = time.monotonic()
+        self._pages[entry.url] = entry
+        with self._lock:
+            self._recent = {
+                url: recent
+                for url, recent in self._recent.items()
+                if now - recent[0] <= self.reuse_window
+            }
+            self._recent[entry.url] = (now, text)
+        if self.cache is not None:
+            self.cache.set(self.namespace, entry.url, entry.model_dump())
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self._stats, name, getattr(self._stats, name) + count)
+        for name, count in counts.items():
+            telemetry.counter(f"igpf.revalidation.{name}").add(count, {"source": self.source})
+
+    @staticmethod
+    def _has(entry: PageEntry | None, parser: str, version: str) -> bool:
+        return (
+            entry is not None and parser in entry.parsed and entry.versions.get(parser) == version
+        )
+
+    def _parse(
+        self,
+        entry: PageEntry,
+        parser: str,
+        parse: Callable[[str], JsonValue],
+        text: str,
+        version: str,
+    ) -> JsonValue:
+        with telemetry.stage("parse", source=self.source):
+            entry.parsed[parser] = parse(text)
+        entry.versions[parser] = version
+        self._count(parses=1)
+        return entry.parsed[parser]
+
+    def fetch(
+        self, url: str, parser: str, parse: Callable[[str], JsonValue], version: str = ""
+    ) -> JsonValue:
+        """Returns the result of `parse` on the current version of a page.
+
+        Args:
+            url (str): The URL of the page.
+            parser (str): Name of the result, as one page may be parsed into several results.
+            parse (Callable[[str], JsonValue]): Parses the page into a JSON serializable result.
+            version (str): Version of `parse` and of the schema of its result; results stored
+                by another version are parsed again.
+
+        Returns:
+            JsonValue: The parsed result, reused when the page did not change.
+
+        Raises:
+            requests.HTTPError: If the page responded with an error status.
+        """
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            entry = self._entry(url)
+            with self._lock:
+                recent = self._recent.get(url)
+            if recent is not None and time.monotonic() - recent[0] <= self.reuse_window:
+                if self._has(entry, parser, version):
+                    self._count(reused=1, bytes_saved=entry.size)
+                    return entry.parsed[parser]
+                if recent[1] is not None:
+                    self._count(reused=1, bytes_saved=entry.size)
+                    value = self._parse(entry, parser, parse, recent[1], version)
+                    self._store(entry, recent[1])
+                    return value
+
+            headers = {}
+            if self._has(entry, parser, version):
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+            with telemetry.stage("request", source=self.source):
+                response = self.client.get(url, headers=headers)
+                response.raise_for_status()
+            self._count(requests=1)
+            if response.status_code == 304 and headers:
+                self._count(not_modified=1, bytes_saved=entry.size)
+                self._store(entry, None)
+                return entry.parsed[parser]
+
+            text = response.text
+            entry = PageEntry(
+                url=url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                size=len(response.content),
+            )
+            value = self._parse(entry, parser, parse, text, version)
+            self._store(entry, text)
+            return value
@@ -0,0 +1,348 @@
+import time
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+from collections.abc import Callable
+
+import orjson
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.cli import JobRunner
+from src.lazy import lazy_import
+from src.cache import ResultCache
+from src.catalog import GameCatalog
+from src.pricing import PricePipeline
+from src.telemetry import telemetry
+from src.http_client import HttpClient
+from src.typings.job import JobSpec
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GamePriceInfo
+from src.currency_core import CurrencyCore
+from src.country_lookup import CountryLookup
+from src.typings.service import EndpointStats, ServiceMetrics
+from src.typings.currency_rate import CurrencyRate
+
+logfire = lazy_import("logfire")
+
+Query = dict[str, list[str]]
+
+
+class _EndpointRecorder:
+    """Counts the requests of one endpoint and keeps the latencies of the most recent ones."""
+
+    __slots__ = ("errors", "latencies", "requests")
+
+    def __init__(self, window: int):
+        self.requests = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def stats(self, uptime: float) -> EndpointStats:
+        ordered = sorted(self.latencies) or [0.0]
+        return EndpointStats(
+            requests=self.requests,
+            errors=self.errors,
+            throughput_per_s=self.requests / uptime if uptime else 0.0,
+            p50_ms=ordered[len(ordered) // 2] * 1000,
+            p95_ms=ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000,
+            max_ms=ordered[-1] * 1000,
+        )
+
+
+class PriceService(BaseModel):
+    """Answers currency rate, game price and comparison queries from the shared cache.
+
+    Queries are resolved like a job (see `JobRunner`) and read through the `ResultCache` of
+    the scrapers, so a warm key never touches the network and concurrent misses of the same
+    key share one upstream fetch. A background thread runs `refresh` every
+    `refresh_interval` seconds; entries older than their TTL are then revalidated while the
+    stale values keep being served.
+
+    Example:
+        >>> service = PriceService.from_cache(ResultCache(), refresh_games=["天堂W"])
+        >>> service.start()
+        >>> service.compare(games=["天堂W"], countries=["us", "jp", "tr"], top=1)[0]["country"]
+        'tr'
+    """
+
+    currency_core: CurrencyCore = Field(
+        default_factory=CurrencyCore,
+        title="Currency Core",
+        description="Scraper of the twrates card rates",
+    )
+    engine: GameFetchEngine = Field(
+        default_factory=GameFetchEngine,
+        title="Game Fetch Engine",
+        description="Scraper of the play store price ranges",
+    )
+    catalog: GameCatalog = Field(
+        default_factory=GameCatalog.shared,
+        title="Game Catalog",
+        description="Indexed game list used to resolve the games of a query",
+    )
+    lookup: CountryLookup = Field(
+        default_factory=CountryLookup.shared,
+        title="Country Lookup",
+        description="Country to currency table used to resolve countries and currencies",
+    )
+    pipeline: PricePipeline = Field(
+        default_factory=PricePipeline,
+        title="Price Pipeline",
+        description="Converts and ranks the price ranges of comparisons",
+    )
+    refresh_interval: float = Field(
+        default=3600,
+        title="Refresh Interval",
+        description="Seconds between background refreshes, 0 disables them",
+        ge=0,
+    )
+    refresh_games: list[str] = Field(
+        default=[],
+        title="Refresh Games",
+        description="Games kept warm by the background refresh, `all` for every game",
+    )
+    refresh_countries: list[str] = Field(
+        default=["us"],
+        title="Refresh Countries",
+        description="Countries kept warm by the background refresh, with their currencies",
+    )
+    latency_window: int = Field(
+        default=1024,
+        title="Latency Window",
+        description="Number of recent requests per endpoint the latency percentiles cover",
+        ge=1,
+    )
+
+    _endpoints: dict[str, _EndpointRecorder] = PrivateAttr(default_factory=dict)
+    _started_at: float = PrivateAttr(default_factory=time.monotonic)
+    _refreshes: int = PrivateAttr(default=0)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _stop: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _thread: threading.Thread | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_cache(cls, cache: ResultCache | None, **kwargs: object) -> "PriceService":
+        """Builds a service whose scrapers share one HTTP client and `cache`."""
+        client = HttpClient()
+        return cls(
+            currency_core=CurrencyCore(client=client, cache=cache),
+            engine=GameFetchEngine(client=client, cache=cache),
+            **kwargs,
+        )
+
+    def _runner(self, **spec: object) -> JobRunner:
+        return JobRunner(
+            spec=JobSpec(**spec),
+            currency_core=self.currency_core,
+            engine=self.engine,
+            catalog=self.catalog,
+            lookup=self.lookup,
+        )
+
+    def rates(self, currencies: list[str]) -> list[CurrencyRate]:
+        """Returns the card rates of `currencies`, which may hold `all`."""
+        return list(self._runner(currencies=currencies).iter_currency_rates())
+
+    def prices(self, games: list[str], countries: list[str]) -> list[GamePriceInfo]:
+        """Returns the price range of every game in every country.
+
+        Raises:
+            ValueError: If a game or a country is unknown.
+        """
+        return list(self._runner(games=games, countries=countries).iter_game_prices())
+
+    def _compare(
+        self, games: list[str], countries: list[str], top: int
+    ) -> tuple[list[dict], bool]:
+        """Returns the ranking and whether every price and rate it needed was fetched."""
+        runner = self._runner(games=games, countries=countries, currencies=["auto"])
+        rates = list(runner.iter_currency_rates())
+        prices = list(runner.iter_game_prices())
+        ranked = self.pipeline.rank(self.pipeline.convert(prices=prices, rates=rates))
+        complete = all(price.error is None for price in prices) and set(
+            runner.resolve_currencies()
+        ) <= {rate.currency_en for rate in rates}
+        return ranked.loc[ranked["rank"] <= top].to_dict(orient="records"), complete
+
+    def compare(self, games: list[str], countries: list[str], top: int = 3) -> list[dict]:
+        """Ranks the countries and card networks of each game by their price in TWD.
+
+        Comparisons are cached under the `comparison` namespace, so repeated queries skip the
+        conversion as well as the scraping. A comparison missing a price or a rate is returned
+        but not cached, so it is not served for a whole TTL after the source recovered.
+
+        Args:
+            games (list[str]): Package IDs or game names.
+            countries (list[str]): Play store country codes or names to compare.
+            top (int): Number of cheapest storefronts kept per game.
+
+        Returns:
+            list[dict]: The converted price ranges ordered by game and rank.
+
+        Raises:
+            ValueError: If a game or a country is unknown.
+        """
+        cache = self.engine.cache
+        if cache is None:
+            return self._compare(games=games, countries=countries, top=top)[0]
+        partial: list[list[dict]] = []
+
+        def fetch() -> list[dict] | None:
+            ranked, complete = self._compare(games=games, countries=countries, top=top)
+            if complete:
+                return ranked
+            partial.append(ranked)
+            return None
+
+        key = orjson.dumps([games, countries, top]).decode()
+        cached = cache.get_or_fetch("comparison", key, fetch=fetch)
+        if cached is not None:
+            return cached
+        # Callers which waited on another caller's incomplete comparison compare themselves.
+        return (
+            partial[0] if partial else self._compare(games=games, countries=countries, top=top)[0]
+        )
+
+    def refresh(self) -> None:
+        """Reads the configured games and countries through the cache once."""
+        runner = self._runner(
+            games=self.refresh_games, countries=self.refresh_countries, currencies=["auto"]
+        )
+        with telemetry.stage("service_refresh", source="api"):
+            list(runner.iter_currency_rates())
+            list(runner.iter_game_prices())
+        with self._lock:
+            self._refreshes += 1
+
+    def _refresh_loop(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logfire.exception("Background refresh failed")
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def start(self) -> None:
+        """Starts the background refresh, unless it is disabled or already running."""
+        if self.refresh_interval and self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background refresh and closes the HTTP client."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.engine.client.close()
+
+    def record(self, endpoint: str, elapsed: float, failed: bool) -> None:
+        """Records the latency of one request to `endpoint`."""
+        with self._lock:
+            if endpoint not in self._endpoints:
+                self._endpoints[endpoint] = _EndpointRecorder(self.latency_window)
+            recorder = self._endpoints[endpoint]
+            recorder.requests += 1
+            recorder.errors += failed
+            recorder.latencies.append(elapsed)
+
+    def metrics(self) -> ServiceMetrics:
+        """Returns the latency and throughput of every endpoint with cache and transport stats."""
+        uptime = time.monotonic() - self._started_at
+        with self._lock:
+            endpoints = {
+                endpoint: recorder.stats(uptime) for endpoint, recorder in self._endpoints.items()
+            }
+            refreshes = self._refreshes
+        cache = self.engine.cache
+        return ServiceMetrics(
+            uptime_s=uptime,
+            refreshes=refreshes,
+            endpoints=endpoints,
+            cache=cache.stats if cache is not None else None,
+            transport=self.engine.client.stats,
+        )
+
+
+def _values(query: Query, name: str, default: list[str] | None = None) -> list[str]:
+    values = [value for raw in query.get(name, []) for value in raw.split(",") if value]
+    if not values and default is None:
+        raise ValueError(f"Missing query parameter: {name}")
+    return values or default
+
+
+def build_routes(service: PriceService) -> dict[str, Callable[[Query], object]]:
+    """Maps every endpoint path to a handler of its query string."""
+    return {
+        "/healthz": lambda query: {"status": "ok"},
+        "/metrics": lambda query: service.metrics().model_dump(),
+        "/rates": lambda query: [
+            rate.model_dump() for rate in service.rates(_values(query, "currencies"))
+        ],
+        "/prices": lambda query: [
+            price.model_dump()
+            for price in service.prices(
+                games=_values(query, "games"), countries=_values(query, "countries", ["us"])
+            )
+        ],
+        "/compare": lambda query: service.compare(
+            games=_values(query, "games"),
+            countries=_values(query, "countries", ["us"]),
+            top=int(_values(query, "top", ["3"])[0]),
+        ),
+    }
+
+
+def build_server(
+    service: PriceService, host: str = "127.0.0.1", port: int = 8000
+) -> ThreadingHTTPServer:
+    """Builds a threaded HTTP server answering GET requests with JSON.
+
+    Unknown paths answer 404 and invalid queries, such as an unknown game, answer 400 with an
+    `error` message. Every request is timed into `PriceService.metrics`.
+
+    Example:
+        >>> server = build_server(PriceService.from_cache(ResultCache()), port=8000)
+        >>> server.serve_forever()
+        >>> # GET /compare?games=天堂W&countries=us,jp,tr&top=1
+    """
+    routes = build_routes(service)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            start = time.perf_counter()
+            url = urlsplit(self.path)
+            route = routes.get(url.path)
+            status, payload = 200, None
+            try:
+                with telemetry.stage("api_request", source="api", path=url.path):
+                    if route is None:
+                        status, payload = 404, {"error": f"Not found: {url.path}"}
+                    else:
+                        payload = route(parse_qs(url.query))
+            except ValueError as e:
+                status, payload = 400, {"error": str(e)}
+            except Exception as e:
+                logfire.exception("Request failed", path=self.path)
+                status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+            body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            if route is not None:
+                service.record(url.path, time.perf_counter() - start, failed=status != 200)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    class Server(ThreadingHTTPServer):
+        # The default backlog of 5 drops the connections of bursts of concurrent clients.
+        request_queue_size = 128
+
+    return Server((host, port), Handler)
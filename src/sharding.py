@@ -0,0 +1,192 @@
+import zlib
+from pathlib import Path
+import itertools
+from collections.abc import Iterator
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import orjson
+from pydantic import Field, BaseModel
+
+from src.lazy import lazy_import
+from src.catalog import GameCatalog
+from src.telemetry import telemetry
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GameInfo, GamePriceInfo
+from src.typings.sharding import ShardReport
+
+logfire = lazy_import("logfire")
+
+
+def shard_of(game_id: str, shards: int) -> int:
+    """Assigns a game to a shard by the CRC32 of its package ID, stable across processes and runs.
+
+    Example:
+        >>> shard_of("com.ncsoft.lineagew", 4), shard_of("com.gamania.lineagem", 4)
+        (0, 2)
+    """
+    return zlib.crc32(game_id.encode()) % shards
+
+
+class ShardedSweep(BaseModel):
+    """Sweeps the game list in every country across several processes.
+
+    Games are split into `shards` by `shard_of`, and all countries of a game belong to its
+    shard. Each shard runs its own `GameFetchEngine` and appends every finished pair to
+    `shard-<index>-of-<shards>.jsonl` in `workdir` as soon as it is fetched. A shard started
+    again skips the pairs already in its file, so a crashed shard resumes where it stopped
+    and retries only its failures. Shards run in a process pool, or one per invocation of
+    `run_shard` on separate workers, and `merge` combines their files afterwards.
+
+    Since every process has its own engine and traffic controller, the play store sees up to
+    `shards` times the rate of one engine.
+
+    Example:
+        >>> sweep = ShardedSweep(countries=["us", "jp"], shards=4)
+        >>> prices = sweep.run()
+        >>> len(prices) == 2 * len(GameCatalog.shared().games)
+        True
+    """
+
+    countries: list[str] = Field(
+        default=["us"],
+        title="Countries",
+        description="Play store country codes to fetch every game in",
+        examples=[["us", "jp", "tr"]],
+    )
+    shards: int = Field(default=4, title="Shards", description="Number of shards", ge=1)
+    workdir: str = Field(
+        default="./.cache/igpf/shards",
+        title="Work Directory",
+        description="Directory receiving the partial result file of every shard",
+    )
+    catalog_path: str = Field(
+        default="./configs/gameList.json", title="Catalog Path", description="Game list to sweep"
+    )
+    max_in_flight: int = Field(
+        default=8,
+        title="Max In-Flight Requests",
+        description="Maximum number of detail pages being fetched at the same time per shard",
+        ge=1,
+    )
+    rate_limit: float | None = Field(
+        default=None,
+        title="Rate Limit",
+        description="Maximum requests per second per shard, 0 means unlimited and None adapts "
+        "the rate to how play store responds",
+        ge=0,
+    )
+    lang: str = Field(default="zh-TW", title="Language", description="Play store language")
+    detail_url: str = Field(
+        default="https://play.google.com/store/apps/details?id={app_id}&hl={lang}&gl={country}",
+        title="Detail URL",
+        description="URL template of the play store detail page",
+    )
+
+    def shard_path(self, index: int) -> Path:
+        return Path(self.workdir) / f"shard-{index:03d}-of-{self.shards:03d}.jsonl"
+
+    def shard_games(self, index: int) -> list[GameInfo]:
+        """Returns the games of shard `index`, in game list order."""
+        games = GameCatalog.shared(self.catalog_path).games
+        return [game for game in games if shard_of(game.game_id, self.shards) == index]
+
+    def _read(self, path: Path) -> Iterator[dict]:
+        """Yields the records of a partial file, cutting off a line torn by a crash."""
+        if not path.exists():
+            return
+        content = path.read_bytes()
+        if content and not content.endswith(b"\n"):
+            content = content[: content.rfind(b"\n") + 1]
+            with path.open("r+b") as file:
+                file.truncate(len(content))
+        for line in content.splitlines():
+            yield orjson.loads(line)
+
+    def run_shard(self, index: int) -> ShardReport:
+        """Fetches the pairs of one shard which are not in its partial file yet.
+
+        Args:
+            index (int): The shard to run, from 0 to `shards - 1`.
+
+        Returns:
+            ShardReport: How many pairs were resumed, fetched and failed.
+        """
+        path = self.shard_path(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        done = {
+            (record["game_id"], record["country"])
+            for record in self._read(path)
+            if record["error"] is None
+        }
+        games = self.shard_games(index)
+        pairs = [
+            (game, country)
+            for game, country in itertools.product(games, self.countries)
+            if (game.game_id, country) not in done
+        ]
+        report = ShardReport(
+            index=index, shards=self.shards, path=str(path), games=len(games), resumed=len(done)
+        )
+        engine = GameFetchEngine(
+            max_in_flight=self.max_in_flight,
+            rate_limit=self.rate_limit,
+            lang=self.lang,
+            detail_url=self.detail_url,
+        )
+        try:
+            with (
+                telemetry.stage("shard", source="play_store", index=index, shards=self.shards),
+                path.open("ab") as file,
+            ):
+                for game, _country, game_price in engine.iter_fetch_pairs(pairs):
+                    record = {"game_id": game.game_id, **game_price.model_dump()}
+                    file.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+                    file.flush()
+                    report.fetched += 1
+                    report.failed += game_price.error is not None
+        finally:
+            engine.client.close()
+        logfire.info("Shard finished", **report.model_dump())
+        return report
+
+    def merge(self) -> list[GamePriceInfo]:
+        """Combines the partial files of every shard, the latest record of a pair winning.
+
+        Returns:
+            list[GamePriceInfo]: One price range per game and country, in game list and
+                country order.
+        """
+        records: dict[tuple[str, str], dict] = {}
+        for index in range(self.shards):
+            for record in self._read(self.shard_path(index)):
+                records[record.pop("game_id"), record["country"]] = record
+        games = GameCatalog.shared(self.catalog_path).games
+        return [
+            GamePriceInfo(**records[game.game_id, country])
+            for game, country in itertools.product(games, self.countries)
+            if (game.game_id, country) in records
+        ]
+
+    def run(self, processes: int | None = None) -> list[GamePriceInfo]:
+        """Runs every shard in a process pool and merges their results.
+
+        Args:
+            processes (int | None): Size of the process pool, defaults to `shards`.
+
+        Returns:
+            list[GamePriceInfo]: The merged price ranges, see `merge`.
+        """
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=processes or self.shards, mp_context=context
+        ) as executor:
+            reports = list(executor.map(self.run_shard, range(self.shards)))
+        logfire.info(
+            "Sharded sweep finished",
+            shards=self.shards,
+            resumed=sum(report.resumed for report in reports),
+            fetched=sum(report.fetched for report in reports),
+            failed=sum(report.failed for report in reports),
+        )
+        return self.merge()
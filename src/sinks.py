@@ -0,0 +1,82 @@
+from pathlib import Path
+from collections.abc import Iterable
+
+from pydantic import Field, BaseModel
+
+from src.lazy import lazy_import
+from src.exporters import EXPORTERS, XlsxExporter, open_exporter
+from src.typings.job import SinkFormat, CardNetwork
+from src.typings.game import GamePriceInfo
+from src.typings.incremental import PriceDelta
+from src.typings.currency_rate import CurrencyRate
+
+pd = lazy_import("pandas")
+
+PRICE_COLUMNS = ["name", "country", "lowest", "highest", "error", "retryable"]
+DELTA_COLUMNS = list(PriceDelta.model_fields)
+
+
+class ResultSink(BaseModel):
+    """Writes the results of a job as one file per record kind.
+
+    Currency rates go to `currency_rate.<format>` and price ranges to `game_price.<format>`
+    inside `path`. Only the selected card networks are kept in the currency rate file. JSONL,
+    CSV and XLSX files are streamed through `src.exporters`, so records may come from an
+    iterator and are never held in memory all at once; Parquet files are written as a whole.
+
+    Example:
+        >>> sink = ResultSink(format="parquet", path="./data/output")
+        >>> sink.write(rates=currency_rate_list, prices=game_price_list)
+        [PosixPath('data/output/currency_rate.parquet'), PosixPath('data/output/game_price.parquet')]
+    """
+
+    format: SinkFormat = Field(default="jsonl", title="Format", description="Output format")
+    path: str = Field(
+        default="./data/output", title="Path", description="Directory receiving the files"
+    )
+    cards: list[CardNetwork] = Field(
+        default=["jcb", "master", "visa"],
+        title="Cards",
+        description="Card networks kept in the currency rate file",
+    )
+
+    def _write_records(
+        self, name: str, records: Iterable[BaseModel | None], columns: list[str]
+    ) -> Path:
+        output = Path(self.path) / f"{name}.{self.format}"
+        if self.format in EXPORTERS:
+            options = {"sheet": name} if EXPORTERS[self.format] is XlsxExporter else {}
+            with open_exporter(output, columns=columns, format=self.format, **options) as exporter:
+                exporter.write_many(records)
+            return output
+        output.parent.mkdir(parents=True, exist_ok=True)
+        frame = pd.DataFrame(
+            [record.model_dump(include=set(columns)) for record in records if record is not None],
+            columns=columns,
+        )
+        frame.to_parquet(output, index=False)
+        return output
+
+    def write_prices(self, prices: Iterable[GamePriceInfo]) -> Path:
+        """Writes price ranges alone to `game_price.<format>`, streaming them if possible."""
+        return self._write_records("game_price", prices, PRICE_COLUMNS)
+
+    def write(
+        self,
+        rates: Iterable[CurrencyRate],
+        prices: Iterable[GamePriceInfo],
+        deltas: Iterable[PriceDelta] | None = None,
+    ) -> list[Path]:
+        """Writes currency rates, price ranges and, if given, price deltas to `game_price_delta`.
+
+        Returns:
+            list[Path]: The written files.
+        """
+        rate_columns = ["currency_en", "currency_cn", *self.cards, "updated_time"]
+        outputs = [
+            self._write_records("currency_rate", rates, rate_columns),
+            self.write_prices(prices),
+        ]
+        if deltas is not None:
+            outputs.append(self._write_records("game_price_delta", deltas, DELTA_COLUMNS))
+        return outputs
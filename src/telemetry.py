@@ -0,0 +1,175 @@
+import os
+import time
+from types import TracebackType
+import random
+from typing import TYPE_CHECKING
+import threading
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from opentelemetry.metrics import Counter, Histogram
+
+logfire = lazy_import("logfire")
+
+_NULL_CONTEXT = nullcontext()
+_sampled: ContextVar[bool | None] = ContextVar("igpf_sampled", default=None)
+
+
+class _Stage:
+    """Times one stage, recording a duration histogram, a failure counter and an optional span."""
+
+    __slots__ = ("_attributes", "_name", "_source", "_span", "_start", "_telemetry", "_token")
+
+    def __init__(
+        self, telemetry: "Telemetry", name: str, source: str, attributes: dict[str, object]
+    ):
+        self._telemetry = telemetry
+        self._name = name
+        self._source = source
+        self._attributes = attributes
+        self._span = None
+        self._token = None
+        self._start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        """Starts the timer and, when this trace is sampled, a logfire span."""
+        sampled = _sampled.get()
+        if sampled is None:
+            sampled = random.random() < self._telemetry.sample_rate  # noqa: S311
+            self._token = _sampled.set(sampled)
+        if sampled:
+            self._span = logfire.span(
+                f"igpf.{self._name}", source=self._source, **self._attributes
+            )
+            self._span.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Records the stage duration and failure, then closes the span."""
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        attributes = {"stage": self._name, "source": self._source}
+        self._telemetry.histogram("igpf.stage.duration", unit="ms").record(elapsed_ms, attributes)
+        if exc_type is not None:
+            self._telemetry.counter("igpf.stage.failures").add(
+                1, {**attributes, "error": exc_type.__name__}
+            )
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc_value, traceback)
+        if self._token is not None:
+            _sampled.reset(self._token)
+
+
+class Telemetry(BaseModel):
+    """Spans and metrics around the hot paths of the scrapers.
+
+    Every stage records its duration into the `igpf.stage.duration` histogram and failures
+    into the `igpf.stage.failures` counter. Spans are only emitted for sampled traces; the
+    sampling decision is made once at the outermost stage and inherited by nested stages.
+    When disabled, `stage` returns a shared no-op context manager and metric calls return
+    immediately. logfire itself is only imported on first use and configured by `configure`.
+
+    Example:
+        >>> telemetry = Telemetry(enabled=True, sample_rate=0.1)
+        >>> with telemetry.stage("request", source="twrates", url=url):
+        ...     response = client.get(url)
+    """
+
+    enabled: bool = Field(
+        default=True, title="Enabled", description="Whether spans and metrics are recorded"
+    )
+    sample_rate: float = Field(
+        default=1.0,
+        title="Sample Rate",
+        description="Fraction of traces which emit spans, metrics are always recorded",
+        ge=0.0,
+        le=1.0,
+    )
+
+    _metrics: "dict[str, Counter | Histogram]" = PrivateAttr(default_factory=dict)
+    _configured: bool = PrivateAttr(default=False)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_env(cls) -> "Telemetry":
+        """Reads `IGPF_TELEMETRY` (`0` disables it) and `IGPF_TELEMETRY_SAMPLE_RATE`."""
+        return cls(
+            enabled=os.getenv("IGPF_TELEMETRY", "1").lower() not in {"0", "false", "off"},
+            sample_rate=float(os.getenv("IGPF_TELEMETRY_SAMPLE_RATE", "1.0")),
+        )
+
+    def configure(self, **kwargs: object) -> None:
+        """Configures logfire once per process.
+
+        Library modules never configure logfire on import, so entry points such as `main.py`
+        call this before doing any work. Later calls are ignored.
+
+        Args:
+            **kwargs (object): Keyword arguments passed to `logfire.configure`.
+        """
+        with self._lock:
+            if self._configured:
+                return
+            logfire.configure(**kwargs)
+            self._configured = True
+
+    def _metric(
+        self, name: str, factory: "Callable[..., Counter | Histogram]", **kwargs: str
+    ) -> "Counter | Histogram":
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics.setdefault(name, factory(name, **kwargs))
+        return metric
+
+    def counter(self, name: str, unit: str = "1") -> "Counter | _NullMetric":
+        if not self.enabled:
+            return _NULL_METRIC
+        return self._metric(name, logfire.metric_counter, unit=unit)
+
+    def histogram(self, name: str, unit: str = "1") -> "Histogram | _NullMetric":
+        if not self.enabled:
+            return _NULL_METRIC
+        return self._metric(name, logfire.metric_histogram, unit=unit)
+
+    def stage(self, name: str, source: str, **attributes: object) -> "_Stage | nullcontext[None]":
+        """Times a stage such as `request`, `parse`, `price_parse` or `model_build`.
+
+        Args:
+            name (str): Name of the stage.
+            source (str): The scraped site, e.g. `twrates` or `play_store`.
+            **attributes (object): Extra span attributes. They are kept off the metrics to
+                keep metric cardinality low.
+
+        Returns:
+            _Stage | nullcontext[None]: A context manager wrapping the stage.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Stage(self, name, source, attributes)
+
+
+class _NullMetric:
+    """Stands in for counters and histograms while telemetry is disabled."""
+
+    def add(self, *args: object, **kwargs: object) -> None:
+        pass
+
+    def record(self, *args: object, **kwargs: object) -> None:
+        pass
+
+
+_NULL_METRIC = _NullMetric()
+
+telemetry = Telemetry.from_env()
@@ -0,0 +1,280 @@
+import math
+import time
+import threading
+
+from pydantic import Field, BaseModel, PrivateAttr
+
+from src.lazy import lazy_import
+from src.telemetry import telemetry
+from src.typings.traffic import CircuitState, HostTrafficStats
+
+requests = lazy_import("requests")
+
+# Statuses telling the client to slow down or that the server is struggling.
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit of its host is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tells transient errors, worth retrying later, from permanent ones.
+
+    Open circuits, timeouts, dropped connections and HTTP errors with a status in
+    `RETRYABLE_STATUS` are retryable. Anything else, such as a 404 or a page without a price,
+    fails the same way when retried.
+
+    Example:
+        >>> is_retryable(CircuitOpenError("play.google.com", retry_in=30))
+        True
+        >>> is_retryable(ValueError("No price found"))
+        False
+    """
+    if isinstance(error, CircuitOpenError | TimeoutError | ConnectionError):
+        return True
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code in RETRYABLE_STATUS
+    return isinstance(error, requests.ConnectionError | requests.Timeout)
+
+
+class _HostTraffic:
+    """The token bucket and circuit breaker of one host."""
+
+    __slots__ = (
+        "failures",
+        "last_decrease",
+        "max_rate",
+        "next_slot",
+        "opened_at",
+        "probing",
+        "rate",
+        "rejected",
+        "requests",
+        "slow",
+        "slow_start",
+        "state",
+        "throttled",
+    )
+
+    def __init__(self, rate: float, max_rate: float):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.next_slot = 0.0
+        self.last_decrease = -math.inf
+        self.slow_start = True
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.requests = 0
+        self.throttled = 0
+        self.slow = 0
+        self.rejected = 0
+
+
+class TrafficController(BaseModel):
+    """Adaptive per-host rate limits and circuit breakers shared by every scraper.
+
+    Each host gets a token bucket whose rate follows AIMD, like TCP congestion control. A 429,
+    a 5xx, a timeout or a response slower than `target_latency` multiplies the rate by
+    `decrease_factor`, down to `min_rate` and at most once per `cooldown`, and a `Retry-After`
+    header pauses the host for as long as it asks. Healthy responses raise the rate up to
+    `max_rate`: until the host first pushes back, each one adds a request per second, which
+    about doubles the rate every second (slow start); afterwards the rate grows by `increase`
+    requests per second for every second of healthy traffic.
+
+    After `failure_threshold` retryable failures in a row the circuit of the host opens and
+    requests fail fast with `CircuitOpenError` instead of piling onto a host which blocks
+    them. After `reset_timeout` one probe is let through; its success closes the circuit.
+
+    Example:
+        >>> traffic = TrafficController()
+        >>> traffic.acquire("play.google.com")
+        >>> traffic.record("play.google.com", status_code=429)
+        >>> traffic.stats["play.google.com"].rate
+        5.0
+    """
+
+    initial_rate: float = Field(
+        default=10.0, title="Initial Rate", description="Requests per second of a new host", gt=0
+    )
+    min_rate: float = Field(
+        default=0.5, title="Min Rate", description="Lowest requests per second of a host", gt=0
+    )
+    max_rate: float = Field(
+        default=100.0,
+        title="Max Rate",
+        description="Highest requests per second of a host without an explicit limit",
+        gt=0,
+    )
+    burst: int = Field(
+        default=2, title="Burst", description="Requests a host may receive back to back", ge=1
+    )
+    increase: float = Field(
+        default=5.0,
+        title="Increase",
+        description="Requests per second added per second of healthy traffic",
+        ge=0,
+    )
+    decrease_factor: float = Field(
+        default=0.5,
+        title="Decrease Factor",
+        description="Factor applied to the rate when a host pushes back",
+        gt=0,
+        lt=1,
+    )
+    cooldown: float = Field(
+        default=1.0,
+        title="Cooldown",
+        description="Minimum seconds between two decreases, so one burst of 429s counts once",
+        ge=0,
+    )
+    target_latency: float = Field(
+        default=2.0,
+        title="Target Latency",
+        description="Response time in seconds above which a host counts as overloaded",
+        gt=0,
+    )
+    failure_threshold: int = Field(
+        default=5,
+        title="Failure Threshold",
+        description="Retryable failures in a row which open the circuit of a host",
+        ge=1,
+    )
+    reset_timeout: float = Field(
+        default=30.0,
+        title="Reset Timeout",
+        description="Seconds an open circuit fails fast before letting a probe through",
+        ge=0,
+    )
+
+    _hosts: dict[str, _HostTraffic] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _host(self, host: str) -> _HostTraffic:
+        if host not in self._hosts:
+            rate = min(self.initial_rate, self.max_rate)
+            self._hosts[host] = _HostTraffic(rate=rate, max_rate=self.max_rate)
+        return self._hosts[host]
+
+    def limit(self, host: str, max_rate: float) -> None:
+        """Caps the rate of `host` at `max_rate` requests per second, 0 removes every limit."""
+        with self._lock:
+            traffic = self._host(host)
+            traffic.max_rate = max_rate or math.inf
+            traffic.rate = min(traffic.rate, traffic.max_rate) if max_rate else math.inf
+
+    def acquire(self, host: str) -> None:
+        """Waits for a token of `host`.
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open, or half open with its probe
+                still in flight.
+        """
+        with self._lock:
+            traffic = self._host(host)
+            now = time.monotonic()
+            if traffic.state != "closed":
+                retry_in = traffic.opened_at + self.reset_timeout - now
+                if traffic.state == "open" and retry_in <= 0:
+                    traffic.state = "half_open"
+                elif traffic.state == "open" or traffic.probing:
+                    traffic.rejected += 1
+                    telemetry.counter("igpf.traffic.rejected").add(1, {"host": host})
+                    raise CircuitOpenError(host, retry_in=max(retry_in, 0.0))
+                traffic.probing = True
+            traffic.requests += 1
+            if math.isinf(traffic.rate):
+                return
+            interval = 1.0 / traffic.rate
+            slot = max(traffic.next_slot, now - (self.burst - 1) * interval)
+            traffic.next_slot = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def _decrease(self, traffic: _HostTraffic, now: float) -> None:
+        if math.isinf(traffic.rate) or now - traffic.last_decrease < self.cooldown:
+            return
+        traffic.rate = max(traffic.rate * self.decrease_factor, self.min_rate)
+        traffic.last_decrease = now
+        traffic.slow_start = False
+
+    def record(
+        self,
+        host: str,
+        status_code: int | None = None,
+        latency: float | None = None,
+        error: BaseException | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Adapts the rate and circuit of `host` to the outcome of one request.
+
+        Args:
+            host (str): Host and port the request went to.
+            status_code (int | None): Status of the response, None when there was none.
+            latency (float | None): Response time in seconds.
+            error (BaseException | None): Error raised instead of a response.
+            retry_after (float | None): Seconds the host asked to wait in `Retry-After`.
+        """
+        failed = status_code in RETRYABLE_STATUS or (error is not None and is_retryable(error))
+        with self._lock:
+            traffic = self._host(host)
+            now = time.monotonic()
+            traffic.probing = False
+            if failed:
+                traffic.throttled += 1
+                traffic.failures += 1
+                self._decrease(traffic, now)
+                if retry_after and not math.isinf(traffic.rate):
+                    traffic.next_slot = max(traffic.next_slot, now + retry_after)
+                if traffic.state == "half_open" or traffic.failures >= self.failure_threshold:
+                    traffic.state = "open"
+                    traffic.opened_at = now
+            elif error is not None:
+                # A request which raised never counts as a success, and an error which is not
+                # retryable says nothing about the load of the host, so nothing changes.
+                pass
+            else:
+                traffic.failures = 0
+                traffic.state = "closed"
+                if latency is not None and latency > self.target_latency:
+                    traffic.slow += 1
+                    self._decrease(traffic, now)
+                elif not math.isinf(traffic.rate):
+                    step = 1.0 if traffic.slow_start else self.increase / traffic.rate
+                    traffic.rate = min(traffic.rate + step, traffic.max_rate)
+        if failed:
+            telemetry.counter("igpf.traffic.throttled").add(1, {"host": host})
+
+    def throttle(self, host: str) -> None:
+        """Slows `host` down without counting a failure, e.g. for an attempt which was retried."""
+        with self._lock:
+            traffic = self._host(host)
+            traffic.throttled += 1
+            self._decrease(traffic, time.monotonic())
+        telemetry.counter("igpf.traffic.throttled").add(1, {"host": host})
+
+    @property
+    def stats(self) -> dict[str, HostTrafficStats]:
+        """Returns the current rate, circuit state and counters of every host seen."""
+        with self._lock:
+            return {
+                host: HostTrafficStats(
+                    host=host,
+                    state=traffic.state,
+                    rate=None if math.isinf(traffic.rate) else traffic.rate,
+                    requests=traffic.requests,
+                    throttled=traffic.throttled,
+                    slow=traffic.slow,
+                    rejected=traffic.rejected,
+                )
+                for host, traffic in self._hosts.items()
+            }
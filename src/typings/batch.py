@@ -0,0 +1,277 @@
+import math
+from typing import TYPE_CHECKING
+from collections.abc import Iterable
+
+import orjson
+
+from src.lazy import lazy_import
+from src.typings.game import GamePriceInfo
+from src.typings.currency_rate import CurrencyRate
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from pyarrow import Table
+
+np = lazy_import("numpy")
+pa = lazy_import("pyarrow")
+
+CARD_NETWORKS = ("jcb", "master", "visa")
+
+
+def _to_float(value: str | None) -> float:
+    if value is None:
+        return float("nan")
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return float("nan")
+
+
+def _to_date(value: str) -> str:
+    try:
+        np.datetime64(value, "D")
+    except ValueError:
+        return "NaT"
+    return value
+
+
+def _to_dates(values: list[str]) -> "ndarray":
+    """Parses ISO dates into `datetime64[D]`, NaT where a date cannot be parsed."""
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        return np.array([_to_date(value) for value in values], dtype="datetime64[D]")
+
+
+def _to_optional(values: "ndarray") -> list[float | None]:
+    return [None if math.isnan(value) else value for value in values.tolist()]
+
+
+class RateBatch:
+    """A columnar batch of currency rates with float card rates and parsed dates.
+
+    Card rates are `float64` arrays, NaN where a card has no rate, and update times are a
+    `datetime64[D]` array, so consumers never parse the scraped strings again. Batches convert
+    from and to `CurrencyRate` and serialize as a whole to columnar JSON or an Arrow table.
+
+    Example:
+        >>> batch = RateBatch.from_models(currency_rate_list)
+        >>> batch.currency_en, batch.visa
+        (['usd', 'jpy'], array([32.169,    nan]))
+        >>> RateBatch.from_json(batch.to_json()).to_models() == currency_rate_list
+        True
+    """
+
+    __slots__ = ("currency_cn", "currency_en", "jcb", "master", "updated_time", "visa")
+
+    def __init__(
+        self,
+        currency_en: list[str],
+        currency_cn: list[str],
+        jcb: "ndarray",
+        master: "ndarray",
+        visa: "ndarray",
+        updated_time: "ndarray",
+    ):
+        self.currency_en = currency_en
+        self.currency_cn = currency_cn
+        self.jcb = jcb
+        self.master = master
+        self.visa = visa
+        self.updated_time = updated_time
+
+    def __len__(self) -> int:
+        """Returns the number of currencies in the batch."""
+        return len(self.currency_en)
+
+    @classmethod
+    def from_models(cls, rates: Iterable[CurrencyRate | None]) -> "RateBatch":
+        """Builds a batch from models, skipping the None results of failed fetches."""
+        rates = [rate for rate in rates if rate is not None]
+        return cls(
+            currency_en=[rate.currency_en for rate in rates],
+            currency_cn=[rate.currency_cn for rate in rates],
+            jcb=np.array([_to_float(rate.jcb) for rate in rates], dtype=np.float64),
+            master=np.array([_to_float(rate.master) for rate in rates], dtype=np.float64),
+            visa=np.array([_to_float(rate.visa) for rate in rates], dtype=np.float64),
+            updated_time=_to_dates([rate.updated_time for rate in rates]),
+        )
+
+    def to_models(self) -> list[CurrencyRate]:
+        """Builds models without validating them again; missing rates become None."""
+        columns = [
+            [None if value is None else repr(value) for value in _to_optional(getattr(self, card))]
+            for card in CARD_NETWORKS
+        ]
+        dates = np.datetime_as_string(self.updated_time, unit="D")
+        return [
+            CurrencyRate.model_construct(
+                currency_en=currency_en,
+                currency_cn=currency_cn,
+                jcb=jcb,
+                master=master,
+                visa=visa,
+                updated_time="" if date == "NaT" else str(date),
+            )
+            for currency_en, currency_cn, jcb, master, visa, date in zip(
+                self.currency_en, self.currency_cn, *columns, dates, strict=True
+            )
+        ]
+
+    def to_json(self) -> bytes:
+        """Serializes the batch as one JSON object of columns, missing values as null."""
+        dates = np.datetime_as_string(self.updated_time, unit="D")
+        return orjson.dumps(
+            {
+                "currency_en": self.currency_en,
+                "currency_cn": self.currency_cn,
+                **{card: getattr(self, card) for card in CARD_NETWORKS},
+                "updated_time": [None if date == "NaT" else date for date in dates.tolist()],
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    @classmethod
+    def from_json(cls, content: bytes) -> "RateBatch":
+        columns = orjson.loads(content)
+        return cls(
+            currency_en=columns["currency_en"],
+            currency_cn=columns["currency_cn"],
+            **{card: np.array(columns[card], dtype=np.float64) for card in CARD_NETWORKS},
+            updated_time=np.array(columns["updated_time"], dtype="datetime64[D]"),
+        )
+
+    def to_arrow(self) -> "Table":
+        """Returns an Arrow table with `float64` card rates and a `date32` update time."""
+        return pa.table({
+            "currency_en": pa.array(self.currency_en, type=pa.string()),
+            "currency_cn": pa.array(self.currency_cn, type=pa.string()),
+            **{
+                card: pa.array(getattr(self, card), type=pa.float64(), from_pandas=True)
+                for card in CARD_NETWORKS
+            },
+            "updated_time": pa.array(self.updated_time, type=pa.date32(), from_pandas=True),
+        })
+
+    @classmethod
+    def from_arrow(cls, table: "Table") -> "RateBatch":
+        return cls(
+            currency_en=table.column("currency_en").to_pylist(),
+            currency_cn=table.column("currency_cn").to_pylist(),
+            **{card: table.column(card).to_numpy().astype(np.float64) for card in CARD_NETWORKS},
+            updated_time=table.column("updated_time").to_numpy().astype("datetime64[D]"),
+        )
+
+
+class PriceBatch:
+    """A columnar batch of price ranges with `float64` lowest and highest prices.
+
+    Missing prices are NaN. Batches convert from and to `GamePriceInfo` and serialize as a
+    whole to columnar JSON or an Arrow table, without a `model_dump()` per row.
+
+    Example:
+        >>> batch = PriceBatch.from_models(game_price_list)
+        >>> batch.country, batch.highest
+        (['us', 'jp'], array([   99.99, 15800.  ]))
+        >>> PriceBatch.from_arrow(batch.to_arrow()).to_models() == game_price_list
+        True
+    """
+
+    __slots__ = ("country", "error", "highest", "lowest", "name", "retryable")
+
+    def __init__(
+        self,
+        name: list[str | None],
+        country: list[str],
+        lowest: "ndarray",
+        highest: "ndarray",
+        error: list[str | None],
+        retryable: list[bool | None],
+    ):
+        self.name = name
+        self.country = country
+        self.lowest = lowest
+        self.highest = highest
+        self.error = error
+        self.retryable = retryable
+
+    def __len__(self) -> int:
+        """Returns the number of price ranges in the batch."""
+        return len(self.country)
+
+    @classmethod
+    def from_models(cls, prices: Iterable[GamePriceInfo]) -> "PriceBatch":
+        prices = list(prices)
+        return cls(
+            name=[price.name for price in prices],
+            country=[price.country for price in prices],
+            lowest=np.array([price.lowest for price in prices], dtype=np.float64),
+            highest=np.array([price.highest for price in prices], dtype=np.float64),
+            error=[price.error for price in prices],
+            retryable=[price.retryable for price in prices],
+        )
+
+    def to_models(self) -> list[GamePriceInfo]:
+        """Builds models without validating them again; NaN prices become None."""
+        lowest, highest = _to_optional(self.lowest), _to_optional(self.highest)
+        return [
+            GamePriceInfo.model_construct(
+                name=name,
+                country=country,
+                lowest=low,
+                highest=high,
+                error=error,
+                retryable=retryable,
+            )
+            for name, country, low, high, error, retryable in zip(
+                self.name, self.country, lowest, highest, self.error, self.retryable, strict=True
+            )
+        ]
+
+    def to_json(self) -> bytes:
+        """Serializes the batch as one JSON object of columns, missing prices as null."""
+        return orjson.dumps(
+            {
+                "name": self.name,
+                "country": self.country,
+                "lowest": self.lowest,
+                "highest": self.highest,
+                "error": self.error,
+                "retryable": self.retryable,
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    @classmethod
+    def from_json(cls, content: bytes) -> "PriceBatch":
+        columns = orjson.loads(content)
+        return cls(
+            name=columns["name"],
+            country=columns["country"],
+            lowest=np.array(columns["lowest"], dtype=np.float64),
+            highest=np.array(columns["highest"], dtype=np.float64),
+            error=columns["error"],
+            retryable=columns["retryable"],
+        )
+
+    def to_arrow(self) -> "Table":
+        """Returns an Arrow table with nullable `float64` lowest and highest prices."""
+        return pa.table({
+            "name": pa.array(self.name, type=pa.string()),
+            "country": pa.array(self.country, type=pa.string()),
+            "lowest": pa.array(self.lowest, type=pa.float64(), from_pandas=True),
+            "highest": pa.array(self.highest, type=pa.float64(), from_pandas=True),
+            "error": pa.array(self.error, type=pa.string()),
+            "retryable": pa.array(self.retryable, type=pa.bool_()),
+        })
+
+    @classmethod
+    def from_arrow(cls, table: "Table") -> "PriceBatch":
+        return cls(
+            name=table.column("name").to_pylist(),
+            country=table.column("country").to_pylist(),
+            lowest=table.column("lowest").to_numpy().astype(np.float64),
+            highest=table.column("highest").to_numpy().astype(np.float64),
+            error=table.column("error").to_pylist(),
+            retryable=table.column("retryable").to_pylist(),
+        )
@@ -0,0 +1,31 @@
+from pydantic import Field, BaseModel, computed_field
+
+
+class CacheStats(BaseModel):
+    hits: int = Field(default=0, title="Hits", description="Fresh entries served from cache")
+    stale_hits: int = Field(
+        default=0,
+        title="Stale Hits",
+        description="Stale entries served while being revalidated in the background",
+    )
+    misses: int = Field(default=0, title="Misses", description="Lookups which had to fetch")
+    coalesced: int = Field(
+        default=0,
+        title="Coalesced",
+        description="Misses which waited for the fetch of a concurrent miss of the same key",
+    )
+    disk_hits: int = Field(
+        default=0, title="Disk Hits", description="Lookups answered by the on-disk tier"
+    )
+    refreshes: int = Field(
+        default=0, title="Refreshes", description="Background revalidations started"
+    )
+    evictions: int = Field(
+        default=0, title="Evictions", description="Entries evicted from the memory tier"
+    )
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
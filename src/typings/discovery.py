@@ -0,0 +1,20 @@
+from pydantic import Field, BaseModel
+
+
+class DiscoveryReport(BaseModel):
+    path: str = Field(..., title="Path", description="Game list the hits were merged into")
+    queries: int = Field(default=0, title="Queries", description="Search terms which were run")
+    failed: dict[str, str] = Field(
+        default={},
+        title="Failed",
+        description="Error of every search term which failed, by term",
+        examples=[{"天堂": "HTTPError: 429 Too Many Requests"}],
+    )
+    hits: int = Field(
+        default=0, title="Hits", description="Distinct package IDs found by the searches"
+    )
+    added: int = Field(default=0, title="Added", description="Games appended to the game list")
+    known: int = Field(
+        default=0, title="Known", description="Hits already in the game list and left untouched"
+    )
+    elapsed: float = Field(default=0.0, title="Elapsed", description="Seconds the run took")
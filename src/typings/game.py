@@ -18,10 +18,47 @@ class GameInfo(BaseModel):
         examples=["天堂W"],
         deprecated=False,
     )
+    id: int | None = Field(
+        default=None,
+        title="ID",
+        description="Stable ID of the game in the game list",
+        examples=[1],
+        deprecated=False,
+    )
 
 
 class GamePriceInfo(BaseModel):
     name: str | None
     country: str
-    lowest: float
-    highest: float
+    lowest: float | None = Field(
+        default=None, title="Lowest", description="Lowest price, None when it is unknown"
+    )
+    highest: float | None = Field(
+        default=None, title="Highest", description="Highest price, None when it is unknown"
+    )
+    error: str | None = Field(
+        default=None,
+        title="Error",
+        description="Why the price range could not be fetched or parsed, None on success",
+        examples=["PriceParseError: No price found: '免費'"],
+    )
+    retryable: bool | None = Field(
+        default=None,
+        title="Retryable",
+        description="Whether the error is transient, such as a 429 or a timeout, None on success",
+    )
+
+
+class GameSnapshot(BaseModel):
+    game_id: str = Field(..., title="Package ID", description="Package ID from play store")
+    country: str = Field(..., title="Country", description="Play store country code")
+    price: str | None = Field(
+        default=None,
+        title="In-App Product Price",
+        description="Raw `inAppProductPrice` string, None when the app sells nothing",
+        examples=["每個項目 US$0.99 - US$99.99"],
+    )
+    updated: int | None = Field(
+        default=None, title="Updated", description="Last update of the app as a UNIX timestamp"
+    )
+    version: str | None = Field(default=None, title="Version", description="App version")
@@ -0,0 +1,71 @@
+from typing import Literal
+
+from pydantic import Field, BaseModel
+
+from src.typings.game import GamePriceInfo
+
+
+class GameFingerprint(BaseModel):
+    updated: int | None = Field(
+        default=None, title="Updated", description="Last update of the app as a UNIX timestamp"
+    )
+    version: str | None = Field(default=None, title="Version", description="App version")
+    price_hash: str | None = Field(
+        default=None,
+        title="Price Hash",
+        description="Hash of the `inAppProductPrice` string of the reference country",
+    )
+
+
+class GameState(BaseModel):
+    game_id: str = Field(..., title="Package ID", description="Package ID from play store")
+    name: str | None = Field(default=None, title="Game Name", description="Game name")
+    fingerprint: GameFingerprint = Field(
+        default_factory=GameFingerprint,
+        title="Fingerprint",
+        description="Fingerprint of the reference country page at the last probe",
+    )
+    prices: dict[str, tuple[float, float]] = Field(
+        default={},
+        title="Prices",
+        description="Lowest and highest price by country at the last sweep",
+    )
+    countries: list[str] = Field(
+        default=[], title="Countries", description="Countries covered by the last sweep"
+    )
+    checked_at: float = Field(
+        default=0.0, title="Checked At", description="UNIX time of the last probe"
+    )
+    swept_at: float = Field(
+        default=0.0, title="Swept At", description="UNIX time of the last full sweep"
+    )
+
+
+class PriceDelta(BaseModel):
+    kind: Literal["new", "changed", "removed"] = Field(
+        ..., title="Kind", description="How the price range differs from the previous run"
+    )
+    game_id: str = Field(..., title="Package ID", description="Package ID from play store")
+    name: str | None = Field(default=None, title="Game Name", description="Game name")
+    country: str = Field(..., title="Country", description="Play store country code")
+    lowest: float | None = Field(default=None, title="Lowest", description="Current lowest")
+    highest: float | None = Field(default=None, title="Highest", description="Current highest")
+    previous_lowest: float | None = Field(
+        default=None, title="Previous Lowest", description="Lowest price of the previous run"
+    )
+    previous_highest: float | None = Field(
+        default=None, title="Previous Highest", description="Highest price of the previous run"
+    )
+
+
+class RefreshResult(BaseModel):
+    deltas: list[PriceDelta] = Field(
+        default=[], title="Deltas", description="New, changed and removed price ranges"
+    )
+    prices: list[GamePriceInfo] = Field(
+        default=[], title="Prices", description="Current price ranges of the requested games"
+    )
+    probed: int = Field(default=0, title="Probed", description="Games probed in this run")
+    swept: int = Field(default=0, title="Swept", description="Games which were refetched")
+    requests: int = Field(default=0, title="Requests", description="Detail pages fetched")
+    failed: int = Field(default=0, title="Failed", description="Probes which failed")
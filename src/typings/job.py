@@ -0,0 +1,129 @@
+from typing import Literal
+from pathlib import Path
+
+import orjson
+from pydantic import Field, BaseModel
+
+from src.typings.game import GamePriceInfo
+from src.typings.traffic import FetchFailure
+from src.typings.incremental import PriceDelta
+from src.typings.currency_rate import CurrencyRate
+
+CardNetwork = Literal["jcb", "master", "visa"]
+SinkFormat = Literal["jsonl", "csv", "parquet", "xlsx"]
+
+
+class SinkSpec(BaseModel):
+    format: SinkFormat = Field(
+        default="jsonl",
+        title="Format",
+        description="Output format, one of `jsonl`, `csv`, `parquet` or `xlsx`",
+    )
+    path: str = Field(
+        default="./data/output",
+        title="Path",
+        description="Directory receiving `currency_rate.<format>` and `game_price.<format>`",
+    )
+
+
+class JobSpec(BaseModel):
+    """A batch job: which currencies and games to fetch, and where to write the results.
+
+    Example:
+        >>> spec = JobSpec.from_file("./configs/job.yaml")
+        >>> spec.model_dump()
+        {'games': ['天堂W', 'com.gamania.lineagem'], 'countries': ['us', 'jp', 'tr'], 'currencies': ['auto'], 'cards': ['jcb', 'master', 'visa'], 'sink': {'format': 'jsonl', 'path': './data/output'}, 'max_in_flight': 8, 'max_workers': 8, 'lang': 'zh-TW', 'incremental': False, 'state_path': './.cache/igpf/fingerprints.json', 'history': None}
+    """
+
+    games: list[str] = Field(
+        default=[],
+        title="Games",
+        description="Package IDs or game names from the game list, `all` for every game",
+        examples=[["com.ncsoft.lineagew", "天堂M"]],
+    )
+    countries: list[str] = Field(
+        default=["us"],
+        title="Countries",
+        description="Play store country codes or names to fetch every game in",
+        examples=[["us", "jp", "tr"]],
+    )
+    currencies: list[str] = Field(
+        default=[],
+        title="Currencies",
+        description=(
+            "twrates currency names to fetch, `auto` fetches the currencies of `countries` "
+            "once each, `all` fetches every listed currency"
+        ),
+        examples=[["usd", "jpy"], ["auto"], ["all"]],
+    )
+    cards: list[CardNetwork] = Field(
+        default=["jcb", "master", "visa"],
+        title="Cards",
+        description="Card networks kept in the currency rate output",
+    )
+    sink: SinkSpec = Field(
+        default_factory=SinkSpec, title="Sink", description="Where the results are written"
+    )
+    max_in_flight: int = Field(
+        default=8,
+        title="Max In-Flight Requests",
+        description="Maximum number of play store pages fetched at the same time",
+        ge=1,
+    )
+    max_workers: int = Field(
+        default=8,
+        title="Max Workers",
+        description="Maximum number of twrates pages fetched at the same time",
+        ge=1,
+    )
+    lang: str = Field(default="zh-TW", title="Language", description="Play store language")
+    incremental: bool = Field(
+        default=False,
+        title="Incremental",
+        description="Only refetch games whose play store page changed since the last run",
+    )
+    state_path: str = Field(
+        default="./.cache/igpf/fingerprints.json",
+        title="State Path",
+        description="Fingerprints and prices kept between incremental runs",
+    )
+    history: str | None = Field(
+        default=None,
+        title="History",
+        description="Root of the Parquet history the results are appended to, None skips it",
+        examples=["./data/history"],
+    )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "JobSpec":
+        """Loads a job spec from a YAML or JSON file."""
+        path = Path(path)
+        content = path.read_bytes()
+        if path.suffix in {".yaml", ".yml"}:
+            import yaml
+
+            return cls.model_validate(yaml.safe_load(content) or {})
+        return cls.model_validate(orjson.loads(content))
+
+
+class JobResult(BaseModel):
+    currency_rates: list[CurrencyRate] = Field(
+        default=[], title="Currency Rates", description="Fetched currency rates"
+    )
+    game_prices: list[GamePriceInfo] = Field(
+        default=[], title="Game Prices", description="Fetched game price ranges"
+    )
+    price_deltas: list[PriceDelta] = Field(
+        default=[],
+        title="Price Deltas",
+        description="Price ranges which changed since the last run, in incremental mode",
+    )
+    failures: list[FetchFailure] = Field(
+        default=[],
+        title="Failures",
+        description="Currency pages which failed; failed price ranges are in `game_prices`",
+    )
+    elapsed: float = Field(default=0.0, title="Elapsed", description="Wall clock seconds")
+    outputs: list[str] = Field(
+        default=[], title="Outputs", description="Files written by the sink"
+    )
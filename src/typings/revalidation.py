@@ -0,0 +1,44 @@
+from pydantic import Field, BaseModel, JsonValue
+
+
+class PageEntry(BaseModel):
+    url: str = Field(..., title="URL", description="URL of the page")
+    etag: str | None = Field(
+        default=None, title="ETag", description="ETag validator of the last full response"
+    )
+    last_modified: str | None = Field(
+        default=None,
+        title="Last Modified",
+        description="Last-Modified validator of the last full response",
+    )
+    size: int = Field(default=0, title="Size", description="Bytes of the last full response")
+    parsed: dict[str, JsonValue] = Field(
+        default={},
+        title="Parsed",
+        description="Results parsed from the last full response, by parser",
+    )
+    versions: dict[str, str] = Field(
+        default={},
+        title="Versions",
+        description="Version of the parser each result was parsed with, by parser",
+    )
+
+
+class RevalidationStats(BaseModel):
+    requests: int = Field(default=0, title="Requests", description="Page requests sent")
+    not_modified: int = Field(
+        default=0,
+        title="Not Modified",
+        description="Requests answered 304, whose stored result was reused",
+    )
+    reused: int = Field(
+        default=0,
+        title="Reused",
+        description="Lookups answered by a response of the same run, without a request",
+    )
+    parses: int = Field(default=0, title="Parses", description="Pages parsed")
+    bytes_saved: int = Field(
+        default=0,
+        title="Bytes Saved",
+        description="Bytes of the full responses which were not downloaded again",
+    )
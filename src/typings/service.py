@@ -0,0 +1,39 @@
+from pydantic import Field, BaseModel
+
+from src.typings.cache import CacheStats
+from src.typings.transport import TransportStats
+
+
+class EndpointStats(BaseModel):
+    requests: int = Field(default=0, title="Requests", description="Requests served")
+    errors: int = Field(default=0, title="Errors", description="Requests answered with an error")
+    throughput_per_s: float = Field(
+        default=0.0, title="Throughput", description="Requests per second since the start"
+    )
+    p50_ms: float = Field(
+        default=0.0, title="p50", description="Median latency of the recent requests"
+    )
+    p95_ms: float = Field(
+        default=0.0, title="p95", description="95th percentile latency of the recent requests"
+    )
+    max_ms: float = Field(
+        default=0.0, title="Max", description="Highest latency of the recent requests"
+    )
+
+
+class ServiceMetrics(BaseModel):
+    uptime_s: float = Field(default=0.0, title="Uptime", description="Seconds since the start")
+    refreshes: int = Field(
+        default=0, title="Refreshes", description="Background refresh passes completed"
+    )
+    endpoints: dict[str, EndpointStats] = Field(
+        default={}, title="Endpoints", description="Latency and throughput by endpoint"
+    )
+    cache: CacheStats | None = Field(
+        default=None, title="Cache", description="Statistics of the shared result cache"
+    )
+    transport: TransportStats = Field(
+        default_factory=TransportStats,
+        title="Transport",
+        description="Statistics of the shared HTTP client",
+    )
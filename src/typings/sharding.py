@@ -0,0 +1,17 @@
+from pydantic import Field, BaseModel
+
+
+class ShardReport(BaseModel):
+    index: int = Field(..., title="Index", description="Index of the shard, from 0")
+    shards: int = Field(..., title="Shards", description="Total number of shards")
+    path: str = Field(..., title="Path", description="Partial result file of the shard")
+    games: int = Field(default=0, title="Games", description="Games assigned to the shard")
+    resumed: int = Field(
+        default=0,
+        title="Resumed",
+        description="Pairs already fetched by a previous run of the shard and skipped",
+    )
+    fetched: int = Field(default=0, title="Fetched", description="Pairs fetched in this run")
+    failed: int = Field(
+        default=0, title="Failed", description="Pairs which failed and are retried on resume"
+    )
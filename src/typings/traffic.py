@@ -0,0 +1,53 @@
+from typing import Literal
+
+from pydantic import Field, BaseModel
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class HostTrafficStats(BaseModel):
+    host: str = Field(..., title="Host", description="Host and port the stats belong to")
+    state: CircuitState = Field(
+        default="closed",
+        title="Circuit State",
+        description="`open` fails requests fast, `half_open` lets one probe through",
+    )
+    rate: float | None = Field(
+        default=None,
+        title="Rate",
+        description="Current requests per second allowed, None when the host is unlimited",
+    )
+    requests: int = Field(default=0, title="Requests", description="Requests let through")
+    throttled: int = Field(
+        default=0,
+        title="Throttled",
+        description="Responses and errors which slowed the host down, e.g. 429, 5xx or timeouts",
+    )
+    slow: int = Field(
+        default=0, title="Slow", description="Responses slower than the target latency"
+    )
+    rejected: int = Field(
+        default=0, title="Rejected", description="Requests failed fast by the open circuit"
+    )
+
+
+class FetchFailure(BaseModel):
+    source: str = Field(..., title="Source", description="Scraped site", examples=["twrates"])
+    key: str = Field(
+        ...,
+        title="Key",
+        description="What failed to be fetched",
+        examples=["usd", "currency_list"],
+    )
+    url: str = Field(..., title="URL", description="URL of the page which failed")
+    error: str = Field(
+        ...,
+        title="Error",
+        description="Type and message of the error",
+        examples=["HTTPError: 503 Server Error"],
+    )
+    retryable: bool = Field(
+        ...,
+        title="Retryable",
+        description="Whether the error is transient, such as a 429, a 5xx or a timeout",
+    )
@@ -0,0 +1,17 @@
+from pydantic import Field, BaseModel, computed_field
+
+
+class TransportStats(BaseModel):
+    requests: int = Field(default=0, title="Requests", description="Number of requests sent")
+    connections_opened: int = Field(
+        default=0, title="Connections Opened", description="Number of TCP connections opened"
+    )
+    retries: int = Field(default=0, title="Retries", description="Number of retried requests")
+    bytes_received: int = Field(
+        default=0, title="Bytes Received", description="Decoded response bytes received"
+    )
+
+    @computed_field
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
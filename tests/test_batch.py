@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.pricing import PricePipeline
+from src.typings.game import GamePriceInfo
+from src.typings.batch import RateBatch, PriceBatch
+from src.typings.currency_rate import CurrencyRate
+
+RATES = [
+    CurrencyRate(
+        currency_en="usd",
+        currency_cn="美金",
+        JCB="32.137",
+        萬事達="32.189",
+        VISA="32.169",
+        updated_time="2024-09-12",
+    ),
+    CurrencyRate(
+        currency_en="jpy",
+        currency_cn="日圓",
+        JCB="0.2241",
+        萬事達="0.2245",
+        VISA=None,
+        updated_time="2024-09-12",
+    ),
+]
+PRICES = [
+    GamePriceInfo(name="天堂W", country="us", lowest=0.99, highest=99.99),
+    GamePriceInfo(name="天堂W", country="jp", lowest=160, highest=15800),
+    GamePriceInfo(name="天堂M", country="us", error="PriceParseError: No price found: '免費'"),
+]
+
+
+def test_rate_batch_parses_rates_and_dates():
+    broken = CurrencyRate(currency_en="krw", currency_cn="韓元", JCB="1,234.5", updated_time="?")
+    batch = RateBatch.from_models([*RATES, None, broken])
+    assert len(batch) == 3
+    assert batch.jcb.tolist() == [32.137, 0.2241, 1234.5]
+    assert math.isnan(batch.visa[1])
+    assert batch.updated_time.dtype == np.dtype("datetime64[D]")
+    assert np.isnat(batch.updated_time[2])
+
+
+@pytest.mark.parametrize("codec", ["json", "arrow"])
+def test_rate_batch_round_trip(codec: str):
+    batch = RateBatch.from_models(RATES)
+    if codec == "json":
+        restored = RateBatch.from_json(batch.to_json())
+    else:
+        restored = RateBatch.from_arrow(batch.to_arrow())
+    assert restored.to_models() == RATES
+
+
+@pytest.mark.parametrize("codec", ["json", "arrow"])
+def test_price_batch_round_trip(codec: str):
+    batch = PriceBatch.from_models(PRICES)
+    if codec == "json":
+        restored = PriceBatch.from_json(batch.to_json())
+    else:
+        table = batch.to_arrow()
+        assert table.column("lowest").null_count == 1
+        restored = PriceBatch.from_arrow(table)
+    assert restored.to_models() == PRICES
+
+
+def test_pipeline_accepts_batches():
+    pipeline = PricePipeline()
+    from_models = pipeline.convert(prices=PRICES, rates=RATES)
+    from_batches = pipeline.convert(
+        prices=PriceBatch.from_models(PRICES), rates=RateBatch.from_models(RATES)
+    )
+    assert from_batches.equals(from_models)
+    assert len(from_batches) == 3 + 2
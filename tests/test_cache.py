@@ -0,0 +1,91 @@
+import time
+import threading
+
+from benchmarks.stub_server import TwratesStub
+
+from src.cache import ResultCache
+from src.currency_core import CurrencyCore
+
+CURRENCIES = {
+    "usd": ("美金", {"JCB": "32.137", "萬事達": "32.189", "VISA": "32.169"}),
+    "jpy": ("日圓", {"JCB": "0.2241", "萬事達": "0.2245", "VISA": "0.2243"}),
+}
+
+
+def test_persistent_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    calls = []
+    cache = ResultCache(path=path)
+    assert cache.get_or_fetch("currency_rate", "usd", fetch=lambda: calls.append(1) or [1]) == [1]
+    assert cache.get_or_fetch("currency_rate", "usd", fetch=lambda: calls.append(1) or [2]) == [1]
+    cache.close()
+
+    reopened = ResultCache(path=path)
+    assert reopened.get("currency_rate", "usd") == [1]
+    assert len(calls) == 1
+    assert reopened.stats.disk_hits == 1
+
+
+def test_stale_while_revalidate():
+    cache = ResultCache(path=None, ttls={"game_price": 0}, stale_ttl=60)
+    cache.set("game_price", "com.ncsoft.lineagew:us", {"lowest": 0.99})
+    value = cache.get_or_fetch(
+        "game_price", "com.ncsoft.lineagew:us", fetch=lambda: {"lowest": 1.99}
+    )
+    cache.close()
+    assert value == {"lowest": 0.99}
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.refreshes == 1
+    cache.ttls["game_price"] = 60
+    assert cache.get("game_price", "com.ncsoft.lineagew:us") == {"lowest": 1.99}
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = ResultCache(path=None)
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def fetch() -> dict[str, float]:
+        calls.append(1)
+        time.sleep(0.2)
+        return {"lowest": 0.99}
+
+    def lookup() -> None:
+        barrier.wait()
+        results.append(cache.get_or_fetch("game_price", "com.ncsoft.lineagew:us", fetch=fetch))
+
+    results: list[dict[str, float]] = []
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"lowest": 0.99}] * 8
+    assert len(calls) == 1
+    assert (cache.stats.misses, cache.stats.coalesced) == (1, 7)
+
+
+def test_invalidate_and_evict():
+    cache = ResultCache(path=None, max_entries=2)
+    for key in ["usd", "jpy", "krw"]:
+        cache.set("currency_rate", key, key)
+    assert cache.get("currency_rate", "usd") is None
+    assert cache.stats.evictions == 1
+    cache.invalidate("currency_rate", "jpy")
+    assert cache.get("currency_rate", "jpy") is None
+    assert cache.get("currency_rate", "krw") == "krw"
+    cache.invalidate()
+    assert cache.get("currency_rate", "krw") is None
+
+
+def test_repeat_run_skips_network(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with TwratesStub(currencies=CURRENCIES) as stub:
+        first = CurrencyCore(base_url=stub.base_url, cache=ResultCache(path=path))
+        first.fetch_currency_rates(currency_name_en="all")
+        requests_sent = sum(stub.hits.values())
+        second = CurrencyCore(base_url=stub.base_url, cache=ResultCache(path=path))
+        results = second.fetch_currency_rates(currency_name_en="all")
+    assert sum(stub.hits.values()) == requests_sent
+    assert sorted(result.currency_en for result in results) == ["jpy", "usd"]
+    assert second.cache.stats.misses == 0
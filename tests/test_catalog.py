@@ -0,0 +1,62 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
+from src.catalog import GameCatalog
+from src.ingame_price import GameInfoUpdater
+
+GAME_LIST = [
+    {"packageId": "com.ncsoft.lineagew", "name": "天堂W", "id": 1},
+    {"packageId": "com.gamania.lineagem", "name": "天堂M", "id": 2},
+    {"packageId": "com.sandboxol.blockymods", "name": "Blockman Go", "id": 435},
+]
+
+
+def write_game_list(path, game_list, mtime_ns=None):
+    path.write_bytes(orjson.dumps(game_list))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_lookup_and_search(tmp_path):
+    path = tmp_path / "gameList.json"
+    write_game_list(path, GAME_LIST)
+    catalog = GameCatalog(path=str(path))
+    assert catalog.get("com.ncsoft.lineagew").game_name == "天堂W"
+    assert catalog.get_by_id(435).game_id == "com.sandboxol.blockymods"
+    assert catalog.get("com.unknown") is None
+    assert [game.id for game in catalog.search("天堂")] == [1, 2]
+    assert [game.id for game in catalog.search("W")] == [1]
+    assert [game.id for game in catalog.search("blockman")] == [435]
+    assert [game.id for game in catalog.search_prefix("天")] == [2, 1]
+    assert catalog.search("天堂X") == []
+
+
+def test_reload_on_change(tmp_path):
+    path = tmp_path / "gameList.json"
+    write_game_list(path, GAME_LIST, mtime_ns=1_000_000_000)
+    catalog = GameCatalog(path=str(path))
+    assert len(catalog.games) == 3
+    write_game_list(path, GAME_LIST[:1], mtime_ns=2_000_000_000)
+    assert len(catalog.games) == 1
+    assert catalog.get("com.gamania.lineagem") is None
+
+
+def test_game_info_list_filter(tmp_path):
+    path = tmp_path / "gameList.json"
+    write_game_list(path, GAME_LIST)
+    catalog = GameCatalog(path=str(path))
+    by_name = GameInfoUpdater(game_name="天堂M", country="us", catalog=catalog)
+    assert [game.id for game in by_name.game_info_list] == [2]
+    by_id = GameInfoUpdater(game_id="com.sandboxol.blockymods", country="us", catalog=catalog)
+    assert [game.id for game in by_id.game_info_list] == [435]
+
+
+def test_shared_catalog_is_created_once(tmp_path):
+    path = tmp_path / "gameList.json"
+    write_game_list(path, GAME_LIST)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        catalogs = list(executor.map(lambda _: GameCatalog.shared(str(path)), range(32)))
+    assert all(catalog is catalogs[0] for catalog in catalogs)
+    assert len(catalogs[0].games) == 3
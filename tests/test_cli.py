@@ -0,0 +1,162 @@
+from pathlib import Path
+
+import orjson
+import pandas as pd
+import pytest
+from benchmarks.stub_server import TwratesStub, ReplayServer
+
+from src.cli import JobRunner, main, load_spec, build_parser
+from src.cache import ResultCache
+from src.http_client import HttpClient
+from src.typings.job import JobSpec, SinkSpec
+from src.fetch_engine import GameFetchEngine
+from src.currency_core import CurrencyCore
+
+
+def build_runner(stub: ReplayServer, spec: JobSpec) -> JobRunner:
+    client = HttpClient()
+    cache = ResultCache(path=None)
+    return JobRunner(
+        spec=spec,
+        currency_core=CurrencyCore(base_url=stub.base_url, client=client, cache=cache),
+        engine=GameFetchEngine(
+            client=client, cache=cache, rate_limit=0, detail_url=stub.detail_url
+        ),
+    )
+
+
+@pytest.mark.parametrize("sink_format", ["jsonl", "csv", "parquet", "xlsx"])
+def test_job_runner(tmp_path: Path, sink_format: str):
+    spec = JobSpec(
+        games=["天堂W", "com.gamania.lineagem"],
+        countries=["us", "jp"],
+        currencies=["usd", "jpy"],
+        cards=["visa"],
+        sink=SinkSpec(format=sink_format, path=str(tmp_path)),
+    )
+    progress = {"currency": [0, 0], "game": [0, 0]}
+
+    def advance(kind: str):
+        def update(completed: int, total: int | None) -> None:
+            progress[kind][0] += completed
+            if total is not None:
+                progress[kind][1] = total
+
+        return update
+
+    with ReplayServer() as stub:
+        runner = build_runner(stub, spec)
+        result = runner.run(currency_advance=advance("currency"), game_advance=advance("game"))
+    assert sorted(rate.currency_en for rate in result.currency_rates) == ["jpy", "usd"]
+    assert len(result.game_prices) == 4
+    assert progress == {"currency": [2, 2], "game": [4, 4]}
+    assert runner.engine.client is runner.currency_core.client
+
+    rate_path = tmp_path / f"currency_rate.{sink_format}"
+    if sink_format == "jsonl":
+        rates = [orjson.loads(line) for line in rate_path.read_bytes().splitlines()]
+    elif sink_format == "parquet":
+        rates = pd.read_parquet(rate_path).to_dict(orient="records")
+    elif sink_format == "csv":
+        rates = pd.read_csv(rate_path, encoding="utf-8-sig").to_dict(orient="records")
+    else:
+        rates = pd.read_excel(rate_path).to_dict(orient="records")
+    assert len(rates) == 2
+    assert list(rates[0]) == ["currency_en", "currency_cn", "visa", "updated_time"]
+    assert (tmp_path / f"game_price.{sink_format}").exists()
+
+
+def test_unknown_game():
+    runner = JobRunner(spec=JobSpec(games=["not a game"]))
+    with pytest.raises(ValueError, match="not a game"):
+        runner.resolve_games()
+
+
+def test_load_spec(tmp_path: Path):
+    job = tmp_path / "job.json"
+    job.write_bytes(orjson.dumps({"games": ["天堂W"], "sink": {"format": "parquet"}}))
+    args = build_parser().parse_args(["run", str(job), "--countries", "jp", "--output", "out"])
+    spec = load_spec(args)
+    assert spec.games == ["天堂W"]
+    assert spec.countries == ["jp"]
+    assert spec.sink == SinkSpec(format="parquet", path="out")
+
+
+def test_main_without_work(tmp_path: Path):
+    assert main(["run", "--output", str(tmp_path), "--no-cache", "--no-progress"]) == 0
+    assert (tmp_path / "currency_rate.jsonl").read_bytes() == b""
+
+
+def test_main_sweep_merge(tmp_path: Path):
+    workdir = tmp_path / "shards"
+    workdir.mkdir()
+    record = {"game_id": "com.ncsoft.lineagew", "name": "天堂W", "country": "jp"}
+    record.update({"lowest": 160.0, "highest": 15800.0, "error": None, "retryable": None})
+    (workdir / "shard-000-of-001.jsonl").write_bytes(orjson.dumps(record) + b"\n")
+    argv = ["sweep", "--countries", "Japan", "--shards", "1", "--merge"]
+    assert main([*argv, "--workdir", str(workdir), "--output", str(tmp_path)]) == 0
+    prices = [
+        orjson.loads(line) for line in (tmp_path / "game_price.jsonl").read_bytes().splitlines()
+    ]
+    assert prices == [
+        {
+            "name": "天堂W",
+            "country": "jp",
+            "lowest": 160.0,
+            "highest": 15800.0,
+            "error": None,
+            "retryable": None,
+        }
+    ]
+
+
+def test_main_discover_needs_terms(tmp_path: Path):
+    with pytest.raises(ValueError, match="Nothing to search"):
+        main(["discover", "--game-list", str(tmp_path / "gameList.json")])
+
+
+def test_incremental_job(tmp_path: Path):
+    spec = JobSpec(
+        games=["天堂W"],
+        countries=["us", "jp"],
+        incremental=True,
+        state_path=str(tmp_path / "fingerprints.json"),
+        sink=SinkSpec(path=str(tmp_path)),
+    )
+    with ReplayServer() as stub:
+        first = build_runner(stub, spec).run()
+        second = build_runner(stub, spec).run()
+    assert [delta.kind for delta in first.price_deltas] == ["new", "new"]
+    assert second.price_deltas == []
+    assert len(second.game_prices) == 2
+    assert (tmp_path / "game_price_delta.jsonl").read_bytes() == b""
+
+
+def test_resolve_currencies():
+    spec = JobSpec(countries=["us", "Ecuador", "tw", "de", "fr"], currencies=["auto", "jpy"])
+    runner = JobRunner(spec=spec)
+    assert runner.resolve_countries() == ["us", "ec", "tw", "de", "fr"]
+    assert runner.resolve_currencies() == ["jpy", "usd", "eur"]
+
+
+def test_currency_progress_counts_failures():
+    currencies = {
+        "usd": ("美金", {"JCB": "32.137", "萬事達": "32.189", "VISA": "32.169"}),
+        "krw": ("韓元", {"JCB": "0.0241", "萬事達": "0.0242", "VISA": "0.0240"}),
+    }
+    progress = [0, 0]
+
+    def advance(completed: int, total: int | None) -> None:
+        progress[0] += completed
+        if total is not None:
+            progress[1] = total
+
+    with TwratesStub(currencies=currencies, broken={"krw"}) as stub:
+        client = HttpClient(backoff_factor=0)
+        runner = JobRunner(
+            spec=JobSpec(currencies=["usd", "krw"]),
+            currency_core=CurrencyCore(base_url=stub.base_url, client=client),
+        )
+        rates = list(runner.iter_currency_rates(advance))
+    assert [rate.currency_en for rate in rates] == ["usd"]
+    assert progress == [2, 2]
@@ -0,0 +1,53 @@
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.ingame_price import GameInfoUpdater
+from src.country_lookup import CountryLookup
+
+
+def test_lookup():
+    lookup = CountryLookup.shared()
+    assert lookup.currency("JP") == lookup.currency("Japan") == lookup.currency("jpn") == "jpy"
+    assert lookup.currency("ee") == "eur"
+    assert lookup.currency("atlantis") is None
+    assert lookup.name("tw") == "Taiwan, Province of China"
+    assert "us" in lookup.countries_of("usd")
+    assert "ec" in lookup.countries_of("USD")
+    assert lookup.group_by_currency(["us", "EC", "Japan", "us", "atlantis"]) == {
+        "usd": ["us", "ec"],
+        "jpy": ["jp"],
+    }
+    assert lookup.currencies_for(["de", "fr", "at", "jp"]) == ["eur", "jpy"]
+    frame = lookup.frame
+    assert frame["country"].is_unique
+    assert set(frame.columns) == {"country", "currency"}
+
+
+def test_shared_lookup_is_created_once():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        lookups = list(executor.map(lambda _: CountryLookup.shared(), range(32)))
+    assert all(lookup is lookups[0] for lookup in lookups)
+
+
+def test_lookup_skips_unknown_and_duplicate_rows(tmp_path: Path):
+    path = tmp_path / "countries.csv"
+    path.write_text(
+        "Country,CountryCode,Currency,Code\n"
+        "Namibia,NA,Dollar,NAD\n"
+        "Laos,LA,Kip,LAK\n"
+        "Laos,LA,Kip,XXX\n"
+        "US Armed Forces,USAF,US Dollar,USD\n",
+        encoding="utf-8",
+    )
+    lookup = CountryLookup(path=str(path))
+    assert lookup.countries == ["la", "na"]
+    assert lookup.currency("la") == "lak"
+    assert lookup.currency("NA") == "nad"
+
+
+def test_game_info_updater_country():
+    assert GameInfoUpdater(game_id="com.ncsoft.lineagew", country="Japan").country == "jp"
+    with pytest.raises(ValueError, match="Unknown country"):
+        GameInfoUpdater(game_id="com.ncsoft.lineagew", country="atlantis")
@@ -1,17 +1,62 @@
+from benchmarks.stub_server import TwratesStub, ReplayServer
+
+from src.cache import ResultCache
+from src.http_client import HttpClient
 from src.currency_core import CurrencyCore
 
 
-def test_get_avali_currency():
-    currency_rate = CurrencyCore(country_name="usd")
-    all_currency = currency_rate.get_avali_currency()
-    for currency in all_currency:
-        assert isinstance(currency, dict)
-        for key, value in currency.items():
-            assert isinstance(key, str)
-            assert isinstance(value, str)
+def test_get_country_list():
+    with ReplayServer() as stub:
+        currency_rate = CurrencyCore(base_url=stub.base_url)
+        all_currency = currency_rate.get_country_list()
+    assert len(all_currency) == 36
+    assert all_currency[0].currency_name == "usd"
+    assert all_currency[0].currency_name_cn == "美金"
+    assert all_currency[0].currency_url == f"{stub.base_url}/card/mastercard/usd.html"
 
 
 def test_fetch_currency_rates():
-    # This testing do not need an assertion, it will check by pydantic.
-    currency_rate = CurrencyCore(country_name="usd")
-    currency_rate.fetch_currency_rates()
+    with ReplayServer() as stub:
+        currency_rate = CurrencyCore(base_url=stub.base_url)
+        results = currency_rate.fetch_currency_rates(currency_name_en="usd")
+    assert results[0].currency_cn == "美金"
+    assert results[0].updated_time == "2024-09-12"
+
+
+CURRENCIES = {
+    "usd": ("美金", {"JCB": "32.137", "萬事達": "32.189", "VISA": "32.169"}),
+    "jpy": ("日圓", {"JCB": "0.2241", "萬事達": "0.2245", "VISA": "0.2243"}),
+    "krw": ("韓元", {"JCB": "0.0241", "萬事達": "0.0242", "VISA": "0.0240"}),
+}
+
+
+def test_iter_currency_rates():
+    with TwratesStub(currencies=CURRENCIES, broken={"krw"}) as stub:
+        currency_rate = CurrencyCore(base_url=stub.base_url, client=HttpClient(backoff_factor=0))
+        results = list(currency_rate.iter_currency_rates(max_workers=3))
+    rates = {result.currency_en: result for result in results}
+    assert sorted(rates) == ["jpy", "usd"]
+    assert rates["usd"].currency_cn == "美金"
+    assert rates["jpy"].master == "0.2245"
+    assert rates["jpy"].updated_time == "2024-09-12"
+    failure = currency_rate.failures[0]
+    assert (failure.key, failure.retryable) == ("krw", True)
+    assert failure.error.startswith("HTTPError: 500")
+
+
+def test_fetch_all_currency_rates_in_parallel():
+    with TwratesStub(currencies=CURRENCIES) as stub:
+        currency_rate = CurrencyCore(base_url=stub.base_url)
+        results = currency_rate.fetch_currency_rates(currency_name_en="all", max_workers=4)
+    assert sorted(result.currency_en for result in results) == ["jpy", "krw", "usd"]
+
+
+def test_cached_rates_are_kept_per_site():
+    cache = ResultCache(path=None)
+    jpy = {"jpy": ("日圓", {"JCB": "0.2300", "萬事達": "0.2301", "VISA": "0.2302"})}
+    with TwratesStub(currencies=CURRENCIES) as first, TwratesStub(currencies=jpy) as second:
+        rates = [
+            CurrencyCore(base_url=stub.base_url, cache=cache).fetch_currency_rates("jpy")[0]
+            for stub in (first, second)
+        ]
+    assert [rate.jcb for rate in rates] == ["0.2241", "0.2300"]
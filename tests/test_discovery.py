@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+import threading
+
+import orjson
+
+from src.catalog import GameCatalog
+from src.discovery import GameDiscovery, developer_query
+
+GAMES = [
+    {"packageId": "com.ncsoft.lineagew", "name": "天堂W", "id": 1},
+    {"packageId": "com.gamania.lineagem", "name": "天堂M", "id": 3},
+]
+RESULTS = {
+    "天堂": [
+        {"appId": "com.ncsoft.lineagew", "title": "Lineage W"},
+        {"appId": "com.ncsoft.lineage2m", "title": "天堂2M"},
+    ],
+    developer_query("NCSOFT"): [
+        {"appId": "com.ncsoft.lineage2m", "title": "天堂2M"},
+        {"appId": "com.ncsoft.bns2", "title": "劍靈2"},
+    ],
+}
+
+
+class FakeSearch:
+    """Answers searches from `RESULTS` and tracks how many ran at the same time."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    def __call__(self, query: str, n_hits: int, lang: str, country: str) -> list[dict]:
+        with self.lock:
+            self.calls.append(query)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        if query == "boom":
+            raise ConnectionError("reset by peer")
+        return RESULTS.get(query, [])[:n_hits]
+
+
+def build_discovery(tmp_path: Path, search: FakeSearch) -> GameDiscovery:
+    path = tmp_path / "gameList.json"
+    path.write_bytes(orjson.dumps(GAMES) + b"\n")
+    return GameDiscovery(path=str(path), max_in_flight=4, rate_limit=0, search=search)
+
+
+def test_discovery_merges_new_games(tmp_path: Path):
+    search = FakeSearch()
+    discovery = build_discovery(tmp_path, search)
+    report = discovery.run(["天堂", developer_query("NCSOFT"), "boom", "天堂"])
+    assert sorted(search.calls) == sorted(["天堂", developer_query("NCSOFT"), "boom"])
+    assert (report.queries, report.hits, report.added, report.known) == (3, 3, 2, 1)
+    assert report.failed == {"boom": "ConnectionError: reset by peer"}
+
+    # Known games keep their curated names; new ones count up from the highest ID.
+    games = orjson.loads(Path(discovery.path).read_bytes())
+    assert games == [
+        *GAMES,
+        {"packageId": "com.ncsoft.lineage2m", "name": "天堂2M", "id": 4},
+        {"packageId": "com.ncsoft.bns2", "name": "劍靈2", "id": 5},
+    ]
+    catalog = GameCatalog(path=discovery.path)
+    assert catalog.get("com.ncsoft.bns2").id == 5
+
+
+def test_discovery_keeps_list_mode(tmp_path: Path):
+    discovery = build_discovery(tmp_path, FakeSearch())
+    path = Path(discovery.path)
+    path.chmod(0o664)
+    assert discovery.run(["天堂"]).added == 1
+    assert path.stat().st_mode & 0o777 == 0o664
+
+
+def test_discovery_is_idempotent(tmp_path: Path):
+    discovery = build_discovery(tmp_path, FakeSearch())
+    discovery.run(["天堂"])
+    path = Path(discovery.path)
+    content, mtime_ns = path.read_bytes(), path.stat().st_mtime_ns
+    report = discovery.run(["天堂"])
+    assert (report.added, report.known) == (0, 2)
+    assert path.read_bytes() == content
+    assert path.stat().st_mtime_ns == mtime_ns
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_discovery_bounds_concurrency(tmp_path: Path):
+    search = FakeSearch()
+    discovery = build_discovery(tmp_path, search)
+    report = discovery.run([f"term {index}" for index in range(16)])
+    assert report.queries == 16
+    assert 1 < search.peak <= 4
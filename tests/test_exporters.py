@@ -0,0 +1,94 @@
+import csv
+from pathlib import Path
+from collections.abc import Iterator
+
+import orjson
+import pytest
+import openpyxl
+
+from src.sinks import PRICE_COLUMNS
+from src.exporters import JsonlExporter, RecordExporter, export, open_exporter
+from src.typings.game import GamePriceInfo
+
+PRICES = [
+    GamePriceInfo(name="天堂W", country="us", lowest=0.99, highest=99.99),
+    GamePriceInfo(name='=HYPERLINK("x")', country="jp", lowest=160.0, highest=15800.0),
+    None,
+    GamePriceInfo(name="天堂M\x07", country="tr", error="HTTPError: 503", retryable=True),
+]
+
+
+@pytest.mark.parametrize("export_format", ["jsonl", "csv", "xlsx"])
+def test_export_round_trip(tmp_path: Path, export_format: str):
+    path = tmp_path / f"game_price.{export_format}"
+    assert export(PRICES, path, columns=PRICE_COLUMNS, chunk_size=2) == 3
+    if export_format == "jsonl":
+        rows = [orjson.loads(line) for line in path.read_bytes().splitlines()]
+        assert list(rows[0]) == PRICE_COLUMNS
+        assert rows[2]["retryable"] is True
+        assert rows[0]["lowest"] == 0.99
+    elif export_format == "csv":
+        with path.open(encoding="utf-8-sig", newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert rows[0]["name"] == "天堂W"
+        assert rows[0]["error"] == ""
+        assert rows[2]["retryable"] == "True"
+    else:
+        worksheet = openpyxl.load_workbook(path).active
+        rows = list(worksheet.values)
+        assert rows[0] == tuple(PRICE_COLUMNS)
+        assert rows[1][:4] == ("天堂W", "us", 0.99, 99.99)
+        # Formulas are written as text and control characters are dropped.
+        assert rows[2][0] == '=HYPERLINK("x")'
+        assert worksheet.cell(row=3, column=1).data_type == "s"
+        assert rows[3][0] == "天堂M"
+
+
+def test_export_streams_chunks(tmp_path: Path):
+    path = tmp_path / "game_price.jsonl"
+    sizes = []
+
+    def produce() -> Iterator[dict]:
+        for index in range(10):
+            sizes.append(path.stat().st_size if path.exists() else 0)
+            yield {"name": f"Game {index}", "country": "us"}
+
+    with JsonlExporter(path=str(path), columns=["name", "country"], chunk_size=4) as exporter:
+        exporter.write_many(produce())
+    # Every chunk of 4 rows reaches the file while the producer is still running.
+    assert sizes[4] > 0
+    assert sizes[8] > sizes[4]
+    assert len(path.read_bytes().splitlines()) == 10
+
+
+def test_xlsx_continues_on_new_sheet(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("src.exporters.XLSX_MAX_ROWS", 3)
+    path = tmp_path / "game_price.xlsx"
+    records = [{"name": f"Game {index}"} for index in range(5)]
+    assert export(records, path, columns=["name"], sheet="game_price") == 5
+    workbook = openpyxl.load_workbook(path)
+    assert workbook.sheetnames == ["game_price", "game_price_2", "game_price_3"]
+    assert [row[0] for row in workbook["game_price_2"].values] == ["name", "Game 2", "Game 3"]
+
+
+def test_empty_export_has_header(tmp_path: Path):
+    path = tmp_path / "game_price.csv"
+    assert export([], path, columns=PRICE_COLUMNS) == 0
+    assert path.read_text(encoding="utf-8-sig").strip() == ",".join(PRICE_COLUMNS)
+
+
+def test_unsupported_format(tmp_path: Path):
+    with pytest.raises(ValueError, match="Unsupported export format: txt"):
+        open_exporter(tmp_path / "game_price.txt", columns=PRICE_COLUMNS)
+
+
+def test_incomplete_exporter_fails_when_built(tmp_path: Path):
+    class TsvExporter(RecordExporter):
+        def _open(self, path: Path) -> None:
+            pass
+
+        def _write_chunk(self, rows: list[tuple]) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="_close"):
+        TsvExporter(path=str(tmp_path / "game_price.tsv"), columns=PRICE_COLUMNS)
@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_server import PlayStoreStub
+
+from src.cache import ResultCache
+from src.fetch_engine import GameFetchEngine, HostRateLimiter
+from src.typings.game import GameInfo
+
+GAMES = [
+    GameInfo(packageId="com.ncsoft.lineagew", name="天堂W"),
+    GameInfo(packageId="com.gamania.lineagem", name="天堂M"),
+]
+PRICES = {
+    ("com.ncsoft.lineagew", "us"): "每個項目 US$0.99 - US$99.99",
+    ("com.ncsoft.lineagew", "jp"): "每個項目 ¥160 - ¥15,800",
+    ("com.gamania.lineagem", "us"): "每個項目 US$1.99 - US$199.99",
+    ("com.gamania.lineagem", "jp"): "每個項目 ¥300 - ¥30,000",
+}
+
+
+def test_fetch_matrix():
+    with PlayStoreStub(prices=PRICES) as stub:
+        engine = GameFetchEngine(max_in_flight=3, rate_limit=0, detail_url=stub.detail_url)
+        results = engine.fetch_matrix(games=GAMES, countries=["us", "jp"])
+    assert len(results) == 4
+    prices = {(result.name, result.country): (result.lowest, result.highest) for result in results}
+    assert prices[("天堂W", "us")] == (0.99, 99.99)
+    assert prices[("天堂M", "jp")] == (300.0, 30000.0)
+
+
+def test_fetch_missing_game():
+    with PlayStoreStub(prices=PRICES) as stub:
+        engine = GameFetchEngine(rate_limit=0, detail_url=stub.detail_url)
+        result = engine.fetch_one(game=GAMES[0], country="tw")
+    assert result.lowest is None
+    assert result.highest is None
+    assert result.error.startswith("HTTPError")
+
+
+def test_host_rate_limiter():
+    limiter = HostRateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_concurrent_failures_share_no_result():
+    with PlayStoreStub(prices={}) as stub:
+        resolve = stub.resolve
+
+        def slow_resolve(path: str) -> tuple[int, str]:
+            time.sleep(0.2)
+            return resolve(path)
+
+        stub.resolve = slow_resolve
+        engine = GameFetchEngine(
+            cache=ResultCache(path=None), rate_limit=0, detail_url=stub.detail_url
+        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(engine.fetch_one, GAMES[0], "us") for _ in range(2)]
+            results = [future.result() for future in futures]
+    # The second call waits for the first one, gets no value and fetches again itself.
+    assert engine.cache.stats.coalesced == 1
+    assert all(result.error.startswith("HTTPError: 404") for result in results)
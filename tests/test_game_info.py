@@ -1,6 +1,21 @@
+from benchmarks.stub_server import ReplayServer
+
 from src.ingame_price import GameInfoUpdater
 
 
 def test_fetch_game_info():
-    game_info_fetcher = GameInfoUpdater(game_name="天堂W", country="us")
-    game_info_fetcher.fetch_game_info()
+    with ReplayServer() as stub:
+        game_info_fetcher = GameInfoUpdater(
+            game_name="天堂W", country="us", detail_url=stub.detail_url
+        )
+        game_info_result = game_info_fetcher.fetch_game_info()
+    assert [result.model_dump() for result in game_info_result] == [
+        {
+            "name": "天堂W",
+            "country": "us",
+            "lowest": 0.99,
+            "highest": 99.99,
+            "error": None,
+            "retryable": None,
+        }
+    ]
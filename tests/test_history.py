@@ -0,0 +1,46 @@
+import datetime
+
+from src.history import HistoryStore
+from src.typings.game import GamePriceInfo
+from src.typings.currency_rate import CurrencyRate
+
+
+def test_prices_round_trip(tmp_path):
+    store = HistoryStore(root=str(tmp_path))
+    first = [
+        GamePriceInfo(name="天堂W", country="us", lowest=0.99, highest=99.99),
+        GamePriceInfo(name="天堂W", country="jp", lowest=160, highest=15800),
+    ]
+    second = [GamePriceInfo(name="天堂W", country="us", lowest=1.99, highest=99.99)]
+    store.append_prices(first, snapshot_date=datetime.date(2024, 9, 1))
+    store.append_prices(second, snapshot_date=datetime.date(2024, 9, 2))
+    store.append_prices(second, snapshot_date=datetime.date(2024, 9, 2))
+
+    everything = store.read_prices()
+    assert len(everything) == 4
+    assert everything["lowest"].dtype == "float64"
+    latest_us = store.read_prices(start=datetime.date(2024, 9, 2), countries=["US"])
+    assert latest_us["lowest"].tolist() == [1.99, 1.99]
+    batches = list(store.scan_prices(end=datetime.date(2024, 9, 1), columns=["country"]))
+    countries = [country for batch in batches for country in batch.column("country").to_pylist()]
+    assert sorted(countries) == ["jp", "us"]
+
+
+def test_rates_are_numeric(tmp_path):
+    store = HistoryStore(root=str(tmp_path))
+    rate = CurrencyRate(
+        currency_en="usd",
+        currency_cn="美金",
+        JCB="32.137",
+        萬事達="1,032.189",
+        updated_time="2024-09-12",
+    )
+    assert store.append_rates([rate], snapshot_date=datetime.date(2024, 9, 12)) == 1
+    rates = store.read_rates(currencies=["usd"])
+    assert rates.loc[0, "master"] == 1032.189
+    assert rates.loc[0, "visa"] != rates.loc[0, "visa"]
+    assert rates.loc[0, "updated_time"] == datetime.date(2024, 9, 12)
+
+
+def test_read_empty_store(tmp_path):
+    assert HistoryStore(root=str(tmp_path)).read_prices().empty
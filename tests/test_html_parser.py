@@ -0,0 +1,37 @@
+import pytest
+from benchmarks.stub_server import FIXTURES as STUB_FIXTURES
+
+from src.html_parser import TwratesParser
+
+FIXTURES = STUB_FIXTURES / "twrates"
+
+
+@pytest.mark.parametrize("currency", ["usd", "jpy", "try"])
+def test_fast_matches_bs4(currency):
+    page = (FIXTURES / f"{currency}.html").read_text(encoding="utf-8")
+    fast = TwratesParser(mode="fast")
+    slow = TwratesParser(mode="bs4")
+    assert fast.parse_currency_rate(page, currency) == slow.parse_currency_rate(page, currency)
+    assert fast.parse_currency_list(page, "https://www.twrates.com") == slow.parse_currency_list(
+        page, "https://www.twrates.com"
+    )
+
+
+def test_fast_falls_back_to_bs4():
+    page = (
+        '<html><body><a onclick="change_ccy()" class="x">萬事達卡匯率 - 美金</a>'
+        "<table><tr>\n<td>JCB</td>\n<td>32.137 (2024-09-12)</td>\n</tr></table></body></html>"
+    )
+    rate = TwratesParser(mode="fast").parse_currency_rate(page.replace("</tr>", ""), "usd")
+    assert rate.jcb == "32.137"
+    assert rate.currency_cn == "美金"
+
+
+def test_fast_matches_whole_class_names():
+    page = (
+        '<ul><li class="itm-head"><a href="/x.html">X - 無</a></li>'
+        '<li class="nav itm"><a href="/card/mastercard/usd.html">USD - 美金</a></li></ul>'
+    )
+    fast = TwratesParser(mode="fast").parse_currency_list(page, "https://www.twrates.com")
+    assert fast == TwratesParser(mode="bs4").parse_currency_list(page, "https://www.twrates.com")
+    assert [currency.currency_name for currency in fast] == ["usd"]
@@ -0,0 +1,30 @@
+from benchmarks.stub_server import StubServer
+
+from src.http_client import HttpClient
+
+
+def test_connection_reuse():
+    with StubServer(routes={"/usd.html": "usd", "/jpy.html": "jpy"}) as stub:
+        client = HttpClient()
+        for path in ["/usd.html", "/jpy.html"] * 3:
+            response = client.get(f"{stub.base_url}{path}")
+            assert response.status_code == 200
+        stats = client.stats
+        # Closing keeps the counters, and a new session adds to them.
+        client.close()
+        assert client.stats == stats
+        client.get(f"{stub.base_url}/usd.html")
+    assert stats.requests == 6
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 5
+    assert stats.bytes_received == 18
+    assert (client.stats.requests, client.stats.connections_opened) == (7, 2)
+
+
+def test_retry_on_server_error():
+    routes = {"/usd.html": [(503, "busy"), (429, "slow down"), (200, "usd")]}
+    with StubServer(routes=routes) as stub:
+        client = HttpClient(backoff_factor=0)
+        response = client.get(f"{stub.base_url}/usd.html")
+    assert response.text == "usd"
+    assert client.stats.retries == 2
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from benchmarks.stub_server import PlayStoreStub
+
+from src.incremental import IncrementalRefresher
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GameInfo
+
+GAMES = [
+    GameInfo(packageId="com.ncsoft.lineagew", name="天堂W"),
+    GameInfo(packageId="com.gamania.lineagem", name="天堂M"),
+]
+
+
+def test_incremental_refresh(tmp_path: Path):
+    prices = {
+        ("com.ncsoft.lineagew", "us"): "每個項目 US$0.99 - US$99.99",
+        ("com.ncsoft.lineagew", "jp"): "每個項目 ¥160 - ¥15,800",
+        ("com.gamania.lineagem", "us"): "每個項目 US$1.99 - US$199.99",
+        ("com.gamania.lineagem", "jp"): "每個項目 ¥300 - ¥30,000",
+    }
+    state_path = str(tmp_path / "fingerprints.json")
+    with PlayStoreStub(prices=prices) as stub:
+        engine = GameFetchEngine(rate_limit=0, detail_url=stub.detail_url)
+
+        first = IncrementalRefresher(state_path=state_path, engine=engine)
+        result = first.refresh(games=GAMES, countries=["us", "jp"])
+        assert (result.probed, result.swept, result.requests) == (2, 2, 4)
+        assert sorted(delta.kind for delta in result.deltas) == ["new"] * 4
+        assert len(result.prices) == 4
+
+        # A fresh refresher reads the saved state; nothing changed, so only probes are sent.
+        refresher = IncrementalRefresher(state_path=state_path, engine=engine)
+        result = refresher.refresh(games=GAMES, countries=["us", "jp"])
+        assert (result.swept, result.requests, result.deltas) == (0, 2, [])
+        assert len(result.prices) == 4
+
+        prices[("com.ncsoft.lineagew", "us")] = "每個項目 US$0.99 - US$149.99"
+        result = refresher.refresh(games=GAMES, countries=["us", "jp"])
+        assert (result.swept, result.requests) == (1, 3)
+        assert [(delta.kind, delta.country, delta.highest) for delta in result.deltas] == [
+            ("changed", "us", 149.99)
+        ]
+        assert result.deltas[0].previous_highest == 99.99
+
+        result = refresher.refresh(games=GAMES, countries=["us", "jp", "tr"])
+        assert (result.swept, result.requests) == (2, 4)
+        assert result.deltas == []
+
+        result = refresher.refresh(games=GAMES[1:], countries=["us", "jp"], prune=True)
+    assert sorted((delta.kind, delta.country) for delta in result.deltas) == [
+        ("removed", "jp"),
+        ("removed", "us"),
+    ]
+    assert "com.ncsoft.lineagew" not in refresher.states
@@ -0,0 +1,30 @@
+import os
+import sys
+import subprocess
+
+from src.lazy import LazyModule, lazy_import
+from src.typings import transport
+
+
+def test_lazy_import_defers_until_first_use():
+    assert lazy_import("src.typings.transport") is transport
+
+    lazy = LazyModule("colorsys")
+    sys.modules.pop("colorsys", None)
+    assert "colorsys" not in sys.modules
+    assert lazy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_scrapers_import_without_heavy_dependencies():
+    code = (
+        "import sys, src.cli, src.currency_core, src.ingame_price, src.fetch_engine;"
+        "heavy = ['bs4', 'google_play_scraper', 'logfire', 'price_parser', 'requests'];"
+        "print(','.join(name for name in heavy if name in sys.modules))"
+    )
+    # Run like an entry point would: `src` itself keeps the logfire pydantic plugin out.
+    env = {name: value for name, value in os.environ.items() if name != "PYDANTIC_DISABLE_PLUGINS"}
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    )
+    assert output.stdout.strip() == ""
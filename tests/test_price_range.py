@@ -0,0 +1,55 @@
+import math
+
+import pytest
+
+from src.price_range import PriceParseError, PriceRangeParser, parse_amount
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("每個項目 US$0.99 - US$99.99", (0.99, 99.99)),
+        ("每個項目 ¥160 - ¥15,800", (160.0, 15800.0)),
+        ("每個項目 0,99 € \u2013 109,99 €", (0.99, 109.99)),
+        ("每個項目 TRY 29,99 - TRY 1.999,99", (29.99, 1999.99)),
+        ("每個項目 1 234,56 zł - 2 000,00 zł", (1234.56, 2000.0)),
+        ("每個項目 KWD 0.990 - KWD 29.990", (0.99, 29.99)),
+        ("每個項目 NT$30", (30.0, 30.0)),
+        ("US$0.99 - US$99.99", (0.99, 99.99)),
+    ],
+)
+def test_parse(text: str, expected: tuple[float, float]):
+    assert PriceRangeParser.shared("zh-TW").parse(text) == expected
+
+
+def test_parse_locale_prefix():
+    text = "1 アイテムあたり ¥160\uff5e¥15,800"
+    assert PriceRangeParser.shared("ja").parse(text) == (160.0, 15800.0)
+    assert PriceRangeParser.shared("zh-TW").parse(text) == (160.0, 15800.0)
+
+
+@pytest.mark.parametrize("text", [None, "", "免費", "每個項目 US$99.99 - US$0.99"])
+def test_parse_failure(text: str | None):
+    with pytest.raises(PriceParseError, match="price") as error:
+        PriceRangeParser.shared("zh-TW").parse(text)
+    assert error.value.text == text
+
+
+def test_parse_amount():
+    assert parse_amount("15,800") == 15800.0
+    assert parse_amount("1.599.000") == 1599000.0
+    assert parse_amount("0,99") == 0.99
+    assert parse_amount("1\u2019000.50") == 1000.5
+
+
+def test_parse_many():
+    lowest, highest = PriceRangeParser.shared("zh-TW").parse_many([
+        "每個項目 US$0.99 - US$99.99",
+        None,
+        "每個項目 US$0.99 - US$99.99",
+    ])
+    assert lowest.dtype == "float64"
+    assert lowest[0] == lowest[2] == 0.99
+    assert highest[0] == 99.99
+    assert math.isnan(lowest[1])
+    assert math.isnan(highest[1])
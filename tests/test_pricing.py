@@ -0,0 +1,51 @@
+import pytest
+
+from src.pricing import PricePipeline
+from src.typings.game import GamePriceInfo
+from src.typings.currency_rate import CurrencyRate
+
+RATES = [
+    CurrencyRate(
+        currency_en="usd",
+        currency_cn="美金",
+        JCB="32.137",
+        萬事達="32.189",
+        VISA="32.169",
+        updated_time="2024-09-12",
+    ),
+    CurrencyRate(
+        currency_en="jpy",
+        currency_cn="日圓",
+        JCB="0.2241",
+        萬事達="0.2245",
+        VISA=None,
+        updated_time="2024-09-12",
+    ),
+]
+PRICES = [
+    GamePriceInfo(name="天堂W", country="us", lowest=0.99, highest=99.99),
+    GamePriceInfo(name="天堂W", country="jp", lowest=160, highest=15800),
+    GamePriceInfo(name="天堂W", country="kr", lowest=1200, highest=119000),
+    GamePriceInfo(name="天堂W", country="tw", lowest=30, highest=3290),
+    GamePriceInfo(name="天堂M", country="us", lowest=0.0, highest=0.0),
+    GamePriceInfo(name="天堂M", country="jp", error="PriceParseError: Empty price: None"),
+]
+
+
+def test_convert():
+    converted = PricePipeline().convert(prices=PRICES, rates=RATES)
+    rows = converted.set_index(["country", "card"])
+    assert len(converted) == 3 + 2 + 3
+    assert rows.loc[("us", "jcb"), "highest_twd"] == pytest.approx(99.99 * 32.137)
+    assert rows.loc[("jp", "master"), "lowest_twd"] == pytest.approx(160 * 0.2245)
+    assert rows.loc[("tw", "visa"), "highest_twd"] == pytest.approx(3290)
+    assert "kr" not in converted["country"].to_numpy()
+    assert "天堂M" not in converted["name"].to_numpy()
+
+
+def test_cheapest():
+    pipeline = PricePipeline()
+    cheapest = pipeline.cheapest(pipeline.convert(prices=PRICES, rates=RATES))
+    assert cheapest[["name", "country", "card"]].to_dict("records") == [
+        {"name": "天堂W", "country": "us", "card": "jcb"}
+    ]
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.rate_matrix import RateMatrix
+from src.typings.currency_rate import CurrencyRate
+
+RATES = [
+    CurrencyRate(
+        currency_en="usd",
+        currency_cn="美金",
+        JCB="32.137",
+        萬事達="32.189",
+        VISA="32.169",
+        updated_time="2024-09-12",
+    ),
+    CurrencyRate(
+        currency_en="jpy",
+        currency_cn="日圓",
+        JCB="0.2241",
+        萬事達="0.2245",
+        VISA=None,
+        updated_time="2024-09-12",
+    ),
+    None,
+]
+KRW = CurrencyRate(
+    currency_en="krw", currency_cn="韓元", JCB="0.0241", VISA="0.0240", updated_time="2024-09-12"
+)
+
+
+def test_build_from_models():
+    matrix = RateMatrix.from_models(RATES)
+    assert matrix.codes == ["usd", "jpy", "twd"]
+    assert matrix.rates.dtype == np.float64
+    assert matrix.rates[2].tolist() == [1.0, 1.0, 1.0]
+    assert matrix.missing("visa").tolist() == [False, True, False]
+    assert "JPY" in matrix
+    assert matrix.rate("jpy", "usd", card="jcb") == pytest.approx(0.2241 / 32.137)
+    assert math.isnan(matrix.rate("jpy", card="visa"))
+    # A currency converts into itself without a rate.
+    assert matrix.rate("jpy", "jpy", card="visa") == 1.0
+
+
+def test_convert_arrays():
+    matrix = RateMatrix.from_models(RATES)
+    converted = matrix.convert([160.0, 15800.0], source="jpy", target="usd", card="jcb")
+    np.testing.assert_allclose(converted, np.array([160.0, 15800.0]) * 0.2241 / 32.137)
+
+    # One source currency per price; missing rates, prices and currencies come out NaN.
+    converted = matrix.convert(
+        [0.99, 160.0, np.nan, 5.0, 30.0], source=["usd", "jpy", "usd", "eur", "twd"], card="visa"
+    )
+    np.testing.assert_allclose(converted, [0.99 * 32.169, np.nan, np.nan, np.nan, 30.0])
+
+    every_card = matrix.convert([0.99, 160.0], source=["usd", "jpy"], target="twd", card=None)
+    assert every_card.shape == (2, 3)
+    np.testing.assert_allclose(every_card[1], [160.0 * 0.2241, 160.0 * 0.2245, np.nan])
+    assert math.isnan(matrix.convert(1.0, source="eur"))
+
+
+def test_update_matches_rebuild():
+    matrix = RateMatrix.from_models(RATES)
+    jpy = RATES[1].model_copy(update={"jcb": "0.2300", "visa": "0.2243"})
+    matrix.update(jpy)
+    matrix.update(KRW)
+    rebuilt = RateMatrix.from_models([RATES[0], jpy, KRW])
+    order = [matrix.index[code] for code in rebuilt.codes]
+    np.testing.assert_allclose(matrix.rates[order], rebuilt.rates)
+    np.testing.assert_allclose(matrix.cross[:, order][:, :, order], rebuilt.cross)
+    assert matrix.convert(1000.0, source="krw", target="jpy", card="visa") == pytest.approx(
+        1000 * 0.0240 / 0.2243
+    )
+
+
+def test_positions_are_reusable():
+    matrix = RateMatrix.from_models(RATES)
+    rows = matrix.positions(np.array(["JPY", None, "usd", "jpy"], dtype=object))
+    assert rows.tolist() == [1, -1, 0, 1]
+    # Rows mapped once convert like the codes they came from.
+    np.testing.assert_allclose(
+        matrix.convert([160.0, 1.0, 0.99, 320.0], source=rows, target="usd", card="jcb"),
+        matrix.convert([160.0, 1.0, 0.99, 320.0], source=["jpy", "eur", "usd", "jpy"], card="jcb")
+        / 32.137,
+    )
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from benchmarks.stub_server import StubServer, TwratesStub
+
+from src.cache import ResultCache
+from src.revalidation import PageRevalidator
+from src.currency_core import CurrencyCore
+
+CURRENCIES = {
+    "usd": ("美金", {"JCB": "32.137", "萬事達": "32.189", "VISA": "32.169"}),
+    "jpy": ("日圓", {"JCB": "0.2241", "萬事達": "0.2245", "VISA": "0.2243"}),
+}
+
+
+def test_base_page_is_downloaded_once_per_run():
+    with TwratesStub(currencies=CURRENCIES) as stub:
+        currency_rate = CurrencyCore(base_url=stub.base_url)
+        results = currency_rate.fetch_currency_rates(currency_name_en="all")
+    assert sorted(result.currency_en for result in results) == ["jpy", "usd"]
+    # usd.html feeds both the currency list and the usd rate.
+    assert stub.hits["/card/mastercard/usd.html"] == 1
+    stats = currency_rate.revalidation_stats
+    assert (stats.requests, stats.reused, stats.parses) == (2, 1, 3)
+
+
+def test_repeat_run_revalidates_unchanged_pages(tmp_path: Path):
+    # The rates expire at once, so the second run goes back to twrates with the validators.
+    cache = ResultCache(
+        path=str(tmp_path / "cache.sqlite"),
+        ttls={"currency_list": 0, "currency_rate": 0},
+        stale_ttl=0,
+    )
+    with TwratesStub(currencies=CURRENCIES, conditional=True) as stub:
+        first = CurrencyCore(base_url=stub.base_url, cache=cache)
+        expected = first.fetch_currency_rates(currency_name_en="all")
+        second = CurrencyCore(base_url=stub.base_url, cache=cache)
+        results = second.fetch_currency_rates(currency_name_en="all")
+        assert stub.not_modified == 2
+
+        stub.currencies = {**CURRENCIES, "jpy": ("日圓", {"JCB": "0.2300"})}
+        third = CurrencyCore(base_url=stub.base_url, cache=cache)
+        changed = third.fetch_currency_rates(currency_name_en="jpy")
+    assert results == expected
+    stats = second.revalidation_stats
+    assert (stats.requests, stats.not_modified, stats.parses) == (2, 2, 0)
+    assert stats.bytes_saved > 0
+    assert changed[0].jcb == "0.2300"
+    assert third.revalidation_stats.parses == 1
+
+
+def test_missing_parser_downloads_page_again():
+    with StubServer(routes={"/page.html": "<p>42</p>"}, conditional=True) as stub:
+        pages = PageRevalidator(source="stub", reuse_window=0)
+        url = f"{stub.base_url}/page.html"
+        assert pages.fetch(url, parser="length", parse=len) == 9
+        assert pages.fetch(url, parser="length", parse=len) == 9
+        assert pages.fetch(url, parser="upper", parse=str.upper) == "<P>42</P>"
+    # A 304 cannot feed a parser which never saw the page, so that one is sent unconditionally.
+    assert stub.hits["/page.html"] == 3
+    assert stub.not_modified == 1
+
+
+def test_new_parser_version_parses_page_again():
+    with StubServer(routes={"/page.html": "<p>42</p>"}, conditional=True) as stub:
+        pages = PageRevalidator(source="stub", reuse_window=60)
+        url = f"{stub.base_url}/page.html"
+        assert pages.fetch(url, parser="length", parse=len, version="1") == 9
+        assert pages.fetch(url, parser="length", parse=lambda text: len(text) * 2) == 18
+        pages.reuse_window = 0
+        assert pages.fetch(url, parser="length", parse=len, version="1") == 9
+    # Results of another version are neither reused nor revalidated with a 304.
+    assert stub.hits["/page.html"] == 2
+    assert stub.not_modified == 0
+    assert pages.stats.parses == 3
+
+
+def test_expired_validators_are_not_sent():
+    with StubServer(routes={"/page.html": "<p>42</p>"}, conditional=True) as stub:
+        url = f"{stub.base_url}/page.html"
+        for cache in [ResultCache(path=None), ResultCache(path=None, ttls={"page": 0})]:
+            for _ in range(2):
+                pages = PageRevalidator(source="stub", cache=cache)
+                assert pages.fetch(url, parser="length", parse=len) == 9
+    # Only the validators still inside the TTL of the page namespace are revalidated.
+    assert stub.hits["/page.html"] == 4
+    assert stub.not_modified == 1
@@ -0,0 +1,100 @@
+import time
+import threading
+
+import pytest
+import requests
+from benchmarks.stub_server import ReplayServer
+
+from src.cache import ResultCache
+from src.service import PriceService, build_server
+from src.http_client import HttpClient
+from src.fetch_engine import GameFetchEngine
+from src.currency_core import CurrencyCore
+
+
+def build_service(stub: ReplayServer, **kwargs: object) -> PriceService:
+    client = HttpClient()
+    cache = ResultCache(path=None)
+    return PriceService(
+        currency_core=CurrencyCore(base_url=stub.base_url, client=client, cache=cache),
+        engine=GameFetchEngine(
+            client=client, cache=cache, rate_limit=0, detail_url=stub.detail_url
+        ),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def api():
+    with ReplayServer() as stub:
+        service = build_service(stub, refresh_interval=0)
+        server = build_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_port}", service, stub
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+
+def test_endpoints(api: tuple[str, PriceService, ReplayServer]):
+    base_url, _service, stub = api
+    rates = requests.get(f"{base_url}/rates", params={"currencies": "usd,jpy"}, timeout=10)
+    assert sorted(rate["currency_en"] for rate in rates.json()) == ["jpy", "usd"]
+
+    params = {"games": "天堂W", "countries": "us,jp", "top": "1"}
+    prices = requests.get(f"{base_url}/prices", params=params, timeout=10).json()
+    assert sorted(price["country"] for price in prices) == ["jp", "us"]
+    compare = requests.get(f"{base_url}/compare", params=params, timeout=10).json()
+    assert [(row["name"], row["rank"]) for row in compare] == [("天堂W", 1)]
+    assert compare[0]["highest_twd"] > 0
+
+    # Everything above is cached, so repeating the comparison sends no request upstream.
+    hits = sum(stub.hits.values())
+    requests.get(f"{base_url}/compare", params=params, timeout=10).raise_for_status()
+    assert sum(stub.hits.values()) == hits
+
+    unknown = requests.get(f"{base_url}/prices", params={"games": "nope"}, timeout=10)
+    assert unknown.status_code == 400
+    assert "nope" in unknown.json()["error"]
+    assert requests.get(f"{base_url}/missing", timeout=10).status_code == 404
+
+    metrics = requests.get(f"{base_url}/metrics", timeout=10).json()
+    assert metrics["endpoints"]["/compare"]["requests"] == 2
+    assert metrics["endpoints"]["/prices"]["errors"] == 1
+    assert metrics["cache"]["hits"] > 0
+
+
+def test_background_refresh():
+    with ReplayServer() as stub:
+        service = build_service(
+            stub, refresh_interval=0.05, refresh_games=["天堂W"], refresh_countries=["us"]
+        )
+        service.start()
+        deadline = time.monotonic() + 10
+        while service.metrics().refreshes < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        service.stop()
+    assert service.metrics().refreshes >= 2
+    assert service.engine.cache.stats.misses == 2
+
+
+def test_incomplete_comparison_is_not_cached():
+    with ReplayServer() as stub:
+        resolve = stub.resolve
+        stub.resolve = lambda path: (503, "busy") if "gl=jp" in path else resolve(path)
+        client = HttpClient(max_retries=0)
+        cache = ResultCache(path=None)
+        service = PriceService(
+            currency_core=CurrencyCore(base_url=stub.base_url, client=client, cache=cache),
+            engine=GameFetchEngine(
+                client=client, cache=cache, rate_limit=0, detail_url=stub.detail_url
+            ),
+            refresh_interval=0,
+        )
+        partial = service.compare(games=["天堂W"], countries=["us", "jp"], top=6)
+        stub.resolve = resolve
+        complete = service.compare(games=["天堂W"], countries=["us", "jp"], top=6)
+        service.stop()
+    assert {row["country"] for row in partial} == {"us"}
+    assert {row["country"] for row in complete} == {"us", "jp"}
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import orjson
+from benchmarks.stub_server import PlayStoreStub
+
+from src.sharding import ShardedSweep, shard_of
+
+GAMES = [
+    {"packageId": "com.ncsoft.lineagew", "name": "天堂W", "id": 1},
+    {"packageId": "com.gamania.lineagem", "name": "天堂M", "id": 2},
+    {"packageId": "game.xin.hd.g", "name": "星城Online", "id": 3},
+    {"packageId": "com.garena.game.kgtw", "name": "Garena 傳說對決", "id": 4},
+]
+
+
+def build_sweep(tmp_path: Path, stub: PlayStoreStub) -> ShardedSweep:
+    catalog_path = tmp_path / "gameList.json"
+    catalog_path.write_bytes(orjson.dumps(GAMES))
+    return ShardedSweep(
+        countries=["us", "jp"],
+        shards=2,
+        workdir=str(tmp_path / "shards"),
+        catalog_path=str(catalog_path),
+        rate_limit=0,
+        detail_url=stub.detail_url,
+    )
+
+
+def test_shard_of_is_deterministic():
+    assignments = [shard_of(game["packageId"], 2) for game in GAMES]
+    assert assignments == [shard_of(game["packageId"], 2) for game in GAMES]
+    assert set(assignments) == {0, 1}
+
+
+def test_shard_resumes_after_crash(tmp_path: Path):
+    prices = {
+        (game["packageId"], country): "每個項目 US$0.99 - US$99.99"
+        for game in GAMES
+        for country in ["us", "jp"]
+    }
+    missing = next(key for key in prices if shard_of(key[0], 2) == 0)
+    del prices[missing]
+    with PlayStoreStub(prices=prices) as stub:
+        sweep = build_sweep(tmp_path, stub)
+        games = len(sweep.shard_games(0))
+        report = sweep.run_shard(0)
+        assert (report.games, report.resumed, report.fetched, report.failed) == (
+            games,
+            0,
+            games * 2,
+            1,
+        )
+
+        # A crash tears the last line; the shard keeps the intact records and retries the rest.
+        path = sweep.shard_path(0)
+        lines = path.read_bytes().splitlines(keepends=True)
+        path.write_bytes(b"".join(lines[:-2]) + lines[-2][:10])
+        prices[missing] = "每個項目 ¥160 - ¥15,800"
+        report = sweep.run_shard(0)
+        resumed = len([line for line in lines[:-2] if b'"error":null' in line])
+        assert (report.resumed, report.fetched, report.failed) == (resumed, games * 2 - resumed, 0)
+
+        sweep.run_shard(1)
+    merged = sweep.merge()
+    assert len(merged) == len(GAMES) * 2
+    assert all(price.error is None for price in merged)
+    assert [(price.name, price.country) for price in merged[:2]] == [
+        ("天堂W", "us"),
+        ("天堂W", "jp"),
+    ]
+
+
+def test_sharded_sweep_in_process_pool(tmp_path: Path):
+    prices = {(game["packageId"], "us"): "每個項目 NT$30 - NT$3,290" for game in GAMES}
+    with PlayStoreStub(prices=prices) as stub:
+        sweep = build_sweep(tmp_path, stub).model_copy(update={"countries": ["us"]})
+        merged = sweep.run(processes=2)
+    assert [(price.name, price.highest) for price in merged] == [
+        (game["name"], 3290.0) for game in GAMES
+    ]
+    assert sweep.shard_path(0).exists()
+    assert sweep.shard_path(1).exists()
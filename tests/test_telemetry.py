@@ -0,0 +1,50 @@
+from contextlib import nullcontext
+
+import pytest
+from logfire.testing import CaptureLogfire
+
+from src.telemetry import Telemetry
+
+
+def test_disabled_telemetry_is_a_no_op():
+    telemetry = Telemetry(enabled=False)
+    assert isinstance(telemetry.stage("request", source="twrates"), nullcontext)
+    telemetry.counter("igpf.test").add(1)
+    telemetry.histogram("igpf.test").record(1.0)
+
+
+def test_stage_records_spans_and_metrics(capfire: CaptureLogfire):
+    telemetry = Telemetry(sample_rate=1.0)
+    with (
+        telemetry.stage("currency_rate", source="twrates", currency="usd"),
+        telemetry.stage("parse", source="twrates"),
+    ):
+        pass
+    with pytest.raises(ValueError, match="boom"), telemetry.stage("request", source="twrates"):
+        raise ValueError("boom")
+
+    span_names = [span["name"] for span in capfire.exporter.exported_spans_as_dict()]
+    assert "igpf.currency_rate" in span_names
+    assert "igpf.parse" in span_names
+    metrics = {metric["name"]: metric for metric in capfire.get_collected_metrics()}
+    durations = metrics["igpf.stage.duration"]["data"]["data_points"]
+    assert {point["attributes"]["stage"] for point in durations} == {
+        "currency_rate",
+        "parse",
+        "request",
+    }
+    assert all("currency" not in point["attributes"] for point in durations)
+    failures = metrics["igpf.stage.failures"]["data"]["data_points"]
+    assert failures[0]["attributes"]["error"] == "ValueError"
+
+
+def test_unsampled_stage_skips_spans(capfire: CaptureLogfire):
+    telemetry = Telemetry(sample_rate=0.0)
+    with (
+        telemetry.stage("game_price", source="play_store"),
+        telemetry.stage("request", source="play_store"),
+    ):
+        pass
+    assert capfire.exporter.exported_spans_as_dict() == []
+    metrics = {metric["name"] for metric in capfire.get_collected_metrics()}
+    assert "igpf.stage.duration" in metrics
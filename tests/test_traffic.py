@@ -0,0 +1,122 @@
+import time
+
+import pytest
+import requests
+from benchmarks.stub_server import PlayStoreStub
+
+from src.traffic import CircuitOpenError, TrafficController, is_retryable
+from src.http_client import HttpClient
+from src.fetch_engine import GameFetchEngine
+from src.typings.game import GameInfo
+
+HOST = "play.google.com"
+
+
+def http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code} Error", response=response)
+
+
+def test_is_retryable():
+    assert is_retryable(http_error(429))
+    assert is_retryable(http_error(503))
+    assert is_retryable(requests.ConnectionError("reset by peer"))
+    assert is_retryable(CircuitOpenError(HOST, retry_in=1.0))
+    assert not is_retryable(http_error(404))
+    assert not is_retryable(ValueError("No price found"))
+
+
+def test_rate_adapts_to_push_back():
+    traffic = TrafficController(initial_rate=10, increase=11, cooldown=60, target_latency=1)
+    traffic.record(HOST, status_code=200, latency=0.1)
+    traffic.record(HOST, status_code=200, latency=0.1)
+    assert traffic.stats[HOST].rate == 12
+
+    # One burst of 429s halves the rate once, not once per response.
+    traffic.record(HOST, status_code=429)
+    traffic.record(HOST, status_code=429)
+    assert traffic.stats[HOST].rate == 6
+    assert traffic.stats[HOST].throttled == 2
+
+    # Past the first push back, the rate only grows additively.
+    traffic.record(HOST, status_code=200, latency=0.1)
+    assert traffic.stats[HOST].rate == pytest.approx(6 + 11 / 6)
+
+    slow = TrafficController(initial_rate=10, target_latency=1)
+    slow.record(HOST, status_code=200, latency=3.0)
+    assert (slow.stats[HOST].rate, slow.stats[HOST].slow) == (5, 1)
+
+
+def test_retry_after_pauses_host():
+    traffic = TrafficController(initial_rate=100)
+    traffic.record(HOST, status_code=429, retry_after=0.2)
+    start = time.monotonic()
+    traffic.acquire(HOST)
+    assert time.monotonic() - start >= 0.15
+
+
+def test_circuit_breaker():
+    traffic = TrafficController(failure_threshold=2, reset_timeout=0.1)
+    traffic.limit(HOST, 0)
+    for _ in range(2):
+        traffic.acquire(HOST)
+        traffic.record(HOST, error=requests.Timeout("read timed out"))
+    assert traffic.stats[HOST].state == "open"
+    with pytest.raises(CircuitOpenError):
+        traffic.acquire(HOST)
+
+    # After the reset timeout a single probe goes through and its success closes the circuit.
+    time.sleep(0.1)
+    traffic.acquire(HOST)
+    with pytest.raises(CircuitOpenError):
+        traffic.acquire(HOST)
+    traffic.record(HOST, status_code=200, latency=0.1)
+    traffic.acquire(HOST)
+    assert traffic.stats[HOST].state == "closed"
+    assert traffic.stats[HOST].rejected == 2
+
+
+def test_permanent_errors_change_nothing():
+    traffic = TrafficController(initial_rate=10, failure_threshold=2, reset_timeout=0.1)
+    traffic.record(HOST, error=requests.Timeout("read timed out"))
+    rate = traffic.stats[HOST].rate
+    traffic.record(HOST, error=requests.exceptions.InvalidURL("bad url"))
+    assert traffic.stats[HOST].rate == rate
+    # The failure streak went on, so the next timeout opens the circuit.
+    traffic.record(HOST, error=requests.Timeout("read timed out"))
+    assert traffic.stats[HOST].state == "open"
+
+    # A probe which raised does not close the circuit.
+    time.sleep(0.1)
+    traffic.acquire(HOST)
+    traffic.record(HOST, error=requests.exceptions.InvalidURL("bad url"))
+    assert traffic.stats[HOST].state == "half_open"
+
+
+def test_unhealthy_host_fails_fast():
+    games = [
+        GameInfo(packageId=f"com.example.game{index}", name=f"Game {index}") for index in range(6)
+    ]
+    with PlayStoreStub(prices={}) as stub:
+        stub.resolve = lambda path: (503, "busy")
+        client = HttpClient(
+            max_retries=0, traffic=TrafficController(failure_threshold=3, reset_timeout=60)
+        )
+        engine = GameFetchEngine(
+            client=client, max_in_flight=1, rate_limit=0, detail_url=stub.detail_url
+        )
+        results = engine.fetch_matrix(games=games, countries=["us"])
+        hits = sum(stub.hits.values())
+    assert hits == 3
+    assert all(result.retryable for result in results)
+    assert sum(result.error.startswith("CircuitOpenError") for result in results) == 3
+
+
+def test_permanent_failure_is_not_retryable():
+    with PlayStoreStub(prices={}) as stub:
+        engine = GameFetchEngine(rate_limit=0, detail_url=stub.detail_url)
+        result = engine.fetch_one(GameInfo(packageId="com.example.gone", name="Gone"), "us")
+    assert result.error.startswith("HTTPError: 404")
+    assert result.retryable is False
+    assert engine.client.traffic.stats[stub.base_url.removeprefix("http://")].state == "closed"